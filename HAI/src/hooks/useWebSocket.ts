@@ -24,8 +24,10 @@ import {
   type ToolCallStartEvent,
   isToolApprovalRequest,
   isAgoraError,
+  isSessionTitle,
   parseToolApprovalRequest,
   parseAgoraError,
+  parseSessionTitle,
 } from '@/types/schemas';
 import { getWebSocketUrl } from '@/lib/env';
 import { formatToolNameFallback } from '@/lib/utils';
@@ -290,6 +292,16 @@ export function useWebSocket() {
         if (error) {
           setError(new Error(error.message));
         }
+      } else if (isSessionTitle(event)) {
+        // Generated title for a new session, arrives after the first response
+        const payload = parseSessionTitle(event);
+        const { setSessionTitle } = useHistoryStore.getState();
+        if (payload && !setSessionTitle(payload.sessionId, payload.title)) {
+          const userId = useUserStore.getState().currentUser?.id;
+          if (userId) {
+            useHistoryStore.getState().fetchSessions(userId);
+          }
+        }
       } else if (event.name === 'agora:spoken_text_start') {
         // TTS: Start of spoken text stream
         const value = event.value as { messageId?: string };
@@ -22,10 +22,11 @@ interface HistoryStore {
   toggleSidebar: () => void;
   setSidebarOpen: (open: boolean) => void;
   addOrUpdateSession: (session: SessionMetadata) => void;
+  setSessionTitle: (sessionId: string, title: string) => boolean;
   clearSessions: () => void;
 }
 
-export const useHistoryStore = create<HistoryStore>((set) => ({
+export const useHistoryStore = create<HistoryStore>((set, get) => ({
   sessions: [],
   isLoading: false,
   error: null,
@@ -83,6 +84,18 @@ export const useHistoryStore = create<HistoryStore>((set) => ({
     set({ isSidebarOpen: open });
   },
 
+  setSessionTitle: (sessionId: string, title: string) => {
+    const found = get().sessions.some((s) => s.sessionId === sessionId);
+    if (found) {
+      set((state) => ({
+        sessions: state.sessions.map((s) =>
+          s.sessionId === sessionId ? { ...s, title } : s
+        ),
+      }));
+    }
+    return found;
+  },
+
   addOrUpdateSession: (session: SessionMetadata) => {
     set((state) => {
       const existingIndex = state.sessions.findIndex(
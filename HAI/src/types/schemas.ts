@@ -177,10 +177,16 @@ export const ErrorPayloadSchema = z.object({
   details: z.record(z.unknown()).nullable().optional(),
 });
 
+export const SessionTitlePayloadSchema = z.object({
+  sessionId: z.string(),
+  title: z.string(),
+});
+
 // Custom event names used by AGORA
 export const AGORA_TOOL_APPROVAL_REQUEST = 'agora:tool_approval_request';
 export const AGORA_TOOL_APPROVAL_RESPONSE = 'agora:tool_approval_response';
 export const AGORA_ERROR = 'agora:error';
+export const AGORA_SESSION_TITLE = 'agora:session_title';
 
 // Union of all AG-UI events
 export const AGUIEventSchema = z.discriminatedUnion('type', [
@@ -248,6 +254,7 @@ export type AGUIEvent = z.infer<typeof AGUIEventSchema>;
 export type ToolApprovalRequestPayload = z.infer<typeof ToolApprovalRequestPayloadSchema>;
 export type ToolApprovalResponsePayload = z.infer<typeof ToolApprovalResponsePayloadSchema>;
 export type ErrorPayload = z.infer<typeof ErrorPayloadSchema>;
+export type SessionTitlePayload = z.infer<typeof SessionTitlePayloadSchema>;
 
 export type RunAgentInput = z.infer<typeof RunAgentInputSchema>;
 export type Message = z.infer<typeof MessageSchema>;
@@ -266,6 +273,11 @@ export function isAgoraError(event: CustomEvent): boolean {
   return event.name === AGORA_ERROR;
 }
 
+// Helper to check if a custom event carries a generated session title
+export function isSessionTitle(event: CustomEvent): boolean {
+  return event.name === AGORA_SESSION_TITLE;
+}
+
 // Helper to parse tool approval request from custom event
 export function parseToolApprovalRequest(event: CustomEvent): ToolApprovalRequestPayload | null {
   if (!isToolApprovalRequest(event)) return null;
@@ -279,3 +291,10 @@ export function parseAgoraError(event: CustomEvent): ErrorPayload | null {
   const result = ErrorPayloadSchema.safeParse(event.value);
   return result.success ? result.data : null;
 }
+
+// Helper to parse a generated session title from custom event
+export function parseSessionTitle(event: CustomEvent): SessionTitlePayload | null {
+  if (!isSessionTitle(event)) return null;
+  const result = SessionTitlePayloadSchema.safeParse(event.value);
+  return result.success ? result.data : null;
+}
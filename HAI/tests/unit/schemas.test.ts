@@ -18,7 +18,9 @@ import {
   RunAgentInputSchema,
   isToolApprovalRequest,
   parseToolApprovalRequest,
+  parseSessionTitle,
   AGORA_TOOL_APPROVAL_REQUEST,
+  AGORA_SESSION_TITLE,
 } from '@/types/schemas';
 
 describe('AG-UI Protocol Schemas', () => {
@@ -305,5 +307,18 @@ describe('AG-UI Protocol Schemas', () => {
       expect(payload?.toolName).toBe('test_tool');
       expect(payload?.approvalId).toBe('apr_123');
     });
+
+    it('parseSessionTitle extracts payload', () => {
+      const event = {
+        type: EventType.CUSTOM,
+        name: AGORA_SESSION_TITLE,
+        value: { sessionId: 'session-123', title: 'Inspectie Bakkerij' },
+      };
+      expect(parseSessionTitle(event)).toEqual({
+        sessionId: 'session-123',
+        title: 'Inspectie Bakkerij',
+      });
+      expect(parseSessionTitle({ ...event, name: AGORA_TOOL_APPROVAL_REQUEST })).toBeNull();
+    });
   });
 });
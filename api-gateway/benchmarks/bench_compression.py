@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+AGORA API Gateway compression benchmark
+
+Measures the bandwidth saved by gateway response compression on session
+history payloads (GET /sessions/{id}/history?include_tools=true). Payloads
+are either recorded from a running backend or loaded from files saved by an
+earlier run, then compressed with the gateway's own streaming encoder in
+64 KiB chunks (the size the proxy receives them in).
+
+Usage:
+    # Record every history of a user from a backend and save the payloads
+    python api-gateway/benchmarks/bench_compression.py \\
+        --base-url http://localhost:8001 --user-id koen --save /tmp/histories
+
+    # Re-run on the saved payloads
+    python api-gateway/benchmarks/bench_compression.py /tmp/histories/*.json
+
+Requirements:
+    pip install -e "api-gateway[brotli]"
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+try:
+    import httpx
+except ImportError:
+    print("Missing httpx. Install with: pip install httpx")
+    sys.exit(1)
+
+from api_gateway.compression import compress_stream, supported_encodings
+from api_gateway.config import Settings
+
+CHUNK_SIZE = 64 * 1024
+
+
+def record_histories(base_url: str, user_id: str, api_key: str | None) -> dict:
+    """Fetch the full history (with tool calls) of every session of a user."""
+    headers = {"X-API-Key": api_key} if api_key else {}
+    payloads: dict[str, bytes] = {}
+    with httpx.Client(base_url=base_url, headers=headers, timeout=30.0) as client:
+        sessions = client.get("/sessions", params={"user_id": user_id}).json()
+        for session in sessions.get("sessions", []):
+            session_id = session["sessionId"]
+            resp = client.get(
+                f"/sessions/{session_id}/history", params={"include_tools": "true"}
+            )
+            resp.raise_for_status()
+            payloads[session_id] = resp.content
+    return payloads
+
+
+async def measure(payload: bytes, encoding: str, settings: Settings) -> dict:
+    """Compress one payload the way the proxy streams it."""
+
+    async def chunks():
+        for i in range(0, len(payload), CHUNK_SIZE):
+            yield payload[i : i + CHUNK_SIZE]
+
+    started = time.perf_counter()
+    stream, applied = await compress_stream(chunks(), encoding, settings)
+    size = sum([len(chunk) async for chunk in stream])
+    return {
+        "encoding": applied or "identity",
+        "bytes": size,
+        "ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+async def run_benchmark(payloads: dict[str, bytes], settings: Settings) -> dict:
+    """Compress every payload with every supported encoding."""
+    results = []
+    totals = {"identity": 0} | {e: 0 for e in supported_encodings()}
+    for name, payload in payloads.items():
+        row = {"payload": name, "identity_bytes": len(payload)}
+        totals["identity"] += len(payload)
+        for encoding in supported_encodings():
+            m = await measure(payload, encoding, settings)
+            row[encoding] = m
+            totals[encoding] += m["bytes"]
+        results.append(row)
+
+    saved = {
+        e: round(100 * (1 - totals[e] / totals["identity"]), 1)
+        for e in supported_encodings()
+        if totals["identity"]
+    }
+    return {
+        "payloads": results,
+        "total_bytes": totals,
+        "saved_percent": saved,
+        "min_size": settings.compression_min_size,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark gateway compression on history payloads"
+    )
+    parser.add_argument("files", nargs="*", help="Recorded JSON payload files")
+    parser.add_argument("--base-url", help="Backend (or gateway /api/x) base URL")
+    parser.add_argument("--user-id", default="koen", help="User to record")
+    parser.add_argument("--api-key", default=None, help="API key, if required")
+    parser.add_argument("--save", type=Path, help="Directory to save recordings")
+    args = parser.parse_args()
+
+    if args.base_url:
+        payloads = record_histories(args.base_url, args.user_id, args.api_key)
+        if args.save:
+            args.save.mkdir(parents=True, exist_ok=True)
+            for name, payload in payloads.items():
+                (args.save / f"{name}.json").write_bytes(payload)
+    else:
+        payloads = {Path(f).stem: Path(f).read_bytes() for f in args.files}
+
+    if not payloads:
+        parser.error("no payloads: pass files or --base-url")
+
+    result = asyncio.run(run_benchmark(payloads, Settings()))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
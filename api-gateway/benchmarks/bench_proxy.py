@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+AGORA API Gateway proxy benchmark
+
+Fires concurrent HTTP requests through the gateway and reports throughput and
+latency percentiles, so proxy changes can be compared before/after.
+
+Usage (against the mock backend):
+    # Terminal 1 - mock backend
+    cd docs/hai-contract && uvicorn mock_server:app --port 8001 --log-level warning
+
+    # Terminal 2 - gateway pointing at the mock backend
+    GATEWAY_MOCK_BACKEND_URL=http://localhost:8001 GATEWAY_DEFAULT_BACKEND=mock \\
+        uvicorn api_gateway.main:app --port 8000 --log-level warning
+
+    # Terminal 3 - benchmark
+    python api-gateway/benchmarks/bench_proxy.py --requests 5000 --concurrency 50
+
+Requirements:
+    pip install httpx
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+try:
+    import httpx
+except ImportError:
+    print("Missing httpx. Install with: pip install httpx")
+    sys.exit(1)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_benchmark(
+    url: str, total: int, concurrency: int, api_key: str | None
+) -> dict:
+    """Send `total` GETs to `url` with `concurrency` workers."""
+    headers = {"X-API-Key": api_key} if api_key else {}
+    latencies: list[float] = []
+    errors = 0
+    remaining = total
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        # Warm up client->gateway connections so only the proxy hop is measured
+        await asyncio.gather(
+            *(client.get(url, headers=headers) for _ in range(concurrency))
+        )
+
+        async def worker() -> None:
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    resp = await client.get(url, headers=headers)
+                    if resp.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "url": url,
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 2),
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the AGORA gateway proxy")
+    parser.add_argument(
+        "--base-url", default="http://localhost:8000", help="Gateway base URL"
+    )
+    parser.add_argument(
+        "--path",
+        default="/api/mock/sessions?user_id=koen",
+        help="Proxied path to request",
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests")
+    parser.add_argument("--concurrency", type=int, default=50, help="Parallel workers")
+    parser.add_argument("--api-key", default=None, help="Gateway API key, if required")
+    args = parser.parse_args()
+
+    url = f"{args.base_url.rstrip('/')}{args.path}"
+    result = asyncio.run(
+        run_benchmark(url, args.requests, args.concurrency, args.api_key)
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
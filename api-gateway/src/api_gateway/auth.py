@@ -1,15 +1,96 @@
 """API key authentication module."""
 
-import secrets
+import hashlib
+import logging
+from pathlib import Path
 
-from fastapi import Depends, HTTPException, Query, Request, WebSocket, status
+from fastapi import Depends, HTTPException, Query, WebSocket, status
 from fastapi.security import APIKeyHeader
 
 from .config import Settings, get_settings
 
+logger = logging.getLogger(__name__)
+
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
+def _digest(key: str) -> bytes:
+    """SHA-256 digest of an API key."""
+    return hashlib.sha256(key.encode()).digest()
+
+
+class APIKeyIndex:
+    """Precomputed lookup of valid API keys by SHA-256 digest.
+
+    Keys are parsed once instead of re-splitting settings.api_keys on every
+    request. Presented keys are hashed before the dict lookup, so lookup time
+    is independent of the key count and of how much of a real key an attacker
+    has guessed (the replacement for the per-key secrets.compare_digest loop).
+    """
+
+    def __init__(self, keys: list[str]):
+        """Build the index from plaintext keys."""
+        self._digests: dict[bytes, str] = {}
+        for key in keys:
+            digest = _digest(key)
+            self._digests[digest] = digest.hex()[:12]
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "APIKeyIndex":
+        """Build the index from api_keys and the optional api_keys_file."""
+        keys = [k.strip() for k in settings.api_keys.split(",") if k.strip()]
+
+        if settings.api_keys_file:
+            try:
+                lines = Path(settings.api_keys_file).read_text().splitlines()
+                keys.extend(line.strip() for line in lines if line.strip())
+            except OSError as e:
+                logger.error(f"Failed to read API keys file: {e}")
+
+        return cls(keys)
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def lookup(self, api_key: str) -> str | None:
+        """Return the key id (short digest prefix) for a valid key, else None."""
+        return self._digests.get(_digest(api_key))
+
+
+_key_index: APIKeyIndex | None = None
+
+
+def get_key_index() -> APIKeyIndex:
+    """Get the API key index, building it from settings on first use."""
+    global _key_index
+    if _key_index is None:
+        _key_index = APIKeyIndex.from_settings(get_settings())
+    return _key_index
+
+
+def reload_api_keys() -> int:
+    """Re-read settings and rebuild the API key index.
+
+    Triggered by SIGHUP or POST /gateway/admin/reload-keys.
+
+    Returns:
+        Number of valid keys after reload
+    """
+    global _key_index
+    get_settings.cache_clear()
+    _key_index = APIKeyIndex.from_settings(get_settings())
+    logger.info(f"Reloaded API keys ({len(_key_index)} configured)")
+    return len(_key_index)
+
+
+def _authenticate(api_key: str) -> dict | None:
+    """Resolve client info for an API key, or None if the key is invalid."""
+    key_id = get_key_index().lookup(api_key)
+    if key_id is None:
+        return None
+    return {"name": "authenticated", "key_id": key_id, "scopes": ["all"]}
+
+
 async def verify_api_key_http(
     api_key_header_value: str | None = Depends(api_key_header),
     token: str | None = Query(None, description="API key as query param"),
@@ -31,11 +112,9 @@ async def verify_api_key_http(
             detail="Missing API Key",
         )
 
-    valid_keys = [k.strip() for k in settings.api_keys.split(",") if k.strip()]
-
-    for valid_key in valid_keys:
-        if secrets.compare_digest(api_key, valid_key):
-            return {"name": "authenticated", "scopes": ["all"]}
+    client = _authenticate(api_key)
+    if client is not None:
+        return client
 
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -64,10 +143,4 @@ def verify_api_key_websocket(
     if token is None:
         return None
 
-    valid_keys = [k.strip() for k in settings.api_keys.split(",") if k.strip()]
-
-    for valid_key in valid_keys:
-        if secrets.compare_digest(token, valid_key):
-            return {"name": "authenticated", "scopes": ["all"]}
-
-    return None
+    return _authenticate(token)
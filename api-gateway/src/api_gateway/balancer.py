@@ -0,0 +1,213 @@
+"""Replica selection and health checking for multi-replica backends."""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+
+import httpx
+
+from .config import Settings
+from .hashring import HashRing
+from .upstream import UpstreamClients
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Replica:
+    """A single backend replica and its load/health state."""
+
+    url: str
+    outstanding: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Whether the replica is currently eligible for new requests."""
+        return time.monotonic() >= self.ejected_until
+
+
+class BackendPool:
+    """Replicas of one backend.
+
+    Requests with an affinity key (an AG-UI threadId) are routed to the key's
+    owner on a consistent-hash ring, since server-langgraph keeps checkpoints
+    and pending approvals in replica-local SQLite. Everything else is picked
+    by least outstanding requests.
+    """
+
+    def __init__(self, name: str, urls: list[str], settings: Settings):
+        """Create the pool from the backend's replica URLs."""
+        self.name = name
+        self.replicas = [Replica(url=url) for url in urls]
+        self._by_url = {r.url: r for r in self.replicas}
+        self._ring = HashRing(list(self._by_url))
+        self._sticky = settings.sticky_sessions
+        self._eject_after_failures = settings.health_eject_after_failures
+        self._ejection_seconds = settings.health_ejection_seconds
+
+    def pick(self) -> Replica:
+        """Pick the available replica with the fewest in-flight requests.
+
+        Ties are broken randomly. If every replica is ejected, fails open and
+        picks among all of them rather than rejecting the request outright.
+        """
+        candidates = [r for r in self.replicas if r.available] or self.replicas
+        fewest = min(r.outstanding for r in candidates)
+        return random.choice([r for r in candidates if r.outstanding == fewest])
+
+    def owner(self, key: str) -> Replica:
+        """Replica owning a key on the hash ring.
+
+        Ejected owners are skipped in ring order, so only their keys move and
+        they move back once the owner recovers. Fails open to the primary
+        owner if every replica is ejected.
+        """
+        urls = list(self._ring.iter_nodes(key))
+        for url in urls:
+            if self._by_url[url].available:
+                return self._by_url[url]
+        return self._by_url[urls[0]]
+
+    def routes_together(self, key: str, replica: Replica) -> bool:
+        """Whether a key would be routed to the given replica."""
+        if not self._sticky or len(self.replicas) == 1:
+            return True
+        return self.owner(key) is replica
+
+    def acquire(self, affinity_key: str | None = None) -> Replica:
+        """Pick a replica and count a request (or WebSocket) as outstanding on it.
+
+        Callers must release() the replica once the request has finished.
+
+        Args:
+            affinity_key: Optional threadId; pins the request to its ring owner
+        """
+        if affinity_key and self._sticky and len(self.replicas) > 1:
+            replica = self.owner(affinity_key)
+        else:
+            replica = self.pick()
+        replica.outstanding += 1
+        return replica
+
+    def acquire_hedge(
+        self, primary: Replica, affinity_key: str | None = None
+    ) -> Replica | None:
+        """Acquire a second replica to retry or hedge a request on.
+
+        Sticky requests may only move to the key's next ring owner, i.e. when
+        the primary has been ejected, since other replicas lack the thread's
+        state. Everything else goes to the least loaded available replica
+        other than the primary. Returns None if there is no such replica.
+        """
+        if affinity_key and self._sticky and len(self.replicas) > 1:
+            replica = self.owner(affinity_key)
+            if replica is primary or not replica.available:
+                return None
+        else:
+            candidates = [r for r in self.replicas if r.available and r is not primary]
+            if not candidates:
+                return None
+            fewest = min(r.outstanding for r in candidates)
+            replica = random.choice([r for r in candidates if r.outstanding == fewest])
+        replica.outstanding += 1
+        return replica
+
+    def release(self, replica: Replica) -> None:
+        """Mark an outstanding request on a replica as finished."""
+        replica.outstanding -= 1
+
+    def eject(self, replica: Replica) -> None:
+        """Temporarily remove a replica from rotation."""
+        replica.ejected_until = time.monotonic() + self._ejection_seconds
+        logger.warning(
+            f"Ejected {self.name} replica {replica.url} "
+            f"for {self._ejection_seconds:.0f}s"
+        )
+
+    def record_probe(self, replica: Replica, healthy: bool) -> None:
+        """Update replica health from an active /health probe."""
+        if healthy:
+            if replica.consecutive_failures or not replica.available:
+                logger.info(f"{self.name} replica {replica.url} is healthy again")
+            replica.consecutive_failures = 0
+            replica.ejected_until = 0.0
+            return
+
+        replica.consecutive_failures += 1
+        if replica.consecutive_failures >= self._eject_after_failures:
+            self.eject(replica)
+
+    def status(self) -> list[dict]:
+        """Replica status for the /gateway/backends endpoint."""
+        return [
+            {
+                "url": r.url,
+                "available": r.available,
+                "outstanding": r.outstanding,
+            }
+            for r in self.replicas
+        ]
+
+
+class LoadBalancer:
+    """Backend pools plus a background task probing every replica's /health."""
+
+    def __init__(self, backends: dict[str, list[str]], settings: Settings):
+        """Create a pool per backend."""
+        self.pools = {
+            name: BackendPool(name, urls, settings) for name, urls in backends.items()
+        }
+        self._interval = settings.health_check_interval
+        self._timeout = settings.health_check_timeout
+        self._task: asyncio.Task[None] | None = None
+
+    def get(self, backend: str) -> BackendPool:
+        """Get the pool for a backend."""
+        return self.pools[backend]
+
+    async def start(self, clients: UpstreamClients) -> None:
+        """Start periodic health probes using the pooled upstream clients."""
+        if self._interval > 0:
+            self._task = asyncio.create_task(self._probe_loop(clients))
+
+    async def aclose(self) -> None:
+        """Stop health probes."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def probe_all(self, clients: UpstreamClients) -> None:
+        """Probe every replica of every backend once."""
+        probes = [
+            self._probe(pool, replica, clients.get(pool.name))
+            for pool in self.pools.values()
+            for replica in pool.replicas
+        ]
+        await asyncio.gather(*probes)
+
+    async def _probe(
+        self, pool: BackendPool, replica: Replica, client: httpx.AsyncClient
+    ) -> None:
+        try:
+            resp = await client.get(f"{replica.url}/health", timeout=self._timeout)
+            healthy = resp.status_code == 200
+        except httpx.HTTPError as e:
+            logger.debug(f"Health probe failed for {replica.url}: {e}")
+            healthy = False
+        pool.record_probe(replica, healthy)
+
+    async def _probe_loop(self, clients: UpstreamClients) -> None:
+        while True:
+            try:
+                await self.probe_all(clients)
+            except Exception as e:
+                logger.error(f"Health probe loop error: {e}")
+            await asyncio.sleep(self._interval)
@@ -0,0 +1,157 @@
+"""Streaming gzip/brotli compression of proxied responses."""
+
+import logging
+import zlib
+from collections.abc import AsyncGenerator
+
+from .config import Settings
+
+try:
+    import brotli
+except ImportError:  # optional: api-gateway[brotli]
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/",
+    "image/svg+xml",
+)
+
+
+def supported_encodings() -> list[str]:
+    """Encodings the gateway can produce, in order of preference."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate(accept_encoding: str | None, content_type: str | None) -> str | None:
+    """Pick a response encoding from the client's Accept-Encoding.
+
+    Returns None for incompressible content types or when the client accepts
+    none of the supported encodings. Among equally weighted encodings,
+    brotli is preferred over gzip.
+    """
+    if not accept_encoding or not content_type:
+        return None
+    if not content_type.lower().startswith(COMPRESSIBLE_TYPES):
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in supported_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Encoder:
+    """Incremental compressor with a uniform compress/flush interface."""
+
+    def __init__(self, encoding: str, settings: Settings):
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=settings.compression_brotli_quality)
+            self._gz = None
+        else:
+            self._br = None
+            # wbits=31 writes a gzip header and trailer
+            self._gz = zlib.compressobj(settings.compression_gzip_level, wbits=31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self._br is not None:
+            return self._br.process(data)
+        return self._gz.compress(data)
+
+    def flush(self) -> bytes:
+        if self._br is not None:
+            return self._br.finish()
+        return self._gz.flush()
+
+
+def compress_body(body: bytes, encoding: str, settings: Settings) -> bytes:
+    """Compress a complete body."""
+    encoder = _Encoder(encoding, settings)
+    return encoder.compress(body) + encoder.flush()
+
+
+async def compress_stream(
+    chunks: AsyncGenerator[bytes, None],
+    encoding: str | None,
+    settings: Settings,
+    size_hint: int | None = None,
+) -> tuple[AsyncGenerator[bytes, None], str | None]:
+    """Compress a response stream chunk by chunk if it is large enough.
+
+    Without a size hint (chunked upstream responses), up to
+    compression_min_size bytes are read ahead to decide; bodies that end
+    before the threshold are passed through unchanged.
+
+    Args:
+        chunks: Upstream body stream (closed when the result is closed)
+        encoding: Negotiated encoding, or None to pass through
+        settings: Gateway settings with the compression configuration
+        size_hint: Upstream Content-Length, if known
+
+    Returns:
+        (body stream, encoding actually applied or None)
+    """
+    min_size = settings.compression_min_size
+    if encoding is None or (size_hint is not None and size_hint < min_size):
+        return chunks, None
+
+    head: list[bytes] = []
+    if size_hint is None:
+        buffered = 0
+        while buffered < min_size:
+            try:
+                chunk = await anext(chunks)
+            except StopAsyncIteration:
+                return _replay(head, chunks), None
+            except BaseException:
+                await chunks.aclose()
+                raise
+            head.append(chunk)
+            buffered += len(chunk)
+
+    return _compressed(head, chunks, _Encoder(encoding, settings)), encoding
+
+
+async def _replay(
+    head: list[bytes], rest: AsyncGenerator[bytes, None]
+) -> AsyncGenerator[bytes, None]:
+    try:
+        for chunk in head:
+            yield chunk
+        async for chunk in rest:
+            yield chunk
+    finally:
+        await rest.aclose()
+
+
+async def _compressed(
+    head: list[bytes], rest: AsyncGenerator[bytes, None], encoder: _Encoder
+) -> AsyncGenerator[bytes, None]:
+    try:
+        for chunk in head:
+            if out := encoder.compress(chunk):
+                yield out
+        async for chunk in rest:
+            if out := encoder.compress(chunk):
+                yield out
+        yield encoder.flush()
+    finally:
+        await rest.aclose()
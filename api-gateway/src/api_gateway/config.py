@@ -1,5 +1,7 @@
 """API Gateway configuration."""
 
+from functools import lru_cache
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -7,34 +9,199 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     """API Gateway configuration."""
 
-    # Backend URLs
+    # Backend URLs (comma-separated for multiple replicas)
     openai_backend_url: str = Field(
         default="http://server-openai:8000",
-        description="URL for server-openai backend",
+        description="Comma-separated replica URLs for server-openai backend",
     )
     langgraph_backend_url: str = Field(
         default="http://server-langgraph:8000",
-        description="URL for server-langgraph backend",
+        description="Comma-separated replica URLs for server-langgraph backend",
     )
     mock_backend_url: str = Field(
         default="http://mock-server:8000",
-        description="URL for mock server backend",
+        description="Comma-separated replica URLs for mock server backend",
     )
     default_backend: str = Field(
         default="langgraph",
         description="Default backend when no path prefix specified",
     )
 
+    # Upstream connection pool (one long-lived client per backend)
+    upstream_timeout: float = Field(
+        default=120.0,
+        description="Read/write timeout in seconds for proxied backend requests",
+    )
+    upstream_connect_timeout: float = Field(
+        default=5.0,
+        description="Timeout in seconds for opening a new backend connection",
+    )
+    upstream_max_connections: int = Field(
+        default=100,
+        description="Maximum concurrent connections per backend",
+    )
+    upstream_max_keepalive_connections: int = Field(
+        default=20,
+        description="Idle connections kept open per backend for reuse",
+    )
+    upstream_keepalive_expiry: float = Field(
+        default=30.0,
+        description="Seconds an idle backend connection is kept alive",
+    )
+    upstream_http2: bool = Field(
+        default=False,
+        description="Use HTTP/2 to backends (requires the 'http2' extra)",
+    )
+
+    sticky_sessions: bool = Field(
+        default=True,
+        description="Pin each threadId to one replica via consistent hashing",
+    )
+
+    # WebSocket relay
+    ws_compression: bool = Field(
+        default=True,
+        description="Negotiate permessage-deflate on client and backend WebSockets",
+    )
+    ws_relay_queue_size: int = Field(
+        default=64,
+        description="Backend frames buffered per connection before backpressure",
+    )
+    ws_client_send_timeout: float = Field(
+        default=30.0,
+        description="Seconds a client may stall a single frame before disconnect",
+    )
+    ws_multiplex_backends: str = Field(
+        default="",
+        description="Comma-separated backends whose /ws sessions share /ws/mux "
+        "connections (e.g. 'langgraph,openai')",
+    )
+    ws_mux_connections: int = Field(
+        default=2,
+        description="Multiplexed connections per replica",
+    )
+
+    # Response cache for polled GETs (/sessions, /sessions/{id}/history, /agents)
+    response_cache_ttl: float = Field(
+        default=2.0,
+        description="Seconds a cached GET response is reused (0 = coalesce only)",
+    )
+    response_cache_max_entries: int = Field(
+        default=1000,
+        description="Maximum cached GET responses",
+    )
+    response_cache_max_body_bytes: int = Field(
+        default=1024 * 1024,
+        description="Larger responses are coalesced but not cached",
+    )
+
+    # Response compression (gzip, plus brotli with the 'brotli' extra)
+    compression_enabled: bool = Field(
+        default=True,
+        description="Compress responses according to the client's Accept-Encoding",
+    )
+    compression_min_size: int = Field(
+        default=1024,
+        description="Responses smaller than this many bytes are sent uncompressed",
+    )
+    compression_gzip_level: int = Field(
+        default=6,
+        description="gzip compression level (1-9)",
+    )
+    compression_brotli_quality: int = Field(
+        default=4,
+        description="Brotli quality (0-11); low values suit on-the-fly compression",
+    )
+
+    # Hedged GETs across replicas
+    hedge_enabled: bool = Field(
+        default=False,
+        description="Retry slow or unreachable GETs on a second replica",
+    )
+    hedge_percentile: float = Field(
+        default=95.0,
+        description="Latency percentile after which a GET is hedged",
+    )
+    hedge_min_delay: float = Field(
+        default=0.05,
+        description="Minimum seconds to wait before hedging",
+    )
+    hedge_max_delay: float = Field(
+        default=2.0,
+        description="Maximum seconds to wait before hedging (also used until warm)",
+    )
+    hedge_max_ratio: float = Field(
+        default=0.1,
+        description="Maximum hedges as a fraction of GETs per backend",
+    )
+    hedge_window: int = Field(
+        default=1000,
+        description="Recent GET latencies kept per backend for the percentile",
+    )
+    hedge_min_samples: int = Field(
+        default=100,
+        description="Samples needed before the percentile replaces hedge_max_delay",
+    )
+
+    # Replica health checking
+    health_check_interval: float = Field(
+        default=5.0,
+        description="Seconds between /health probes of each replica (0 = disabled)",
+    )
+    health_check_timeout: float = Field(
+        default=2.0,
+        description="Timeout in seconds for a single /health probe",
+    )
+    health_eject_after_failures: int = Field(
+        default=2,
+        description="Consecutive failed probes before a replica is ejected",
+    )
+    health_ejection_seconds: float = Field(
+        default=30.0,
+        description="Seconds an ejected replica stays out of rotation",
+    )
+
     # Authentication
     api_keys: str = Field(
         default="",
         description="Comma-separated API keys (empty = no auth required)",
     )
+    api_keys_file: str = Field(
+        default="",
+        description="Optional file with one API key per line, merged with api_keys",
+    )
     require_auth: bool = Field(
         default=False,
         description="Whether to require API key authentication",
     )
 
+    # Admission control (0 = unlimited). Without auth, clients are keyed on
+    # their address, which behind a reverse proxy is the proxy's for everyone.
+    rate_limit_per_key: float = Field(
+        default=0.0,
+        description="Sustained requests per second allowed per API key",
+    )
+    rate_limit_per_key_burst: int = Field(
+        default=40,
+        description="Requests an API key may make in a burst above its rate",
+    )
+    rate_limit_per_backend: float = Field(
+        default=0.0,
+        description="Sustained requests per second allowed per backend",
+    )
+    rate_limit_per_backend_burst: int = Field(
+        default=200,
+        description="Requests a backend may receive in a burst above its rate",
+    )
+    max_websockets_per_key: int = Field(
+        default=0,
+        description="Concurrent WebSocket sessions allowed per API key",
+    )
+    max_websockets_per_backend: int = Field(
+        default=0,
+        description="Concurrent WebSocket sessions allowed per backend",
+    )
+
     # ElevenLabs
     elevenlabs_api_key: str = Field(
         default="",
@@ -44,6 +211,27 @@ class Settings(BaseSettings):
         default="pNInz6obpgDQGcFmaJgB",
         description="Default ElevenLabs voice ID",
     )
+    elevenlabs_base_url: str = Field(
+        default="https://api.elevenlabs.io",
+        description="ElevenLabs API base URL (override for local stand-ins)",
+    )
+    elevenlabs_token_pool_size: int = Field(
+        default=3,
+        description="Single-use STT tokens minted ahead of time (0 = disabled)",
+    )
+    elevenlabs_token_max_age: float = Field(
+        default=600.0,
+        description="Seconds a prefetched token may be handed out (they expire "
+        "after 15 minutes)",
+    )
+    tts_cache_dir: str = Field(
+        default="/tmp/agora-tts-cache",
+        description="Directory for cached TTS audio (empty = caching disabled)",
+    )
+    tts_cache_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        description="Total size of cached TTS audio before LRU eviction",
+    )
 
     # Server
     host: str = Field(default="0.0.0.0")
@@ -53,6 +241,11 @@ class Settings(BaseSettings):
     model_config = {"env_prefix": "GATEWAY_"}
 
 
+@lru_cache
 def get_settings() -> Settings:
-    """Get gateway settings singleton."""
+    """Get gateway settings singleton.
+
+    Built once per process; call get_settings.cache_clear() to re-read the
+    environment (see auth.reload_api_keys).
+    """
     return Settings()
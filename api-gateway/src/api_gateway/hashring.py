@@ -0,0 +1,72 @@
+"""Consistent-hash ring for thread-affinity routing."""
+
+import bisect
+import hashlib
+from collections.abc import Iterator
+
+
+def _hash(key: str) -> int:
+    """64-bit position on the ring for a key."""
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent-hash ring with virtual nodes.
+
+    Each node is placed on the ring many times so keys spread evenly; adding or
+    removing a node only remaps the keys that node owns (about 1/N of them).
+    """
+
+    def __init__(self, nodes: list[str] | None = None, vnodes: int = 160):
+        """Create a ring containing the given nodes."""
+        self._vnodes = vnodes
+        self._nodes: set[str] = set()
+        self._points: list[int] = []
+        self._owners: list[str] = []
+        for node in nodes or []:
+            self.add(node)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def add(self, node: str) -> None:
+        """Add a node to the ring."""
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for i in range(self._vnodes):
+            point = _hash(f"{node}#{i}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str) -> None:
+        """Remove a node from the ring."""
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        kept = [(p, n) for p, n in zip(self._points, self._owners) if n != node]
+        self._points = [p for p, _ in kept]
+        self._owners = [n for _, n in kept]
+
+    def get(self, key: str) -> str | None:
+        """Get the node that owns a key."""
+        return next(self.iter_nodes(key), None)
+
+    def iter_nodes(self, key: str) -> Iterator[str]:
+        """Yield distinct nodes clockwise from the key's position.
+
+        The first node is the owner; the rest are the fallbacks to use when the
+        owner is unavailable, in a stable per-key order.
+        """
+        if not self._points:
+            return
+        start = bisect.bisect(self._points, _hash(key))
+        seen: set[str] = set()
+        for offset in range(len(self._points)):
+            node = self._owners[(start + offset) % len(self._points)]
+            if node not in seen:
+                seen.add(node)
+                yield node
+                if len(seen) == len(self._nodes):
+                    return
@@ -0,0 +1,219 @@
+"""Hedged requests for idempotent GETs across backend replicas."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+
+import httpx
+
+from .balancer import BackendPool, Replica
+from .config import Settings
+from .metrics import HEDGED_REQUESTS, UPSTREAM_ERRORS
+
+logger = logging.getLogger(__name__)
+
+# Recompute the percentile after this many new samples, not on every request
+RECOMPUTE_EVERY = 50
+
+
+class LatencyTracker:
+    """Sliding window of response latencies with a cached percentile."""
+
+    def __init__(self, window: int, percentile: float):
+        """Track the last `window` samples."""
+        self._samples: deque[float] = deque(maxlen=window)
+        self._percentile = percentile
+        self._since_recompute = 0
+        self._value: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """Add a latency sample."""
+        self._samples.append(seconds)
+        self._since_recompute += 1
+
+    def value(self) -> float | None:
+        """Current percentile, or None before any samples."""
+        if self._samples and (
+            self._value is None or self._since_recompute >= RECOMPUTE_EVERY
+        ):
+            ordered = sorted(self._samples)
+            index = min(len(ordered) - 1, int(len(ordered) * self._percentile / 100))
+            self._value = ordered[index]
+            self._since_recompute = 0
+        return self._value
+
+
+class HedgeBudget:
+    """Caps hedges to a fraction of requests.
+
+    Every request earns `ratio` of a hedge (up to a small burst); a hedge
+    spends one. A stalled replica can therefore add at most `ratio` extra
+    load, no matter how many requests are waiting on it.
+    """
+
+    def __init__(self, ratio: float, burst: float = 10.0):
+        """Start with an empty budget."""
+        self._ratio = ratio
+        self._burst = burst
+        self._tokens = 0.0
+
+    def earn(self) -> None:
+        """Credit one request."""
+        self._tokens = min(self._burst, self._tokens + self._ratio)
+
+    def spend(self) -> bool:
+        """Take one hedge from the budget, if available."""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+async def send_on(
+    pool: BackendPool,
+    replica: Replica,
+    client: httpx.AsyncClient,
+    request: httpx.Request,
+) -> httpx.Response:
+    """Send a streamed request to an acquired replica.
+
+    On failure the replica is released (and ejected if it refused the
+    connection) before the error is re-raised; on success the caller must
+    release it once the response is closed.
+    """
+    try:
+        return await client.send(request, stream=True)
+    except httpx.ConnectError as e:
+        pool.release(replica)
+        pool.eject(replica)
+        UPSTREAM_ERRORS.labels(pool.name, "connect").inc()
+        logger.error(f"Failed to connect to {pool.name} replica {replica.url}: {e}")
+        raise
+    except BaseException:
+        pool.release(replica)
+        raise
+
+
+class Hedger:
+    """Sends idempotent GETs with an optional hedge to a second replica.
+
+    If the first replica has not returned response headers within the
+    backend's recent latency percentile, the same request is sent to another
+    available replica and whichever answers first is used; the other is
+    cancelled and its connection released.
+    """
+
+    def __init__(self, settings: Settings):
+        """Create per-backend latency trackers and budgets lazily."""
+        self.enabled = settings.hedge_enabled
+        self._percentile = settings.hedge_percentile
+        self._window = settings.hedge_window
+        self._min_samples = settings.hedge_min_samples
+        self._min_delay = settings.hedge_min_delay
+        self._max_delay = settings.hedge_max_delay
+        self._ratio = settings.hedge_max_ratio
+        self._trackers: dict[str, LatencyTracker] = {}
+        self._budgets: dict[str, HedgeBudget] = {}
+        self._discards: set[asyncio.Task] = set()
+
+    def delay(self, backend: str) -> float:
+        """Seconds to wait for the first replica before hedging."""
+        tracker = self._tracker(backend)
+        value = tracker.value()
+        if len(tracker) < self._min_samples or value is None:
+            return self._max_delay
+        return min(self._max_delay, max(self._min_delay, value))
+
+    async def send(
+        self,
+        pool: BackendPool,
+        client: httpx.AsyncClient,
+        build: Callable[[Replica], httpx.Request],
+        affinity_key: str | None = None,
+    ) -> tuple[Replica, httpx.Response]:
+        """Send a GET, hedging it to a second replica if the first is slow.
+
+        Args:
+            pool: Backend replicas
+            client: Pooled client for the backend
+            build: Builds the request for a given replica
+            affinity_key: Optional threadId for ring routing
+
+        Returns:
+            The replica that answered (still acquired) and its streamed response
+        """
+        started = time.perf_counter()
+        budget = self._budget(pool.name)
+        budget.earn()
+
+        primary = pool.acquire(affinity_key=affinity_key)
+        first = asyncio.create_task(send_on(pool, primary, client, build(primary)))
+        attempts = {first: primary}
+
+        done, _ = await asyncio.wait({first}, timeout=self.delay(pool.name))
+        # A refused connection fails over at once and without spending budget;
+        # a slow replica is hedged only while the budget allows
+        failed = bool(done) and isinstance(first.exception(), httpx.ConnectError)
+        if not done or failed:
+            second = pool.acquire_hedge(primary, affinity_key)
+            if second is not None and not failed and not budget.spend():
+                pool.release(second)
+                second = None
+            if second is not None:
+                kind = "failover" if failed else "sent"
+                HEDGED_REQUESTS.labels(pool.name, kind).inc()
+                logger.info(
+                    f"{pool.name} replica {primary.url} "
+                    f"{'unreachable' if failed else 'slow'}, retrying on {second.url}"
+                )
+                task = asyncio.create_task(send_on(pool, second, client, build(second)))
+                attempts[task] = second
+
+        try:
+            error: BaseException | None = None
+            while attempts:
+                done, _ = await asyncio.wait(
+                    attempts, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    replica = attempts.pop(task)
+                    if task.exception() is not None:
+                        # send_on already released the replica
+                        error = task.exception()
+                        continue
+                    if replica is not primary:
+                        HEDGED_REQUESTS.labels(pool.name, "won").inc()
+                    self._tracker(pool.name).record(time.perf_counter() - started)
+                    return replica, task.result()
+            raise error
+        finally:
+            for task, replica in attempts.items():
+                task.cancel()
+                discard = asyncio.create_task(_discard(pool, replica, task))
+                self._discards.add(discard)
+                discard.add_done_callback(self._discards.discard)
+
+    def _tracker(self, backend: str) -> LatencyTracker:
+        if backend not in self._trackers:
+            self._trackers[backend] = LatencyTracker(self._window, self._percentile)
+        return self._trackers[backend]
+
+    def _budget(self, backend: str) -> HedgeBudget:
+        if backend not in self._budgets:
+            self._budgets[backend] = HedgeBudget(self._ratio)
+        return self._budgets[backend]
+
+
+async def _discard(pool: BackendPool, replica: Replica, task: asyncio.Task) -> None:
+    """Close the losing attempt's response (if it got one) and release it."""
+    try:
+        response = await task
+    except BaseException:
+        return  # send_on released the replica
+    await response.aclose()
+    pool.release(replica)
@@ -0,0 +1,180 @@
+"""Per-API-key and per-backend admission control."""
+
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from fastapi import HTTPException, status
+from starlette.requests import HTTPConnection
+
+from .config import Settings
+from .metrics import RATE_LIMITED
+
+logger = logging.getLogger(__name__)
+
+# WebSocket close code for rejected connections (mirrors HTTP 429, like 4001/401)
+WS_CLOSE_TOO_MANY = 4029
+
+MAX_IDLE_BUCKETS = 10_000
+
+
+@dataclass
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    rate: float
+    burst: float
+    tokens: float = field(init=False)
+    updated: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        self.tokens = self.burst
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available (0.0 if one is available now)."""
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        """Consume a token; call after wait_time() returned 0."""
+        self.tokens -= 1
+
+    @property
+    def full(self) -> bool:
+        """Whether the bucket has refilled completely (safe to forget)."""
+        self._refill(time.monotonic())
+        return self.tokens >= self.burst
+
+
+class Limiter(ABC):
+    """Admission control interface.
+
+    Methods are async so the in-process implementation can later be swapped
+    for one backed by shared state (e.g. Redis) across gateway replicas.
+    """
+
+    @abstractmethod
+    async def hit(self, key_id: str, backend: str) -> float:
+        """Admit one request.
+
+        Returns:
+            0.0 if admitted, else seconds the client should wait before retrying
+        """
+
+    @abstractmethod
+    async def open_websocket(self, key_id: str, backend: str) -> bool:
+        """Count a new WebSocket; False if a concurrency limit is reached."""
+
+    @abstractmethod
+    async def close_websocket(self, key_id: str, backend: str) -> None:
+        """Release a WebSocket admitted by open_websocket()."""
+
+
+class InMemoryLimiter(Limiter):
+    """Limiter with per-process state.
+
+    Every request draws from both its key's bucket and its backend's bucket;
+    a request is only charged when both have capacity. A limit of 0 disables
+    that check.
+    """
+
+    def __init__(self, settings: Settings):
+        """Create the limiter from the rate_limit_* and max_websockets_* settings."""
+        self._key_rate = settings.rate_limit_per_key
+        self._key_burst = settings.rate_limit_per_key_burst
+        self._backend_rate = settings.rate_limit_per_backend
+        self._backend_burst = settings.rate_limit_per_backend_burst
+        self._max_ws_per_key = settings.max_websockets_per_key
+        self._max_ws_per_backend = settings.max_websockets_per_backend
+
+        self._key_buckets: dict[str, TokenBucket] = {}
+        self._backend_buckets: dict[str, TokenBucket] = {}
+        self._ws_by_key: defaultdict[str, int] = defaultdict(int)
+        self._ws_by_backend: defaultdict[str, int] = defaultdict(int)
+
+    async def hit(self, key_id: str, backend: str) -> float:
+        """Admit one request against the key and backend buckets."""
+        buckets = []
+        if self._key_rate > 0:
+            buckets.append(
+                self._bucket(self._key_buckets, key_id, self._key_rate, self._key_burst)
+            )
+        if self._backend_rate > 0:
+            buckets.append(
+                self._bucket(
+                    self._backend_buckets,
+                    backend,
+                    self._backend_rate,
+                    self._backend_burst,
+                )
+            )
+
+        wait = max((b.wait_time() for b in buckets), default=0.0)
+        if wait > 0:
+            return wait
+        for bucket in buckets:
+            bucket.take()
+        return 0.0
+
+    async def open_websocket(self, key_id: str, backend: str) -> bool:
+        """Admit a WebSocket if neither the key nor the backend is at its limit."""
+        if 0 < self._max_ws_per_key <= self._ws_by_key[key_id]:
+            return False
+        if 0 < self._max_ws_per_backend <= self._ws_by_backend[backend]:
+            return False
+        self._ws_by_key[key_id] += 1
+        self._ws_by_backend[backend] += 1
+        return True
+
+    async def close_websocket(self, key_id: str, backend: str) -> None:
+        """Release a WebSocket slot."""
+        self._ws_by_key[key_id] -= 1
+        if self._ws_by_key[key_id] <= 0:
+            del self._ws_by_key[key_id]
+        self._ws_by_backend[backend] -= 1
+
+    def _bucket(
+        self, buckets: dict[str, TokenBucket], name: str, rate: float, burst: float
+    ) -> TokenBucket:
+        bucket = buckets.get(name)
+        if bucket is None:
+            if len(buckets) >= MAX_IDLE_BUCKETS:
+                # Full buckets are indistinguishable from new ones; forget them
+                for idle in [n for n, b in buckets.items() if b.full]:
+                    del buckets[idle]
+            bucket = buckets[name] = TokenBucket(rate=rate, burst=max(burst, 1))
+        return bucket
+
+
+def client_key(auth: dict | None, conn: HTTPConnection) -> str:
+    """Identity to limit on: the API key id, or the client address without auth."""
+    if auth and auth.get("key_id"):
+        return auth["key_id"]
+    host = conn.client.host if conn.client else "unknown"
+    return f"anonymous:{host}"
+
+
+async def admit_request(limiter: Limiter, key_id: str, backend: str) -> None:
+    """Charge a request to the limiter.
+
+    Raises:
+        HTTPException: 429 with Retry-After if the request is over a limit
+    """
+    wait = await limiter.hit(key_id, backend)
+    if wait > 0:
+        RATE_LIMITED.labels(backend, "http").inc()
+        logger.warning(f"Rate limited key {key_id} on {backend} for {wait:.1f}s")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
@@ -1,23 +1,89 @@
 """AGORA API Gateway - FastAPI application."""
 
+import asyncio
 import logging
+import math
+import signal
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 
 from fastapi import Depends, FastAPI, HTTPException, Request, WebSocket, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-
-from .auth import verify_api_key_http, verify_api_key_websocket
+from fastapi.responses import Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from .auth import (
+    get_key_index,
+    reload_api_keys,
+    verify_api_key_http,
+    verify_api_key_websocket,
+)
+from .balancer import LoadBalancer
 from .config import Settings, get_settings
-from .proxy import proxy_http, proxy_websocket
+from .hedging import Hedger
+from .limits import (
+    WS_CLOSE_TOO_MANY,
+    InMemoryLimiter,
+    Limiter,
+    admit_request,
+    client_key,
+)
+from .metrics import ELEVENLABS_LATENCY, RATE_LIMITED, TTS_CACHE
+from .mux import MuxPool
+from .proxy import get_backends, proxy_http, proxy_websocket, resolve_backend
+from .response_cache import ResponseCache
+from .stt_tokens import STTTokenPool, TokenMintError
+from .tts_cache import TTSCache
+from .upstream import UpstreamClients
 
 logging.basicConfig(level=logging.INFO)
+# Health probes would otherwise log every request at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    """Set up upstream clients and replica health checks; tear down on shutdown."""
+    settings = get_settings()
+    backends = get_backends(settings)
+    # ElevenLabs gets its own pooled client alongside the backends
+    app.state.upstream = UpstreamClients(settings, [*backends, "elevenlabs"])
+    app.state.balancer = LoadBalancer(backends, settings)
+    app.state.limiter = InMemoryLimiter(settings)
+    app.state.response_cache = ResponseCache(settings)
+    app.state.hedger = Hedger(settings)
+    app.state.ws_mux = MuxPool(settings)
+    await app.state.balancer.start(app.state.upstream)
+    app.state.tts_cache = (
+        TTSCache(settings.tts_cache_dir, settings.tts_cache_max_bytes)
+        if settings.tts_cache_dir
+        else None
+    )
+    app.state.stt_tokens = STTTokenPool(app.state.upstream.get("elevenlabs"), settings)
+    await app.state.stt_tokens.start()
+
+    # Build the API key index up front; SIGHUP re-reads keys without a restart
+    logger.info(f"Loaded {len(get_key_index())} API keys")
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_api_keys)
+    except (NotImplementedError, AttributeError, RuntimeError):
+        logger.debug("SIGHUP key reload not supported on this platform")
+
+    yield
+
+    await app.state.stt_tokens.aclose()
+    await app.state.ws_mux.aclose()
+    await app.state.balancer.aclose()
+    await app.state.upstream.aclose()
+
+
 app = FastAPI(
     title="AGORA API Gateway",
     description="Routes requests to AGORA backend orchestrators",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -35,9 +101,16 @@ async def health():
     return {"status": "healthy", "service": "api-gateway"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/gateway/backends")
 async def list_backends(settings: Settings = Depends(get_settings)):
-    """List available backends and default."""
+    """List available backends, default and replica health."""
+    balancer: LoadBalancer = app.state.balancer
     return {
         "backends": ["openai", "langgraph", "mock"],
         "default": settings.default_backend,
@@ -46,9 +119,17 @@ async def list_backends(settings: Settings = Depends(get_settings)):
             "langgraph": "/api/langgraph/*",
             "mock": "/api/mock/*",
         },
+        "replicas": {name: pool.status() for name, pool in balancer.pools.items()},
+        "multiplexed": app.state.ws_mux.status(),
     }
 
 
+@app.post("/gateway/admin/reload-keys")
+async def reload_keys(_auth: dict = Depends(verify_api_key_http)):
+    """Re-read API keys from the environment and keys file."""
+    return {"reloaded": True, "keyCount": reload_api_keys()}
+
+
 @app.get("/gateway/elevenlabs/config")
 async def get_elevenlabs_config(
     settings: Settings = Depends(get_settings),
@@ -68,7 +149,9 @@ async def get_elevenlabs_token(
 ):
     """Get a single-use token for ElevenLabs STT.
 
-    The master API key stays server-side; client gets a scoped token.
+    The master API key stays server-side; client gets a scoped token. Tokens
+    come from a prefetched pool so mic start needs no upstream round-trip;
+    an empty pool falls back to minting one on demand.
     """
     if not settings.elevenlabs_api_key:
         raise HTTPException(
@@ -76,22 +159,15 @@ async def get_elevenlabs_token(
             detail="ElevenLabs not configured",
         )
 
-    import httpx
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://api.elevenlabs.io/v1/single-use-token/realtime_scribe",
-            headers={"xi-api-key": settings.elevenlabs_api_key},
+    pool: STTTokenPool = app.state.stt_tokens
+    try:
+        return await pool.get()
+    except TokenMintError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"ElevenLabs token request failed: {e}",
         )
 
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"ElevenLabs token request failed: {response.text}",
-            )
-
-        return response.json()
-
 
 @app.post("/gateway/elevenlabs/tts")
 async def proxy_elevenlabs_tts(
@@ -99,35 +175,73 @@ async def proxy_elevenlabs_tts(
     settings: Settings = Depends(get_settings),
     _auth: dict = Depends(verify_api_key_http),
 ):
-    """Proxy TTS requests to ElevenLabs, keeping API key server-side."""
+    """Proxy TTS requests to ElevenLabs, keeping API key server-side.
+
+    Audio is cached on disk by voice, text and voice settings: repeated phrases
+    stream straight from the cache, and misses are written to it while they
+    stream to the client. The X-TTS-Cache header reports hit or miss.
+    """
     if not settings.elevenlabs_api_key:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="ElevenLabs not configured",
         )
 
-    import httpx
-
     body = await request.json()
     voice_id = body.pop("voice_id", settings.elevenlabs_voice_id)
 
+    tts_cache: TTSCache | None = app.state.tts_cache
+    cache_key = TTSCache.key(voice_id, body)
+    if tts_cache and (cached := await tts_cache.get(cache_key)):
+        TTS_CACHE.labels("hit").inc()
+        return StreamingResponse(
+            tts_cache.read(cached),
+            media_type="audio/mpeg",
+            headers={"X-TTS-Cache": "hit"},
+        )
+
+    TTS_CACHE.labels("miss" if tts_cache else "disabled").inc()
+    client = app.state.upstream.get("elevenlabs")
+
     async def stream_tts():
-        async with httpx.AsyncClient() as client:
-            async with client.stream(
-                "POST",
-                f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream",
-                headers={
-                    "xi-api-key": settings.elevenlabs_api_key,
-                    "Content-Type": "application/json",
-                },
-                json=body,
-            ) as response:
+        started = time.perf_counter()
+        first_byte = True
+        async with client.stream(
+            "POST",
+            f"{settings.elevenlabs_base_url}/v1/text-to-speech/{voice_id}/stream",
+            headers={
+                "xi-api-key": settings.elevenlabs_api_key,
+                "Content-Type": "application/json",
+            },
+            json=body,
+        ) as response:
+            # Only complete, successful syntheses are cached
+            writer = (
+                await tts_cache.open_writer(cache_key)
+                if tts_cache and response.status_code == 200
+                else None
+            )
+            try:
                 async for chunk in response.aiter_bytes():
+                    if first_byte:
+                        first_byte = False
+                        ELEVENLABS_LATENCY.labels("tts").observe(
+                            time.perf_counter() - started
+                        )
+                    if writer:
+                        await writer.write(chunk)
                     yield chunk
+                if writer:
+                    await writer.commit()
+            finally:
+                # No-op after commit; drops partial audio on error or disconnect
+                if writer:
+                    await writer.abort()
 
     return StreamingResponse(
         stream_tts(),
         media_type="audio/mpeg",
+        headers={"X-TTS-Cache": "miss"} if tts_cache else None,
     )
 
 
@@ -142,7 +256,7 @@ async def websocket_default(websocket: WebSocket):
         await websocket.accept()
         await websocket.close(code=4001, reason="Unauthorized")
         return
-    await proxy_websocket(websocket, "ws", settings)
+    await _proxy_admitted_websocket(websocket, "ws", auth, settings)
 
 
 @app.websocket("/api/{backend}/ws")
@@ -155,7 +269,43 @@ async def websocket_backend(websocket: WebSocket, backend: str):
         await websocket.accept()
         await websocket.close(code=4001, reason="Unauthorized")
         return
-    await proxy_websocket(websocket, f"api/{backend}/ws", settings)
+    await _proxy_admitted_websocket(websocket, f"api/{backend}/ws", auth, settings)
+
+
+async def _proxy_admitted_websocket(
+    websocket: WebSocket, path: str, auth: dict, settings: Settings
+) -> None:
+    """Proxy a WebSocket if its key and backend are within their limits.
+
+    The connection is charged against the request rate limit when it opens and
+    holds a concurrent-session slot until it closes.
+    """
+    backend_name, _ = resolve_backend(f"/{path}", settings)
+    key_id = client_key(auth, websocket)
+    limiter: Limiter = websocket.app.state.limiter
+
+    wait = await limiter.hit(key_id, backend_name)
+    if wait > 0:
+        RATE_LIMITED.labels(backend_name, "websocket").inc()
+        await websocket.accept()
+        await websocket.close(
+            code=WS_CLOSE_TOO_MANY,
+            reason=f"Rate limit exceeded, retry after {math.ceil(wait)}s",
+        )
+        return
+    if not await limiter.open_websocket(key_id, backend_name):
+        RATE_LIMITED.labels(backend_name, "websocket_sessions").inc()
+        logger.warning(f"Rejected WebSocket for {key_id}: too many sessions")
+        await websocket.accept()
+        await websocket.close(
+            code=WS_CLOSE_TOO_MANY, reason="Too many concurrent sessions"
+        )
+        return
+
+    try:
+        await proxy_websocket(websocket, path, settings)
+    finally:
+        await limiter.close_websocket(key_id, backend_name)
 
 
 # HTTP catch-all proxy
@@ -166,7 +316,11 @@ async def proxy_request(
     auth: dict | None = Depends(verify_api_key_http),
     settings: Settings = Depends(get_settings),
 ):
-    """Proxy HTTP requests to backend."""
+    """Proxy HTTP requests to backend, subject to per-key rate limits."""
+    backend_name, _ = resolve_backend(f"/{path}", settings)
+    await admit_request(
+        request.app.state.limiter, client_key(auth, request), backend_name
+    )
     return await proxy_http(request, path, settings)
 
 
@@ -174,4 +328,9 @@ if __name__ == "__main__":
     import uvicorn
 
     settings = get_settings()
-    uvicorn.run(app, host=settings.host, port=settings.port)
+    uvicorn.run(
+        app,
+        host=settings.host,
+        port=settings.port,
+        ws_per_message_deflate=settings.ws_compression,
+    )
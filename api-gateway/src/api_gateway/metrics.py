@@ -0,0 +1,139 @@
+"""Prometheus metrics for the gateway.
+
+Metrics live in the default prometheus_client registry and are exposed at
+/metrics. Label values are kept to a small fixed set (backend names, route
+templates, directions) so series counts stay bounded.
+"""
+
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Buckets from interactive REST calls up to long-running streamed responses
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 120)
+CONNECT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+HTTP_REQUESTS = Counter(
+    "gateway_http_requests_total",
+    "Proxied HTTP requests by route, backend, method and status",
+    ["route", "backend", "method", "status"],
+)
+HTTP_DURATION = Histogram(
+    "gateway_http_request_duration_seconds",
+    "Proxied HTTP request duration, until the response body is sent",
+    ["route", "backend"],
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_CACHE = Counter(
+    "gateway_response_cache_requests_total",
+    "Cacheable GETs by route and result (hit, coalesced or miss)",
+    ["route", "result"],
+)
+UPSTREAM_CONNECT = Histogram(
+    "gateway_upstream_connect_seconds",
+    "Time to open a new TCP (and TLS) connection to an upstream",
+    ["backend"],
+    buckets=CONNECT_BUCKETS,
+)
+UPSTREAM_ERRORS = Counter(
+    "gateway_upstream_errors_total",
+    "Failed upstream requests by backend and error kind",
+    ["backend", "kind"],
+)
+HEDGED_REQUESTS = Counter(
+    "gateway_hedged_requests_total",
+    "GETs retried on a second replica (sent, failover) and those it answered (won)",
+    ["backend", "result"],
+)
+RATE_LIMITED = Counter(
+    "gateway_rate_limited_total",
+    "Requests and WebSockets rejected by admission control",
+    ["backend", "kind"],
+)
+WS_ACTIVE = Gauge(
+    "gateway_websocket_connections_active",
+    "Open client WebSocket sessions",
+    ["backend"],
+)
+WS_FRAMES = Counter(
+    "gateway_websocket_frames_total",
+    "WebSocket frames relayed",
+    ["backend", "direction"],
+)
+WS_BYTES = Counter(
+    "gateway_websocket_bytes_total",
+    "WebSocket payload bytes relayed",
+    ["backend", "direction"],
+)
+ELEVENLABS_LATENCY = Histogram(
+    "gateway_elevenlabs_latency_seconds",
+    "ElevenLabs upstream latency (time to first audio byte for TTS)",
+    ["endpoint"],
+    buckets=LATENCY_BUCKETS,
+)
+TTS_CACHE = Counter(
+    "gateway_tts_cache_requests_total",
+    "TTS requests by cache result",
+    ["result"],
+)
+STT_TOKENS = Counter(
+    "gateway_stt_tokens_total",
+    "STT tokens handed out, by source (pool or on_demand)",
+    ["source"],
+)
+
+# Path segments followed by an identifier in backend routes
+_ID_PARENTS = {"sessions", "users", "mock_documents"}
+_KNOWN_ROOTS = {"", "agents", "health", "sessions", "users", "mock_documents"}
+
+
+def route_label(path: str) -> str:
+    """Collapse a backend path into its route template.
+
+    /sessions/abc/history becomes /sessions/{id}/history; paths outside the
+    known backend API are reported as "other" so arbitrary URLs can't create
+    new series.
+    """
+    segments = path.strip("/").split("/")
+    if segments[0] not in _KNOWN_ROOTS:
+        return "other"
+    for i in range(1, len(segments)):
+        if segments[i - 1] in _ID_PARENTS and segments[i] != "me":
+            segments[i] = "{id}"
+    return "/" + "/".join(segments[:3])
+
+
+def connect_timer(backend: str) -> Callable[[str, dict[str, Any]], Awaitable[None]]:
+    """httpx trace hook recording how long new upstream connections take.
+
+    Pass as `extensions={"trace": connect_timer(name)}`; requests that reuse a
+    pooled connection emit no connect events and record nothing.
+    """
+    histogram = UPSTREAM_CONNECT.labels(backend=backend)
+    started: float | None = None
+
+    async def trace(event: str, info: dict[str, Any]) -> None:
+        nonlocal started
+        if event == "connection.connect_tcp.started":
+            started = time.perf_counter()
+        elif started is not None and event.startswith(
+            ("http11.send_request_headers", "http2.send_connection_init")
+        ):
+            # TCP connect plus TLS handshake, if any
+            histogram.observe(time.perf_counter() - started)
+            started = None
+
+    return trace
+
+
+class RelayMetrics:
+    """Pre-labelled frame/byte counters for one backend's WebSocket relay."""
+
+    def __init__(self, backend: str):
+        """Resolve the per-direction counters once per connection."""
+        self.frames_to_client = WS_FRAMES.labels(backend, "to_client")
+        self.bytes_to_client = WS_BYTES.labels(backend, "to_client")
+        self.frames_to_backend = WS_FRAMES.labels(backend, "to_backend")
+        self.bytes_to_backend = WS_BYTES.labels(backend, "to_backend")
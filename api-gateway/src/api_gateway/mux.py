@@ -0,0 +1,247 @@
+"""Multiplexed gateway-to-backend WebSocket connections.
+
+Instead of one backend WebSocket per client, many client sessions share a
+few persistent connections per replica (the backend's /ws/mux endpoint).
+Every frame carries a one-line header with the logical stream id and an
+operation, followed by the payload:
+
+    "<stream id> open\\n"             start a session (gateway -> backend)
+    "<stream id> data\\n<payload>"    an AG-UI frame, either direction
+    "<stream id> close\\n"            end a session, either direction
+
+Binary payloads travel in binary frames with the same header bytes, so
+frame types are preserved on the shared connection. The AG-UI backends only
+accept text: like a plain /ws session, a stream that receives a binary frame
+is closed by the backend.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+
+import websockets
+
+from .config import Settings
+
+logger = logging.getLogger(__name__)
+
+Frame = str | bytes
+
+OPEN = "open"
+DATA = "data"
+CLOSE = "close"
+
+# Each stream buffers this many relay queues' worth of frames, so a burst of
+# token events read in one go fits while the relay catches up
+STREAM_BUFFER_FACTOR = 16
+
+
+def encode(stream_id: int, op: str, payload: Frame = "") -> Frame:
+    """Prefix a payload with its stream header."""
+    if isinstance(payload, bytes):
+        return f"{stream_id} {op}\n".encode() + payload
+    return f"{stream_id} {op}\n{payload}"
+
+
+def decode(frame: Frame) -> tuple[int, str, Frame]:
+    """Split a multiplexed frame into (stream id, operation, payload).
+
+    Raises:
+        ValueError: If the frame has no valid header
+    """
+    if isinstance(frame, bytes):
+        header, _, payload = frame.partition(b"\n")
+        stream_id, op = header.decode().split(" ", 1)
+    else:
+        header, _, payload = frame.partition("\n")
+        stream_id, op = header.split(" ", 1)
+    return int(stream_id), op, payload
+
+
+class MuxStream:
+    """One logical session on a shared connection.
+
+    Mirrors the parts of websockets.ClientConnection the relay uses
+    (send, async iteration, async context manager), so relay.relay works
+    unchanged on top of it.
+    """
+
+    def __init__(self, connection: "MuxConnection", stream_id: int, queue_size: int):
+        self._connection = connection
+        self.stream_id = stream_id
+        self._inbox: asyncio.Queue[Frame | None] = asyncio.Queue(maxsize=queue_size)
+        self.closed = False
+
+    async def send(self, frame: Frame) -> None:
+        """Send a frame to the backend session."""
+        if self.closed:
+            raise websockets.ConnectionClosedOK(None, None)
+        await self._connection.send(encode(self.stream_id, DATA, frame))
+
+    def __aiter__(self) -> AsyncIterator[Frame]:
+        return self
+
+    async def __anext__(self) -> Frame:
+        frame = await self._inbox.get()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
+
+    async def aclose(self) -> None:
+        """End the session and tell the backend, unless it already ended it."""
+        if self.closed:
+            return
+        self._end()
+        # Sent in the background so closing never waits on the shared socket
+        self._connection.send_later(encode(self.stream_id, CLOSE))
+
+    async def __aenter__(self) -> "MuxStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _deliver(self, frame: Frame) -> None:
+        """Queue a backend frame without blocking the shared reader.
+
+        A stream whose client has fallen a full queue behind is ended rather
+        than stalling every other session on the connection.
+        """
+        try:
+            self._inbox.put_nowait(frame)
+        except asyncio.QueueFull:
+            logger.warning(f"Mux stream {self.stream_id} overflowed, closing it")
+            self._end()
+            self._connection.send_later(encode(self.stream_id, CLOSE))
+
+    def _end(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._connection.streams.pop(self.stream_id, None)
+        # Make room for the end-of-stream marker if the inbox is full
+        if self._inbox.full():
+            self._inbox.get_nowait()
+        self._inbox.put_nowait(None)
+
+
+class MuxConnection:
+    """A persistent backend WebSocket carrying many MuxStreams."""
+
+    def __init__(self, url: str, ws: websockets.ClientConnection, queue_size: int):
+        self.url = url
+        self._ws = ws
+        self._queue_size = queue_size
+        self._next_id = 0
+        self._send_lock = asyncio.Lock()
+        self.streams: dict[int, MuxStream] = {}
+        self._background: set[asyncio.Task] = set()
+        self._reader = asyncio.create_task(self._read_loop())
+
+    @property
+    def closed(self) -> bool:
+        """Whether the underlying connection has ended."""
+        return self._reader.done()
+
+    async def open_stream(self) -> MuxStream:
+        """Start a new session on this connection."""
+        self._next_id += 1
+        stream = MuxStream(self, self._next_id, self._queue_size)
+        self.streams[stream.stream_id] = stream
+        await self.send(encode(stream.stream_id, OPEN))
+        return stream
+
+    async def send(self, frame: Frame) -> None:
+        """Send a raw multiplexed frame."""
+        async with self._send_lock:
+            await self._ws.send(frame)
+
+    def send_later(self, frame: Frame) -> None:
+        """Send a frame from synchronous code, e.g. the read loop."""
+        task = asyncio.create_task(self._send_quietly(frame))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _send_quietly(self, frame: Frame) -> None:
+        try:
+            await self.send(frame)
+        except websockets.ConnectionClosed:
+            pass
+
+    async def aclose(self) -> None:
+        """Close the connection, ending every stream on it."""
+        await self._ws.close()
+        await asyncio.gather(self._reader, return_exceptions=True)
+
+    async def _read_loop(self) -> None:
+        try:
+            async for message in self._ws:
+                try:
+                    stream_id, op, payload = decode(message)
+                except ValueError:
+                    logger.warning(f"Dropping malformed mux frame from {self.url}")
+                    continue
+                stream = self.streams.get(stream_id)
+                if stream is None:
+                    continue
+                if op == DATA:
+                    stream._deliver(payload)
+                elif op == CLOSE:
+                    stream._end()
+        except websockets.ConnectionClosed as e:
+            logger.warning(f"Mux connection to {self.url} closed: {e}")
+        finally:
+            for stream in list(self.streams.values()):
+                stream._end()
+
+
+class MuxPool:
+    """Up to ws_mux_connections persistent connections per replica URL.
+
+    New sessions go to the connection with the fewest open streams; a new
+    connection is only opened while the replica has fewer than the limit.
+    """
+
+    def __init__(self, settings: Settings):
+        """Create an empty pool; connections are opened on first use."""
+        self._max_connections = max(1, settings.ws_mux_connections)
+        self._queue_size = settings.ws_relay_queue_size * STREAM_BUFFER_FACTOR
+        self._max_queue = settings.ws_relay_queue_size
+        self._compression = "deflate" if settings.ws_compression else None
+        self._connections: dict[str, list[MuxConnection]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def open_stream(self, url: str) -> MuxStream:
+        """Open a session on a multiplexed connection to a replica.
+
+        Args:
+            url: Backend /ws/mux WebSocket URL of the replica
+
+        Raises:
+            OSError: If a new connection to the replica could not be opened
+        """
+        async with self._locks.setdefault(url, asyncio.Lock()):
+            connections = [c for c in self._connections.get(url, []) if not c.closed]
+            self._connections[url] = connections
+            if len(connections) < self._max_connections and (
+                not connections or min(len(c.streams) for c in connections) > 0
+            ):
+                ws = await websockets.connect(
+                    url, compression=self._compression, max_queue=self._max_queue
+                )
+                connections.append(MuxConnection(url, ws, self._queue_size))
+            connection = min(connections, key=lambda c: len(c.streams))
+        return await connection.open_stream()
+
+    def status(self) -> dict[str, list[int]]:
+        """Open streams per connection, by replica URL."""
+        return {
+            url: [len(c.streams) for c in connections if not c.closed]
+            for url, connections in self._connections.items()
+        }
+
+    async def aclose(self) -> None:
+        """Close every connection."""
+        connections = [c for cs in self._connections.values() for c in cs]
+        self._connections.clear()
+        await asyncio.gather(*(c.aclose() for c in connections))
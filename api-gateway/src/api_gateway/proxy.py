@@ -1,52 +1,110 @@
 """HTTP and WebSocket proxy module."""
 
-import asyncio
+import json
 import logging
+import re
+import time
+from collections.abc import Callable
 from typing import AsyncIterator
 
 import httpx
-from fastapi import Request, WebSocket, WebSocketDisconnect
+from fastapi import HTTPException, Request, WebSocket, WebSocketDisconnect, status
 from starlette.requests import ClientDisconnect
 from starlette.responses import Response, StreamingResponse
 from starlette.websockets import WebSocketState
 import websockets
 
-from .config import Settings, get_settings
+from .balancer import BackendPool, Replica
+from .compression import compress_body, compress_stream, negotiate
+from .config import Settings
+from .hedging import Hedger, send_on
+from .metrics import (
+    HTTP_DURATION,
+    HTTP_REQUESTS,
+    UPSTREAM_ERRORS,
+    WS_ACTIVE,
+    RESPONSE_CACHE,
+    RelayMetrics,
+    connect_timer,
+    route_label,
+)
+from .mux import MuxPool
+from .relay import Frame, RelayStats, receive_frame, relay
+from .response_cache import CachedResponse, ResponseCache
 
 logger = logging.getLogger(__name__)
 
 
-BACKENDS: dict[str, str] | None = None
+BACKENDS: dict[str, list[str]] | None = None
 
 
-def get_backends(settings: Settings) -> dict[str, str]:
-    """Get backend URL mapping."""
+def _parse_replicas(urls: str) -> list[str]:
+    """Split a comma-separated replica list into normalized URLs."""
+    return [u.strip().rstrip("/") for u in urls.split(",") if u.strip()]
+
+
+def get_backends(settings: Settings) -> dict[str, list[str]]:
+    """Get backend name to replica URLs mapping."""
     global BACKENDS
     if BACKENDS is None:
         BACKENDS = {
-            "openai": settings.openai_backend_url,
-            "langgraph": settings.langgraph_backend_url,
-            "mock": settings.mock_backend_url,
+            "openai": _parse_replicas(settings.openai_backend_url),
+            "langgraph": _parse_replicas(settings.langgraph_backend_url),
+            "mock": _parse_replicas(settings.mock_backend_url),
         }
     return BACKENDS
 
 
 def resolve_backend(path: str, settings: Settings) -> tuple[str, str]:
-    """Resolve backend URL and remaining path from request path.
+    """Resolve backend name and remaining path from request path.
 
-    Returns (backend_url, remaining_path)
+    Returns (backend_name, remaining_path)
     """
     backends = get_backends(settings)
 
     # Check for explicit backend prefix: /api/{backend}/...
-    for backend_name, backend_url in backends.items():
+    for backend_name in backends:
         prefix = f"/api/{backend_name}"
         if path.startswith(prefix):
             remaining = path[len(prefix) :] or "/"
-            return backend_url, remaining
+            return backend_name, remaining
 
     # Use default backend
-    return backends[settings.default_backend], path
+    return settings.default_backend, path
+
+
+# Hop-by-hop headers are never forwarded in either direction
+# Accept-Encoding is negotiated by the gateway itself (see compression.py)
+EXCLUDED_REQUEST_HEADERS = {
+    "host",
+    "connection",
+    "keep-alive",
+    "transfer-encoding",
+    "accept-encoding",
+}
+EXCLUDED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+# Conditional headers are answered by the gateway cache, not the backend
+CONDITIONAL_HEADERS = {"if-none-match", "if-modified-since"}
+
+SESSION_PATH_RE = re.compile(r"^/sessions/([^/?]+)")
+
+
+def thread_id_from_path(path: str) -> str | None:
+    """Extract the session (thread) id from a /sessions/{id}... path."""
+    match = SESSION_PATH_RE.match(path)
+    return match.group(1) if match else None
+
+
+def thread_id_from_frame(data: str) -> str | None:
+    """Extract the AG-UI threadId from a client WebSocket frame, if present."""
+    try:
+        message = json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(message, dict):
+        return None
+    thread_id = message.get("threadId") or message.get("thread_id")
+    return thread_id if isinstance(thread_id, str) else None
 
 
 async def proxy_http(
@@ -54,114 +112,377 @@ async def proxy_http(
     path: str,
     settings: Settings,
 ) -> Response:
-    """Proxy HTTP request to backend."""
-    backend_url, target_path = resolve_backend(f"/{path}", settings)
+    """Proxy HTTP request to backend.
 
-    url = f"{backend_url}{target_path}"
-    if request.url.query:
-        url = f"{url}?{request.url.query}"
+    Uses the backend's pooled client from app state so connections are reused,
+    and streams the request body upstream instead of buffering it. GETs of the
+    routes HAI polls go through the response cache instead (see _cached_get).
+    """
+    started = time.perf_counter()
+    backend_name, target_path = resolve_backend(f"/{path}", settings)
+    route = route_label(target_path)
+    cache: ResponseCache = request.app.state.response_cache
+    if cache.cacheable(request.method, route):
+        return await _cached_get(
+            request, backend_name, target_path, route, started, settings
+        )
 
-    # Forward headers, excluding hop-by-hop headers
-    excluded_headers = {"host", "connection", "keep-alive", "transfer-encoding"}
-    headers = {
-        k: v for k, v in request.headers.items() if k.lower() not in excluded_headers
-    }
+    url = f"{target_path}?{request.url.query}" if request.url.query else target_path
+
+    # Only attach a body stream when the client actually sent one, so bodiless
+    # GETs aren't forwarded with chunked transfer-encoding
+    has_body = (
+        "content-length" in request.headers or "transfer-encoding" in request.headers
+    )
+
+    client: httpx.AsyncClient = request.app.state.upstream.get(backend_name)
 
+    def build(replica: Replica) -> httpx.Request:
+        return client.build_request(
+            method=request.method,
+            url=f"{replica.url}{url}",
+            headers=_forward_headers(request),
+            content=request.stream() if has_body else None,
+            extensions={"trace": connect_timer(backend_name)},
+        )
+
+    pool: BackendPool = request.app.state.balancer.get(backend_name)
     try:
-        body = await request.body()
+        replica, proxy_resp = await _send(
+            request,
+            pool,
+            client,
+            build,
+            thread_id_from_path(target_path),
+            idempotent=request.method == "GET" and not has_body,
+        )
     except ClientDisconnect:
-        # Client disconnected before we could read the body - this is normal
-        # (e.g., browser navigation, fetch cancellation, page refresh)
-        logger.debug("Client disconnected before request body was read")
+        # Client disconnected while the body was being streamed upstream - this is
+        # normal (e.g., browser navigation, fetch cancellation, page refresh)
+        HTTP_REQUESTS.labels(route, backend_name, request.method, "499").inc()
+        logger.debug("Client disconnected before request body was sent")
         return Response(status_code=499)  # Client Closed Request (nginx convention)
-
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        proxy_req = client.build_request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            content=body,
+    except httpx.ConnectError:
+        HTTP_REQUESTS.labels(route, backend_name, request.method, "502").inc()
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Backend '{backend_name}' unavailable",
         )
 
-        proxy_resp = await client.send(proxy_req, stream=True)
+    if cache.invalidated_by(request.method, target_path):
+        cache.invalidate(backend_name)
+
+    async def stream_response() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in proxy_resp.aiter_bytes():
+                yield chunk
+        except ClientDisconnect:
+            logger.debug("Client disconnected during response streaming")
+        finally:
+            # Returns the connection to the backend's pool
+            await proxy_resp.aclose()
+            pool.release(replica)
+            HTTP_REQUESTS.labels(
+                route, backend_name, request.method, str(proxy_resp.status_code)
+            ).inc()
+            HTTP_DURATION.labels(route, backend_name).observe(
+                time.perf_counter() - started
+            )
 
-        async def stream_response() -> AsyncIterator[bytes]:
-            try:
-                async for chunk in proxy_resp.aiter_bytes():
-                    yield chunk
-            except ClientDisconnect:
-                logger.debug("Client disconnected during response streaming")
-            finally:
-                await proxy_resp.aclose()
+    response_headers = _response_headers(proxy_resp)
+    content_type = proxy_resp.headers.get("content-type")
+    # Compress here rather than passing the backend's encoding through, so
+    # large history/tool payloads are compressed on the client leg only
+    content_length = proxy_resp.headers.get("content-length")
+    body, encoding = await compress_stream(
+        stream_response(),
+        _negotiate(request, content_type, settings),
+        settings,
+        size_hint=int(content_length) if content_length else None,
+    )
+    if encoding:
+        response_headers["content-encoding"] = encoding
+        response_headers["vary"] = "Accept-Encoding"
+
+    return StreamingResponse(
+        body,
+        status_code=proxy_resp.status_code,
+        headers=response_headers,
+        media_type=content_type,
+    )
+
+
+async def _cached_get(
+    request: Request,
+    backend_name: str,
+    target_path: str,
+    route: str,
+    started: float,
+    settings: Settings,
+) -> Response:
+    """Serve a polled GET from the response cache.
 
-        # Filter response headers
-        response_headers = {
+    Identical concurrent requests share one buffered upstream fetch, fresh
+    responses are reused for the cache TTL, and a matching If-None-Match is
+    answered with 304 without sending the body. Compressed variants are
+    kept on the cached entry so hits are not re-compressed.
+    """
+    cache: ResponseCache = request.app.state.response_cache
+    key = cache.key(backend_name, target_path, request.url.query)
+
+    async def load() -> CachedResponse:
+        pool: BackendPool = request.app.state.balancer.get(backend_name)
+        client: httpx.AsyncClient = request.app.state.upstream.get(backend_name)
+        url = f"{target_path}?{request.url.query}" if request.url.query else target_path
+        headers = {
             k: v
-            for k, v in proxy_resp.headers.items()
-            if k.lower()
-            not in {"content-encoding", "content-length", "transfer-encoding"}
+            for k, v in _forward_headers(request).items()
+            if k.lower() not in CONDITIONAL_HEADERS
         }
 
-        return StreamingResponse(
-            stream_response(),
-            status_code=proxy_resp.status_code,
-            headers=response_headers,
-            media_type=proxy_resp.headers.get("content-type"),
+        def build(replica: Replica) -> httpx.Request:
+            return client.build_request(
+                "GET",
+                f"{replica.url}{url}",
+                headers=headers,
+                extensions={"trace": connect_timer(backend_name)},
+            )
+
+        try:
+            replica, resp = await _send(
+                request,
+                pool,
+                client,
+                build,
+                thread_id_from_path(target_path),
+                idempotent=True,
+            )
+        except httpx.ConnectError:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Backend '{backend_name}' unavailable",
+            )
+        try:
+            await resp.aread()
+        finally:
+            await resp.aclose()
+            pool.release(replica)
+        return CachedResponse.build(
+            resp.status_code, _response_headers(resp), resp.content
         )
 
+    try:
+        entry, result = await cache.get_or_load(backend_name, key, load)
+    except HTTPException as e:
+        HTTP_REQUESTS.labels(route, backend_name, "GET", str(e.status_code)).inc()
+        raise
+    RESPONSE_CACHE.labels(route, result).inc()
+
+    not_modified = entry.status_code == 200 and entry.matches(
+        request.headers.get("if-none-match")
+    )
+    status_code = 304 if not_modified else entry.status_code
+    HTTP_REQUESTS.labels(route, backend_name, "GET", str(status_code)).inc()
+    HTTP_DURATION.labels(route, backend_name).observe(time.perf_counter() - started)
+
+    if not_modified:
+        return Response(status_code=304, headers={"etag": entry.etag})
+
+    body = entry.body
+    headers = {**entry.headers, "X-Gateway-Cache": result}
+    encoding = _negotiate(request, entry.headers.get("content-type"), settings)
+    if encoding and len(body) >= settings.compression_min_size:
+        if encoding not in entry.encoded:
+            entry.encoded[encoding] = compress_body(body, encoding, settings)
+        body = entry.encoded[encoding]
+        headers["content-encoding"] = encoding
+        headers["vary"] = "Accept-Encoding"
+        # Variants share the ETag, so it is weak (RFC 9110 section 8.8.1)
+        headers["etag"] = f"W/{entry.etag.removeprefix('W/')}"
+    return Response(content=body, status_code=entry.status_code, headers=headers)
+
+
+async def _send(
+    request: Request,
+    pool: BackendPool,
+    client: httpx.AsyncClient,
+    build: Callable[[Replica], httpx.Request],
+    affinity_key: str | None,
+    idempotent: bool,
+) -> tuple[Replica, httpx.Response]:
+    """Send a request upstream, hedging idempotent GETs when enabled.
+
+    Returns the acquired replica, which the caller releases once the streamed
+    response is closed. Connection failures eject the replica and raise
+    httpx.ConnectError.
+    """
+    hedger: Hedger = request.app.state.hedger
+    if idempotent and hedger.enabled:
+        return await hedger.send(pool, client, build, affinity_key)
+    replica = pool.acquire(affinity_key=affinity_key)
+    return replica, await send_on(pool, replica, client, build(replica))
+
+
+def _negotiate(
+    request: Request, content_type: str | None, settings: Settings
+) -> str | None:
+    """Response encoding for a request, or None to send it uncompressed."""
+    if not settings.compression_enabled:
+        return None
+    return negotiate(request.headers.get("accept-encoding"), content_type)
+
+
+def _forward_headers(request: Request) -> dict[str, str]:
+    """Client request headers to send upstream."""
+    return {
+        k: v
+        for k, v in request.headers.items()
+        if k.lower() not in EXCLUDED_REQUEST_HEADERS
+    }
+
+
+def _response_headers(response: httpx.Response) -> dict[str, str]:
+    """Upstream response headers to return to the client."""
+    return {
+        k: v
+        for k, v in response.headers.items()
+        if k.lower() not in EXCLUDED_RESPONSE_HEADERS
+    }
+
 
 async def proxy_websocket(
     websocket: WebSocket,
     path: str,
     settings: Settings,
 ) -> None:
-    """Proxy WebSocket connection to backend."""
-    backend_url, target_path = resolve_backend(f"/{path}", settings)
-
-    # Convert HTTP URL to WebSocket URL
-    ws_url = backend_url.replace("http://", "ws://").replace("https://", "wss://")
-    ws_url = f"{ws_url}{target_path}"
+    """Proxy WebSocket connection to backend.
+
+    The backend connection is opened after the first client frame, so its
+    threadId can pin the connection to the thread's replica. If the client
+    later starts a run on a thread owned by another replica, the backend
+    connection is moved there. The replica counts the connection as
+    outstanding for its lifetime.
+
+    Text and binary frames are relayed with bounded buffering (see
+    relay.relay); permessage-deflate is negotiated on the backend leg when
+    GATEWAY_WS_COMPRESSION is enabled. For backends listed in
+    GATEWAY_WS_MULTIPLEX_BACKENDS, the session runs as a stream on a shared
+    connection to the replica's /ws/mux instead (see mux.py).
+    """
+    backend_name, target_path = resolve_backend(f"/{path}", settings)
+    pool: BackendPool = websocket.app.state.balancer.get(backend_name)
 
     # Forward query params
+    query = ""
     if websocket.url.query:
         # Remove token param (used for auth)
         params = [
             p for p in websocket.url.query.split("&") if not p.startswith("token=")
         ]
         if params:
-            ws_url = f"{ws_url}?{'&'.join(params)}"
+            query = f"?{'&'.join(params)}"
 
     await websocket.accept()
 
     try:
-        async with websockets.connect(ws_url) as backend_ws:
-
-            async def forward_to_backend():
-                try:
-                    while True:
-                        data = await websocket.receive_text()
-                        await backend_ws.send(data)
-                except WebSocketDisconnect:
-                    logger.info("Client disconnected")
-                except Exception as e:
-                    logger.error(f"Error forwarding to backend: {e}")
-
-            async def forward_to_client():
-                try:
-                    async for message in backend_ws:
-                        if websocket.client_state == WebSocketState.CONNECTED:
-                            await websocket.send_text(message)
-                except Exception as e:
-                    logger.error(f"Error forwarding to client: {e}")
-
-            # Run both directions concurrently
-            await asyncio.gather(
-                forward_to_backend(),
-                forward_to_client(),
-                return_exceptions=True,
+        pending: Frame | None = await receive_frame(websocket)
+    except WebSocketDisconnect:
+        logger.info("Client disconnected")
+        return
+
+    cache: ResponseCache = websocket.app.state.response_cache
+
+    def on_backend_frame(frame: Frame) -> None:
+        # HAI re-fetches /sessions on RUN_FINISHED; it must not get a cached list
+        if isinstance(frame, str) and "RUN_FINISHED" in frame:
+            cache.invalidate(backend_name)
+
+    mux: MuxPool = websocket.app.state.ws_mux
+    multiplexed = target_path == "/ws" and backend_name in _multiplexed(settings)
+
+    stats = RelayStats(metrics=RelayMetrics(backend_name))
+    active = WS_ACTIVE.labels(backend_name)
+    active.inc()
+    try:
+        while pending is not None:
+            replica = pool.acquire(affinity_key=_frame_thread_id(pending))
+
+            def is_handoff(frame: Frame, replica: Replica = replica) -> bool:
+                thread_id = _frame_thread_id(frame)
+                return bool(thread_id) and not pool.routes_together(thread_id, replica)
+
+            # Convert HTTP URL to WebSocket URL
+            ws_url = replica.url.replace("http://", "ws://").replace(
+                "https://", "wss://"
             )
 
-    except Exception as e:
-        logger.error(f"WebSocket proxy error: {e}")
+            try:
+                if multiplexed:
+                    # Query params are per client and can't go on a shared
+                    # connection; the backends' /ws ignores them anyway
+                    backend_ws = await mux.open_stream(f"{ws_url}/ws/mux")
+                else:
+                    backend_ws = await websockets.connect(
+                        f"{ws_url}{target_path}{query}",
+                        compression="deflate" if settings.ws_compression else None,
+                        max_queue=settings.ws_relay_queue_size,
+                    )
+                async with backend_ws:
+                    await backend_ws.send(pending)
+                    stats.record(pending, to_client=False)
+                    pending = await relay(
+                        websocket,
+                        backend_ws,
+                        stats,
+                        is_handoff,
+                        queue_size=settings.ws_relay_queue_size,
+                        send_timeout=settings.ws_client_send_timeout,
+                        on_backend_frame=on_backend_frame,
+                    )
+
+            except OSError as e:
+                # Connection refused/reset while opening the backend socket
+                pool.eject(replica)
+                UPSTREAM_ERRORS.labels(backend_name, "ws_connect").inc()
+                logger.error(
+                    f"Failed to connect to {backend_name} replica {replica.url}: {e}"
+                )
+                if websocket.client_state == WebSocketState.CONNECTED:
+                    await websocket.close(code=1011, reason="Backend unavailable")
+                return
+            except Exception as e:
+                logger.error(f"WebSocket proxy error: {e}")
+                if websocket.client_state == WebSocketState.CONNECTED:
+                    await websocket.close(code=1011, reason=str(e))
+                return
+            finally:
+                pool.release(replica)
+
+            if pending is not None:
+                logger.info(
+                    f"Thread moved to another {backend_name} replica, reconnecting"
+                )
+
+        # Backend closed the session (or the client left) - close the client too
         if websocket.client_state == WebSocketState.CONNECTED:
-            await websocket.close(code=1011, reason=str(e))
+            await websocket.close()
+    finally:
+        active.dec()
+        logger.info(
+            f"WebSocket relay closed ({backend_name}): "
+            f"to_backend={stats.frames_to_backend} frames/"
+            f"{stats.bytes_to_backend} bytes, "
+            f"to_client={stats.frames_to_client} frames/"
+            f"{stats.bytes_to_client} bytes, "
+            f"binary={stats.binary_frames}, peak_buffered={stats.peak_buffered}"
+        )
+
+
+def _multiplexed(settings: Settings) -> set[str]:
+    """Backends whose WebSocket sessions are multiplexed."""
+    return {b.strip() for b in settings.ws_multiplex_backends.split(",") if b.strip()}
+
+
+def _frame_thread_id(frame: Frame) -> str | None:
+    """threadId of a text frame; binary frames never carry one."""
+    return thread_id_from_frame(frame) if isinstance(frame, str) else None
@@ -0,0 +1,163 @@
+"""Bidirectional WebSocket frame relay with bounded buffering."""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import websockets
+from fastapi import WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocketState
+
+from .metrics import RelayMetrics
+
+logger = logging.getLogger(__name__)
+
+Frame = str | bytes
+
+
+@dataclass
+class RelayStats:
+    """Per-connection frame and byte counters for both directions."""
+
+    frames_to_backend: int = 0
+    bytes_to_backend: int = 0
+    frames_to_client: int = 0
+    bytes_to_client: int = 0
+    binary_frames: int = 0
+    peak_buffered: int = 0
+    metrics: RelayMetrics | None = field(default=None, repr=False)
+
+    def record(self, frame: Frame, to_client: bool) -> None:
+        """Count one relayed frame (and export it, if metrics are attached)."""
+        size = len(frame) if isinstance(frame, bytes) else len(frame.encode())
+        if isinstance(frame, bytes):
+            self.binary_frames += 1
+        if to_client:
+            self.frames_to_client += 1
+            self.bytes_to_client += size
+            if self.metrics:
+                self.metrics.frames_to_client.inc()
+                self.metrics.bytes_to_client.inc(size)
+        else:
+            self.frames_to_backend += 1
+            self.bytes_to_backend += size
+            if self.metrics:
+                self.metrics.frames_to_backend.inc()
+                self.metrics.bytes_to_backend.inc(size)
+
+
+async def receive_frame(websocket: WebSocket) -> Frame:
+    """Receive the next text or binary frame from the client.
+
+    Raises:
+        WebSocketDisconnect: If the client closed the connection
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    text = message.get("text")
+    return text if text is not None else message.get("bytes", b"")
+
+
+async def send_frame(websocket: WebSocket, frame: Frame) -> None:
+    """Send a text or binary frame to the client."""
+    if isinstance(frame, bytes):
+        await websocket.send_bytes(frame)
+    else:
+        await websocket.send_text(frame)
+
+
+async def relay(
+    websocket: WebSocket,
+    backend_ws: websockets.ClientConnection,
+    stats: RelayStats,
+    is_handoff: Callable[[Frame], bool],
+    queue_size: int,
+    send_timeout: float,
+    on_backend_frame: Callable[[Frame], None] | None = None,
+) -> Frame | None:
+    """Relay frames in both directions until either side closes.
+
+    Backend frames pass through a queue of at most `queue_size` frames. When a
+    slow client lets it fill up, the gateway stops reading from the backend,
+    so TCP flow control pushes back on the backend instead of the gateway
+    buffering an unbounded stream of token events. A client that accepts no
+    frame for `send_timeout` seconds is disconnected.
+
+    Args:
+        websocket: Client connection
+        backend_ws: Backend connection
+        stats: Counters updated for every relayed frame
+        is_handoff: Returns True for client frames that belong on another
+            backend connection (they are returned instead of forwarded)
+        queue_size: Maximum backend frames buffered for the client
+        send_timeout: Seconds a single client send may block
+        on_backend_frame: Optional hook called for each backend frame before
+            it is queued for the client
+
+    Returns:
+        The client frame to hand off, or None when the session ended
+    """
+    handoff: Frame | None = None
+    to_client: asyncio.Queue[Frame | None] = asyncio.Queue(maxsize=queue_size)
+
+    async def forward_to_backend() -> None:
+        nonlocal handoff
+        try:
+            while True:
+                frame = await receive_frame(websocket)
+                if is_handoff(frame):
+                    handoff = frame
+                    return
+                await backend_ws.send(frame)
+                stats.record(frame, to_client=False)
+        except WebSocketDisconnect:
+            logger.info("Client disconnected")
+        except Exception as e:
+            logger.error(f"Error forwarding to backend: {e}")
+
+    async def read_from_backend() -> None:
+        try:
+            async for message in backend_ws:
+                if on_backend_frame:
+                    on_backend_frame(message)
+                await to_client.put(message)
+                stats.peak_buffered = max(stats.peak_buffered, to_client.qsize())
+        except Exception as e:
+            logger.error(f"Error reading from backend: {e}")
+        # End-of-stream marker (not reached when cancelled)
+        await to_client.put(None)
+
+    async def forward_to_client() -> None:
+        try:
+            while (frame := await to_client.get()) is not None:
+                if websocket.client_state != WebSocketState.CONNECTED:
+                    return
+                await asyncio.wait_for(send_frame(websocket, frame), send_timeout)
+                stats.record(frame, to_client=True)
+        except TimeoutError:
+            logger.warning(
+                f"Client did not accept a frame within {send_timeout:.0f}s, closing"
+            )
+            try:
+                await websocket.close(code=1013, reason="Client too slow")
+            except Exception:
+                pass
+        except Exception as e:
+            logger.error(f"Error forwarding to client: {e}")
+
+    reader = asyncio.create_task(read_from_backend())
+    # Stop as soon as either direction is done
+    tasks = [
+        asyncio.create_task(forward_to_backend()),
+        asyncio.create_task(forward_to_client()),
+    ]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in [*tasks, reader]:
+            task.cancel()
+        await asyncio.gather(*tasks, reader, return_exceptions=True)
+
+    return handoff
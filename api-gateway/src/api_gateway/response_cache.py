@@ -0,0 +1,164 @@
+"""Micro-cache with request coalescing for read-heavy proxied GETs."""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from .config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Route templates (see metrics.route_label) that HAI polls
+CACHEABLE_ROUTES = {"/sessions", "/sessions/{id}/history", "/agents"}
+# Mutations under these roots invalidate the backend's /sessions entries
+INVALIDATING_ROOTS = ("/sessions", "/users")
+
+
+@dataclass
+class CachedResponse:
+    """A fully buffered upstream response."""
+
+    status_code: int
+    headers: dict[str, str]
+    body: bytes
+    etag: str
+    expires: float = 0.0
+    # Compressed bodies by content-encoding, filled on first use
+    encoded: dict[str, bytes] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def build(cls, status_code: int, headers: dict[str, str], body: bytes):
+        """Wrap an upstream response, deriving a strong ETag if it has none."""
+        etag = headers.get("etag")
+        if not etag:
+            etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        return cls(status_code, {**headers, "etag": etag}, body, etag)
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """Whether an If-None-Match header matches this response's ETag."""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return self.etag.removeprefix("W/") in tags
+
+
+class ResponseCache:
+    """Short-TTL cache of GET responses plus singleflight for misses.
+
+    Concurrent identical GETs share one upstream request. Successful
+    responses are kept for `ttl` seconds so UI polling mostly never reaches
+    the backend. Each backend has a generation counter: invalidation bumps
+    it, and a load that started before the bump is handed to its waiters but
+    not stored, so a mutation is never followed by a stale cached read.
+    """
+
+    def __init__(self, settings: Settings):
+        """Create an empty cache from the response_cache_* settings."""
+        self._ttl = settings.response_cache_ttl
+        self._max_entries = settings.response_cache_max_entries
+        self._max_body = settings.response_cache_max_body_bytes
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task[CachedResponse]] = {}
+        self._generations: dict[str, int] = {}
+
+    @staticmethod
+    def cacheable(method: str, route: str) -> bool:
+        """Whether a request can be served from the cache."""
+        return method == "GET" and route in CACHEABLE_ROUTES
+
+    @staticmethod
+    def invalidated_by(method: str, path: str) -> bool:
+        """Whether a request mutates state that cached entries depend on."""
+        return method in ("POST", "PUT", "PATCH", "DELETE") and path.startswith(
+            INVALIDATING_ROOTS
+        )
+
+    @staticmethod
+    def key(backend: str, path: str, query: str) -> str:
+        """Cache key for a backend path and query string."""
+        return f"{backend} {path}?{query}"
+
+    async def get_or_load(
+        self,
+        backend: str,
+        key: str,
+        load: Callable[[], Awaitable[CachedResponse]],
+    ) -> tuple[CachedResponse, str]:
+        """Return a cached response, joining or starting a load on a miss.
+
+        Args:
+            backend: Backend name (for invalidation)
+            key: Key from key()
+            load: Fetches the response from the backend
+
+        Returns:
+            (response, result) where result is "hit", "coalesced" or "miss"
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry, "hit"
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            return await asyncio.shield(task), "coalesced"
+
+        # The load runs as its own task so the first requester disconnecting
+        # doesn't cancel it for the others waiting on it
+        task = asyncio.create_task(self._load(backend, key, load))
+        task.add_done_callback(_consume_exception)
+        self._inflight[key] = task
+        return await asyncio.shield(task), "miss"
+
+    async def _load(
+        self,
+        backend: str,
+        key: str,
+        load: Callable[[], Awaitable[CachedResponse]],
+    ) -> CachedResponse:
+        generation = self._generations.get(backend, 0)
+        try:
+            entry = await load()
+        finally:
+            # invalidate() may already have replaced this load with a newer one
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+        if (
+            self._ttl > 0
+            and entry.status_code == 200
+            and len(entry.body) <= self._max_body
+            and generation == self._generations.get(backend, 0)
+        ):
+            entry.expires = time.monotonic() + self._ttl
+            self._entries[key] = entry
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, backend: str) -> None:
+        """Drop a backend's session entries and detach in-flight loads.
+
+        Requests arriving after this start a fresh load instead of joining one
+        that may have read the backend before the mutation.
+        """
+        self._generations[backend] = self._generations.get(backend, 0) + 1
+        prefix = f"{backend} /sessions"
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+        for key in [k for k in self._inflight if k.startswith(prefix)]:
+            del self._inflight[key]
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    """Retrieve a load's exception so unawaited failures aren't logged."""
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,133 @@
+"""Prefetched pool of ElevenLabs single-use STT tokens."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+
+import httpx
+
+from .config import Settings
+from .metrics import ELEVENLABS_LATENCY, STT_TOKENS
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = 60.0
+
+
+class TokenMintError(Exception):
+    """ElevenLabs refused or failed to mint a token."""
+
+
+class STTTokenPool:
+    """Bounded pool of pre-minted realtime STT tokens.
+
+    Pressing the microphone button would otherwise wait on a round-trip to
+    ElevenLabs. Tokens are minted ahead of time by a background task, handed
+    out oldest first, and dropped once they are older than the configured
+    max age so a client never receives one that is about to expire.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, settings: Settings):
+        """Create an empty pool; call start() to begin prefetching."""
+        self._client = client
+        self._url = (
+            f"{settings.elevenlabs_base_url}/v1/single-use-token/realtime_scribe"
+        )
+        self._api_key = settings.elevenlabs_api_key
+        self._size = settings.elevenlabs_token_pool_size
+        self._max_age = settings.elevenlabs_token_max_age
+        self._tokens: deque[tuple[dict, float]] = deque()
+        self._wanted = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        self._drop_expired()
+        return len(self._tokens)
+
+    async def start(self) -> None:
+        """Start the background refill task."""
+        if self._size > 0 and self._api_key:
+            self._task = asyncio.create_task(self._refill_loop())
+
+    async def aclose(self) -> None:
+        """Stop refilling and discard pooled tokens."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._tokens.clear()
+
+    def take(self) -> dict | None:
+        """Hand out a pooled token, or None if the pool is empty."""
+        self._drop_expired()
+        self._wanted.set()
+        if not self._tokens:
+            return None
+        token, _ = self._tokens.popleft()
+        return token
+
+    async def get(self) -> dict:
+        """Get a token from the pool, minting one synchronously if empty.
+
+        Raises:
+            TokenMintError: If the pool is empty and ElevenLabs fails
+        """
+        token = self.take()
+        if token is not None:
+            STT_TOKENS.labels("pool").inc()
+            return token
+        logger.info("STT token pool empty, minting on demand")
+        token = await self.mint()
+        STT_TOKENS.labels("on_demand").inc()
+        return token
+
+    async def mint(self) -> dict:
+        """Request a fresh single-use token from ElevenLabs.
+
+        Raises:
+            TokenMintError: If the request fails or is rejected
+        """
+        started = time.perf_counter()
+        try:
+            response = await self._client.post(
+                self._url, headers={"xi-api-key": self._api_key}
+            )
+        except httpx.HTTPError as e:
+            raise TokenMintError(str(e)) from e
+        ELEVENLABS_LATENCY.labels("token").observe(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise TokenMintError(response.text)
+        return response.json()
+
+    def _drop_expired(self) -> None:
+        cutoff = time.monotonic() - self._max_age
+        while self._tokens and self._tokens[0][1] <= cutoff:
+            self._tokens.popleft()
+
+    async def _refill_loop(self) -> None:
+        delay = 1.0
+        while True:
+            self._wanted.clear()
+            self._drop_expired()
+            try:
+                while len(self._tokens) < self._size:
+                    self._tokens.append((await self.mint(), time.monotonic()))
+                delay = 1.0
+            except Exception as e:
+                logger.warning(
+                    f"STT token prefetch failed, retrying in {delay:.0f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+                continue
+
+            # Sleep until a token is taken or the oldest one expires
+            expires_in = self._tokens[0][1] + self._max_age - time.monotonic()
+            try:
+                await asyncio.wait_for(self._wanted.wait(), max(expires_in, 0))
+            except TimeoutError:
+                pass
@@ -0,0 +1,182 @@
+"""Content-addressed disk cache for ElevenLabs TTS audio."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+SUFFIX = ".mp3"
+
+
+class CacheWriter:
+    """Tees a streamed TTS response into a temp file, published on commit.
+
+    File operations run in a worker thread, off the event loop.
+    """
+
+    def __init__(self, cache: "TTSCache", key: str, tmp: Path, file: BinaryIO):
+        """Wrap a temp file opened by TTSCache.open_writer()."""
+        self._cache = cache
+        self._key = key
+        self._tmp = tmp
+        self._file = file
+        self._size = 0
+        self._done = False
+
+    async def write(self, chunk: bytes) -> None:
+        """Append a chunk of audio."""
+        await asyncio.to_thread(self._file.write, chunk)
+        self._size += len(chunk)
+
+    async def commit(self) -> None:
+        """Publish the complete audio file into the cache."""
+        if self._done:
+            return
+        self._done = True
+        await asyncio.to_thread(self._publish)
+        if self._size > 0:
+            evicted = self._cache._add(self._key, self._size)
+            if evicted:
+                await asyncio.to_thread(self._cache._unlink, evicted)
+
+    async def abort(self) -> None:
+        """Discard a partial download (upstream error or client disconnect)."""
+        if self._done:
+            return
+        self._done = True
+        await asyncio.to_thread(self._discard)
+
+    def _publish(self) -> None:
+        self._file.close()
+        if self._size == 0:
+            self._tmp.unlink(missing_ok=True)
+        else:
+            os.replace(self._tmp, self._cache.path_for(self._key))
+
+    def _discard(self) -> None:
+        self._file.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+class TTSCache:
+    """LRU cache of synthesized audio on disk, bounded by total bytes.
+
+    Entries are keyed by a SHA-256 of the voice id and the full request body
+    (text, model and voice settings), so identical phrases such as fixed
+    mode-switch announcements are synthesized only once.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int):
+        """Create the cache, indexing any entries already on disk."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._total = 0
+
+        # Rebuild LRU order from modification times (touched on every hit)
+        for tmp in self.directory.glob(".*.tmp"):
+            tmp.unlink(missing_ok=True)
+        files = sorted(
+            self.directory.glob(f"*{SUFFIX}"), key=lambda p: p.stat().st_mtime
+        )
+        for path in files:
+            self._entries[path.stem] = path.stat().st_size
+            self._total += path.stat().st_size
+        self._unlink(self._evict())
+        logger.info(
+            f"TTS cache at {self.directory}: {len(self._entries)} entries, "
+            f"{self._total} bytes (max {max_bytes})"
+        )
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of cached audio."""
+        return self._total
+
+    @staticmethod
+    def key(voice_id: str, body: dict[str, Any]) -> str:
+        """Content address for a TTS request."""
+        canonical = json.dumps(
+            {"voice_id": voice_id, **body}, sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        """Path of the cache file for a key."""
+        return self.directory / f"{key}{SUFFIX}"
+
+    async def get(self, key: str) -> BinaryIO | None:
+        """Open cached audio for reading, marking it most recently used.
+
+        The file is opened before it is returned, so evicting the entry while
+        it streams does not cut the response short.
+        """
+        if key not in self._entries:
+            return None
+        try:
+            file = await asyncio.to_thread(self._open_entry, self.path_for(key))
+        except FileNotFoundError:
+            self._forget(key)
+            return None
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        return file
+
+    async def open_writer(self, key: str) -> CacheWriter:
+        """Start teeing a cache miss to disk."""
+        tmp = self.directory / f".{key}.{uuid.uuid4().hex}.tmp"
+        file = await asyncio.to_thread(open, tmp, "wb")
+        return CacheWriter(self, key, tmp, file)
+
+    async def read(self, file: BinaryIO) -> AsyncIterator[bytes]:
+        """Stream and close a file from get() without blocking the event loop."""
+        try:
+            while chunk := await asyncio.to_thread(file.read, CHUNK_SIZE):
+                yield chunk
+        finally:
+            await asyncio.to_thread(file.close)
+
+    @staticmethod
+    def _open_entry(path: Path) -> BinaryIO:
+        file = open(path, "rb")  # noqa: SIM115 - closed by read()
+        os.utime(file.fileno())
+        return file
+
+    def _add(self, key: str, size: int) -> list[Path]:
+        """Index a published entry, returning the files evicted to make room."""
+        self._forget(key)
+        self._entries[key] = size
+        self._total += size
+        return self._evict()
+
+    def _forget(self, key: str) -> None:
+        self._total -= self._entries.pop(key, 0)
+
+    def _evict(self) -> list[Path]:
+        """Drop least recently used entries from the index until under the limit.
+
+        Only the index is updated; the caller deletes the returned files, from
+        a worker thread when on the event loop.
+        """
+        evicted = []
+        while self._total > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._forget(key)
+            evicted.append(self.path_for(key))
+            logger.debug(f"Evicted TTS cache entry {key}")
+        return evicted
+
+    @staticmethod
+    def _unlink(paths: list[Path]) -> None:
+        for path in paths:
+            path.unlink(missing_ok=True)
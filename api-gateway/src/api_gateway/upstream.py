@@ -0,0 +1,77 @@
+"""Pooled upstream HTTP clients for proxied backend traffic."""
+
+import logging
+
+import httpx
+
+from .config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def _build_client(
+    settings: Settings,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """Build a long-lived client with the configured pool and keep-alive limits."""
+    limits = httpx.Limits(
+        max_connections=settings.upstream_max_connections,
+        max_keepalive_connections=settings.upstream_max_keepalive_connections,
+        keepalive_expiry=settings.upstream_keepalive_expiry,
+    )
+    timeout = httpx.Timeout(
+        settings.upstream_timeout, connect=settings.upstream_connect_timeout
+    )
+
+    try:
+        return httpx.AsyncClient(
+            limits=limits,
+            timeout=timeout,
+            http2=settings.upstream_http2,
+            transport=transport,
+        )
+    except ImportError:
+        # http2=True needs the optional 'h2' package (api-gateway[http2])
+        logger.warning("HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+        return httpx.AsyncClient(limits=limits, timeout=timeout, transport=transport)
+
+
+class UpstreamClients:
+    """One pooled httpx client per backend, created at startup.
+
+    Reusing the client keeps TCP connections to server-langgraph/server-openai
+    alive between proxied requests instead of reconnecting every call.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        backends: list[str],
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """Create a client for every configured backend name.
+
+        Args:
+            settings: Gateway settings with the upstream pool configuration
+            backends: Backend names to create clients for
+            transport: Optional transport override (e.g. ASGI stand-ins in tests)
+        """
+        self._clients: dict[str, httpx.AsyncClient] = {
+            name: _build_client(settings, transport) for name in backends
+        }
+        logger.info(
+            f"Upstream clients ready for {list(self._clients)} "
+            f"(max_connections={settings.upstream_max_connections}, "
+            f"http2={settings.upstream_http2})"
+        )
+
+    def get(self, backend: str) -> httpx.AsyncClient:
+        """Get the pooled client for a backend."""
+        return self._clients[backend]
+
+    async def aclose(self) -> None:
+        """Close all clients and their pooled connections."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        logger.info("Upstream clients closed")
@@ -0,0 +1 @@
+"""Tests for AGORA API Gateway."""
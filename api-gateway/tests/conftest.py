@@ -0,0 +1,102 @@
+"""Pytest configuration and fixtures for AGORA API Gateway tests."""
+
+import functools
+import threading
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from websockets.sync.server import serve
+
+from api_gateway import proxy
+from api_gateway.main import app
+from api_gateway.upstream import UpstreamClients
+
+
+@pytest.fixture
+def backend_app() -> FastAPI:
+    """Create a stand-in backend that echoes what the gateway forwarded."""
+    backend = FastAPI()
+    backend.state.requests = []
+
+    @backend.get("/health")
+    async def health():
+        return {"status": "healthy", "service": "stand-in"}
+
+    @backend.api_route("/echo/{path:path}", methods=["GET", "POST", "PUT"])
+    async def echo(request: Request, path: str):
+        body = await request.body()
+        backend.state.requests.append(request)
+        return {
+            "method": request.method,
+            "path": path,
+            "query": request.url.query,
+            "body": body.decode(),
+            "transfer_encoding": request.headers.get("transfer-encoding"),
+        }
+
+    backend.state.titles = {"s1": "Inspectie"}
+
+    @backend.get("/sessions")
+    async def list_sessions(request: Request):
+        backend.state.requests.append(request)
+        return {
+            "sessions": [
+                {"sessionId": sid, "title": title}
+                for sid, title in backend.state.titles.items()
+            ]
+        }
+
+    @backend.put("/sessions/{session_id}")
+    async def update_session(request: Request, session_id: str):
+        backend.state.requests.append(request)
+        backend.state.titles[session_id] = (await request.json())["title"]
+        return {"success": True}
+
+    @backend.post("/v1/text-to-speech/{voice_id}/stream")
+    async def tts(request: Request, voice_id: str):
+        # Stand-in for ElevenLabs: deterministic "audio" per voice and text
+        body = await request.json()
+        backend.state.requests.append(request)
+        audio = f"{voice_id}:{body['text']}".encode() * 1000
+        return Response(content=audio, media_type="audio/mpeg")
+
+    @backend.post("/v1/single-use-token/realtime_scribe")
+    async def stt_token(request: Request):
+        backend.state.requests.append(request)
+        return {"token": f"token-{len(backend.state.requests)}"}
+
+    return backend
+
+
+@pytest.fixture
+def gateway_client(backend_app: FastAPI, monkeypatch):
+    """Provide a gateway test client whose backends all route to the stand-in."""
+    monkeypatch.setattr(
+        "api_gateway.main.UpstreamClients",
+        functools.partial(
+            UpstreamClients, transport=httpx.ASGITransport(app=backend_app)
+        ),
+    )
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def echo_backend(monkeypatch):
+    """Run a real WebSocket backend that echoes text and binary frames."""
+
+    def handler(ws):
+        for message in ws:
+            ws.send(message)
+
+    server = serve(handler, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.socket.getsockname()[1]}"
+    monkeypatch.setattr(
+        proxy, "BACKENDS", {"openai": [url], "langgraph": [url], "mock": [url]}
+    )
+    yield url
+    server.shutdown()
@@ -0,0 +1,81 @@
+"""Tests for API key authentication."""
+
+import pytest
+
+from api_gateway import auth
+from api_gateway.auth import APIKeyIndex, reload_api_keys
+from api_gateway.config import Settings, get_settings
+
+
+@pytest.fixture
+def auth_env(monkeypatch, tmp_path):
+    """Require auth with one env key and one key from a keys file."""
+    keys_file = tmp_path / "keys.txt"
+    keys_file.write_text("file-key\n\n")
+    monkeypatch.setenv("GATEWAY_REQUIRE_AUTH", "true")
+    monkeypatch.setenv("GATEWAY_API_KEYS", "env-key-1, env-key-2,")
+    monkeypatch.setenv("GATEWAY_API_KEYS_FILE", str(keys_file))
+    reload_api_keys()
+    yield keys_file
+    monkeypatch.undo()
+    reload_api_keys()
+
+
+class TestAPIKeyIndex:
+    """Tests for the precomputed key index."""
+
+    def test_lookup_valid_and_invalid(self):
+        """Valid keys resolve to a stable key id, others to None."""
+        index = APIKeyIndex(["alpha", "beta"])
+
+        assert len(index) == 2
+        assert index.lookup("alpha") is not None
+        assert index.lookup("alpha") == index.lookup("alpha")
+        assert index.lookup("alpha") != index.lookup("beta")
+        assert index.lookup("alph") is None
+        assert index.lookup("") is None
+
+    def test_from_settings_merges_file(self, tmp_path):
+        """Keys from api_keys and api_keys_file are both accepted."""
+        keys_file = tmp_path / "keys.txt"
+        keys_file.write_text("from-file\n")
+        index = APIKeyIndex.from_settings(
+            Settings(api_keys="a,b", api_keys_file=str(keys_file))
+        )
+
+        assert len(index) == 3
+        assert index.lookup("from-file") is not None
+
+    def test_settings_are_cached(self):
+        """get_settings should not rebuild Settings on every call."""
+        assert get_settings() is get_settings()
+
+
+class TestKeyReload:
+    """Tests for reloading keys without a restart."""
+
+    def test_http_auth_uses_index(self, gateway_client, auth_env):
+        """Requests are accepted or rejected based on the key index."""
+        assert gateway_client.get("/gateway/elevenlabs/config").status_code == 401
+        resp = gateway_client.get(
+            "/gateway/elevenlabs/config", headers={"X-API-Key": "file-key"}
+        )
+        assert resp.status_code == 200
+        resp = gateway_client.get("/gateway/elevenlabs/config?token=env-key-2")
+        assert resp.status_code == 200
+
+    def test_admin_endpoint_reloads_keys(self, gateway_client, auth_env):
+        """Rotated keys take effect after POST /gateway/admin/reload-keys."""
+        auth_env.write_text("rotated-key\n")
+
+        resp = gateway_client.post(
+            "/gateway/admin/reload-keys", headers={"X-API-Key": "file-key"}
+        )
+        assert resp.status_code == 200
+        assert resp.json()["keyCount"] == 3
+
+        assert auth.get_key_index().lookup("file-key") is None
+        resp = gateway_client.get(
+            "/gateway/elevenlabs/config", headers={"X-API-Key": "rotated-key"}
+        )
+        assert resp.status_code == 200
@@ -0,0 +1,80 @@
+"""Tests for replica load balancing and health checking."""
+
+import httpx
+
+from api_gateway.balancer import BackendPool, LoadBalancer
+from api_gateway.config import Settings
+from api_gateway.upstream import UpstreamClients
+
+REPLICAS = ["http://replica-a:8000", "http://replica-b:8000"]
+
+
+class TestBackendPool:
+    """Tests for least-outstanding-requests selection and ejection."""
+
+    def test_picks_least_outstanding(self):
+        """New requests go to the replica with fewer in-flight requests."""
+        pool = BackendPool("langgraph", REPLICAS, Settings())
+
+        first = pool.acquire()
+        second = pool.acquire()
+        assert first is not second
+
+        pool.release(first)
+        assert pool.acquire() is first
+
+    def test_ejected_replica_is_skipped(self):
+        """Ejected replicas receive no traffic while others are available."""
+        pool = BackendPool("langgraph", REPLICAS, Settings())
+        pool.eject(pool.replicas[0])
+
+        for _ in range(5):
+            replica = pool.acquire()
+            assert replica.url == REPLICAS[1]
+
+    def test_fails_open_when_all_ejected(self):
+        """With every replica ejected, requests are still routed somewhere."""
+        pool = BackendPool("langgraph", REPLICAS, Settings())
+        for replica in pool.replicas:
+            pool.eject(replica)
+
+        assert pool.acquire().url in REPLICAS
+
+    def test_probe_failures_eject_after_threshold(self):
+        """Replicas are ejected after N failed probes and restored on success."""
+        pool = BackendPool(
+            "langgraph", REPLICAS, Settings(health_eject_after_failures=2)
+        )
+        replica = pool.replicas[0]
+
+        pool.record_probe(replica, healthy=False)
+        assert replica.available
+        pool.record_probe(replica, healthy=False)
+        assert not replica.available
+        pool.record_probe(replica, healthy=True)
+        assert replica.available
+
+
+class TestHealthProbes:
+    """Tests for active /health probing."""
+
+    async def test_probe_all_ejects_unhealthy_replica(self):
+        """A replica whose /health fails is taken out of rotation."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "replica-b":
+                return httpx.Response(503)
+            return httpx.Response(200, json={"status": "healthy"})
+
+        settings = Settings(health_eject_after_failures=1)
+        backends = {"langgraph": REPLICAS}
+        clients = UpstreamClients(
+            settings, list(backends), transport=httpx.MockTransport(handler)
+        )
+        balancer = LoadBalancer(backends, settings)
+
+        await balancer.probe_all(clients)
+        await clients.aclose()
+
+        status = {r["url"]: r["available"] for r in balancer.get("langgraph").status()}
+        assert status == {REPLICAS[0]: True, REPLICAS[1]: False}
@@ -0,0 +1,135 @@
+"""Tests for gateway response compression."""
+
+import gzip
+import json
+
+import brotli
+import pytest
+
+from api_gateway.compression import compress_stream, negotiate
+from api_gateway.config import Settings
+
+
+async def _chunks(parts: list[bytes]):
+    for part in parts:
+        yield part
+
+
+async def _collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+class TestNegotiate:
+    """Tests for Accept-Encoding negotiation."""
+
+    @pytest.mark.parametrize(
+        ("accept", "expected"),
+        [
+            ("gzip, deflate, br", "br"),
+            ("gzip", "gzip"),
+            ("br;q=0.5, gzip", "gzip"),
+            ("gzip;q=0, br;q=0", None),
+            ("identity", None),
+            ("*", "br"),
+            (None, None),
+        ],
+    )
+    def test_accept_encoding(self, accept, expected):
+        """The highest-weighted supported encoding wins, brotli on ties."""
+        assert negotiate(accept, "application/json") == expected
+
+    def test_incompressible_types_skipped(self):
+        """Audio, images and PDFs are never recompressed."""
+        assert negotiate("gzip", "audio/mpeg") is None
+        assert negotiate("gzip", "application/pdf") is None
+        assert negotiate("gzip", "text/html; charset=utf-8") == "gzip"
+
+
+class TestCompressStream:
+    """Tests for chunked compression with a size threshold."""
+
+    async def test_small_body_passes_through(self):
+        """A chunked body that ends below the threshold is left alone."""
+        settings = Settings(compression_min_size=1024)
+        stream, encoding = await compress_stream(
+            _chunks([b"a" * 100, b"b" * 100]), "gzip", settings
+        )
+
+        assert encoding is None
+        assert await _collect(stream) == b"a" * 100 + b"b" * 100
+
+    @pytest.mark.parametrize("encoding", ["gzip", "br"])
+    async def test_large_body_compressed(self, encoding):
+        """Bodies over the threshold are compressed across chunk boundaries."""
+        settings = Settings(compression_min_size=1024)
+        parts = [
+            json.dumps({"chunk": i, "text": "regelgeving " * 50}).encode()
+            for i in range(20)
+        ]
+        stream, applied = await compress_stream(_chunks(parts), encoding, settings)
+
+        compressed = await _collect(stream)
+        decompress = gzip.decompress if encoding == "gzip" else brotli.decompress
+        assert applied == encoding
+        assert decompress(compressed) == b"".join(parts)
+        assert len(compressed) < len(b"".join(parts)) / 5
+
+    async def test_size_hint_skips_read_ahead(self):
+        """A Content-Length below the threshold disables compression up front."""
+        settings = Settings(compression_min_size=1024)
+        _, encoding = await compress_stream(
+            _chunks([b"{}"]), "gzip", settings, size_hint=2
+        )
+        assert encoding is None
+
+
+class TestGatewayCompression:
+    """Tests for compression through the gateway."""
+
+    def test_large_proxied_response_compressed(self, gateway_client):
+        """A large JSON response is gzip-encoded when the client accepts it."""
+        payload = "x" * 20_000
+        resp = gateway_client.post(
+            "/api/mock/echo/big",
+            content=payload,
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert resp.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in resp.headers["vary"]
+        assert resp.json()["body"] == payload
+        assert resp.num_bytes_downloaded < 1000
+
+    def test_small_or_unaccepted_not_compressed(self, gateway_client):
+        """Small bodies and identity-only clients get plain responses."""
+        small = gateway_client.get(
+            "/api/mock/echo/x", headers={"Accept-Encoding": "gzip"}
+        )
+        plain = gateway_client.post(
+            "/api/mock/echo/big",
+            content="x" * 20_000,
+            headers={"Accept-Encoding": "identity"},
+        )
+
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in plain.headers
+        assert plain.json()["body"] == "x" * 20_000
+
+    def test_cached_response_compressed_with_weak_etag(
+        self, backend_app, gateway_client
+    ):
+        """Cached entries are served compressed and revalidate by weak ETag."""
+        backend_app.state.titles = {f"s{i}": f"Inspectie {i}" for i in range(200)}
+
+        first = gateway_client.get(
+            "/api/mock/sessions", headers={"Accept-Encoding": "br"}
+        )
+        second = gateway_client.get(
+            "/api/mock/sessions",
+            headers={"Accept-Encoding": "br", "If-None-Match": first.headers["etag"]},
+        )
+
+        assert first.headers["content-encoding"] == "br"
+        assert first.headers["etag"].startswith("W/")
+        assert len(first.json()["sessions"]) == 200
+        assert second.status_code == 304
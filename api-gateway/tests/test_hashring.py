@@ -0,0 +1,86 @@
+"""Tests for the consistent-hash ring and thread-affinity routing."""
+
+from api_gateway.balancer import BackendPool
+from api_gateway.config import Settings
+from api_gateway.hashring import HashRing
+from api_gateway.proxy import thread_id_from_frame, thread_id_from_path
+
+NODES = ["http://lg-1:8000", "http://lg-2:8000", "http://lg-3:8000"]
+KEYS = [f"thread-{i}" for i in range(2000)]
+
+
+class TestHashRing:
+    """Tests for HashRing."""
+
+    def test_same_key_same_node(self):
+        """A key always maps to the same node."""
+        ring = HashRing(NODES)
+        assert all(ring.get(k) == ring.get(k) for k in KEYS[:50])
+
+    def test_keys_spread_over_nodes(self):
+        """Virtual nodes spread keys roughly evenly."""
+        ring = HashRing(NODES)
+        counts = {n: 0 for n in NODES}
+        for key in KEYS:
+            counts[ring.get(key)] += 1
+        assert min(counts.values()) > len(KEYS) / len(NODES) * 0.7
+
+    def test_adding_node_remaps_minimal_keys(self):
+        """Only keys taken over by the new node change owner."""
+        ring = HashRing(NODES)
+        before = {k: ring.get(k) for k in KEYS}
+
+        ring.add("http://lg-4:8000")
+        moved = [k for k in KEYS if ring.get(k) != before[k]]
+
+        assert all(ring.get(k) == "http://lg-4:8000" for k in moved)
+        assert len(moved) < len(KEYS) * 0.35
+
+    def test_removing_node_only_remaps_its_keys(self):
+        """Keys owned by surviving nodes keep their owner."""
+        ring = HashRing(NODES)
+        before = {k: ring.get(k) for k in KEYS}
+
+        ring.remove(NODES[0])
+
+        for key in KEYS:
+            if before[key] != NODES[0]:
+                assert ring.get(key) == before[key]
+
+    def test_iter_nodes_yields_each_node_once(self):
+        """Fallback order covers every node exactly once."""
+        ring = HashRing(NODES)
+        assert sorted(ring.iter_nodes("thread-1")) == sorted(NODES)
+        assert HashRing().get("thread-1") is None
+
+
+class TestThreadAffinity:
+    """Tests for sticky replica selection."""
+
+    def test_thread_pinned_to_owner(self):
+        """Every request for a thread lands on the same replica."""
+        pool = BackendPool("langgraph", NODES, Settings())
+        first = pool.acquire(affinity_key="thread-42")
+        for _ in range(10):
+            assert pool.acquire(affinity_key="thread-42") is first
+
+    def test_ejected_owner_falls_back_then_returns(self):
+        """Threads move off an ejected replica and back once it recovers."""
+        pool = BackendPool("langgraph", NODES, Settings())
+        owner = pool.owner("thread-42")
+
+        pool.eject(owner)
+        fallback = pool.owner("thread-42")
+        assert fallback is not owner
+
+        pool.record_probe(owner, healthy=True)
+        assert pool.owner("thread-42") is owner
+
+    def test_extracts_thread_ids(self):
+        """threadId is read from session paths and AG-UI frames."""
+        assert thread_id_from_path("/sessions/abc-123/history") == "abc-123"
+        assert thread_id_from_path("/sessions/abc-123") == "abc-123"
+        assert thread_id_from_path("/sessions") is None
+        assert thread_id_from_frame('{"threadId": "t-1", "runId": "r"}') == "t-1"
+        assert thread_id_from_frame('{"type": "CUSTOM"}') is None
+        assert thread_id_from_frame("not json") is None
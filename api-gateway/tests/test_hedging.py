@@ -0,0 +1,117 @@
+"""Tests for hedged GETs across backend replicas."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from api_gateway.balancer import BackendPool, Replica
+from api_gateway.config import Settings
+from api_gateway.hedging import HedgeBudget, Hedger, LatencyTracker
+
+REPLICAS = ["http://replica-a:8000", "http://replica-b:8000"]
+
+
+def _settings(**overrides) -> Settings:
+    defaults = {
+        "hedge_enabled": True,
+        "hedge_max_delay": 0.05,
+        "hedge_max_ratio": 1.0,
+    }
+    return Settings(**(defaults | overrides))
+
+
+def _client(slow_host: str | None = None, down_host: str | None = None):
+    """Client whose slow replica stalls and whose down replica refuses."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == down_host:
+            raise httpx.ConnectError("refused", request=request)
+        if request.url.host == slow_host:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json={"replica": request.url.host})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _builder(client: httpx.AsyncClient):
+    def build(replica: Replica) -> httpx.Request:
+        return client.build_request("GET", f"{replica.url}/agents")
+
+    return build
+
+
+class TestHedger:
+    """Tests for hedging slow replicas and failing over refused ones."""
+
+    async def test_slow_replica_is_hedged(self):
+        """A GET stalled on one replica is answered by the other."""
+        pool = BackendPool("langgraph", REPLICAS, Settings())
+        pool.replicas[1].outstanding = 1  # make replica-a the primary
+        async with _client(slow_host="replica-a") as client:
+            replica, resp = await Hedger(_settings()).send(
+                pool, client, _builder(client)
+            )
+            await resp.aread()
+            await resp.aclose()
+            pool.release(replica)
+
+        await asyncio.sleep(0)  # let the loser be discarded
+        assert resp.json() == {"replica": "replica-b"}
+        assert [r.outstanding for r in pool.replicas] == [0, 1]
+
+    async def test_budget_caps_hedges(self):
+        """Without budget the request waits for the slow replica."""
+        pool = BackendPool("langgraph", REPLICAS, Settings())
+        pool.replicas[1].outstanding = 1
+        hedger = Hedger(_settings(hedge_max_ratio=0.1))
+        async with _client(slow_host="replica-a") as client:
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(hedger.send(pool, client, _builder(client)), 0.2)
+
+        await asyncio.sleep(0)
+        assert [r.outstanding for r in pool.replicas] == [0, 1]
+
+    async def test_refused_replica_fails_over(self):
+        """A refused connection is retried on another replica immediately."""
+        pool = BackendPool("langgraph", REPLICAS, Settings())
+        pool.replicas[1].outstanding = 1
+        hedger = Hedger(_settings(hedge_max_ratio=0.0, hedge_max_delay=5.0))
+        async with _client(down_host="replica-a") as client:
+            replica, resp = await asyncio.wait_for(
+                hedger.send(pool, client, _builder(client)), 1.0
+            )
+            await resp.aread()
+            await resp.aclose()
+
+        assert replica.url == REPLICAS[1]
+        assert not pool.replicas[0].available
+
+    def test_sticky_requests_stay_on_owner(self):
+        """Thread-pinned GETs are never hedged to a replica without its state."""
+        pool = BackendPool("langgraph", REPLICAS, Settings())
+        owner = pool.acquire(affinity_key="thread-1")
+
+        assert pool.acquire_hedge(owner, "thread-1") is None
+        pool.eject(owner)
+        assert pool.acquire_hedge(owner, "thread-1") not in (None, owner)
+
+
+class TestHedgeState:
+    """Tests for the latency percentile and hedge budget."""
+
+    def test_percentile(self):
+        """The tracker reports the configured percentile of recent samples."""
+        tracker = LatencyTracker(window=100, percentile=95)
+        for ms in range(100):
+            tracker.record(ms / 1000)
+        assert tracker.value() == pytest.approx(0.095)
+
+    def test_budget_ratio(self):
+        """A 25% budget allows one hedge per four requests."""
+        budget = HedgeBudget(ratio=0.25)
+        allowed = 0
+        for _ in range(100):
+            budget.earn()
+            allowed += budget.spend()
+        assert allowed == 25
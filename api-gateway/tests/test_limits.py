@@ -0,0 +1,121 @@
+"""Tests for per-key and per-backend admission control."""
+
+import asyncio
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from api_gateway.config import Settings, get_settings
+from api_gateway.limits import WS_CLOSE_TOO_MANY, InMemoryLimiter, TokenBucket
+
+
+@pytest.fixture
+def strict_limits(monkeypatch):
+    """Allow a burst of two requests and one WebSocket per key."""
+    monkeypatch.setenv("GATEWAY_RATE_LIMIT_PER_KEY", "0.5")
+    monkeypatch.setenv("GATEWAY_RATE_LIMIT_PER_KEY_BURST", "2")
+    monkeypatch.setenv("GATEWAY_MAX_WEBSOCKETS_PER_KEY", "1")
+    get_settings.cache_clear()
+    yield
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+class TestTokenBucket:
+    """Tests for the token bucket."""
+
+    def test_burst_then_wait(self):
+        """A full bucket allows `burst` requests, then reports the wait."""
+        bucket = TokenBucket(rate=2.0, burst=3)
+        for _ in range(3):
+            assert bucket.wait_time() == 0.0
+            bucket.take()
+
+        assert bucket.wait_time() == pytest.approx(0.5, abs=0.01)
+
+
+class TestInMemoryLimiter:
+    """Tests for the in-process limiter."""
+
+    async def test_per_key_limits_off_by_default(self):
+        """Anonymous clients behind one proxy share a key, so nothing is limited."""
+        limiter = InMemoryLimiter(Settings())
+
+        for _ in range(100):
+            assert await limiter.hit("anonymous:10.0.0.2", "langgraph") == 0.0
+        for _ in range(20):
+            assert await limiter.open_websocket("anonymous:10.0.0.2", "langgraph")
+
+    async def test_keys_are_limited_independently(self):
+        """One key exhausting its bucket does not affect another key."""
+        limiter = InMemoryLimiter(
+            Settings(rate_limit_per_key=1.0, rate_limit_per_key_burst=1)
+        )
+
+        assert await limiter.hit("greedy", "langgraph") == 0.0
+        assert await limiter.hit("greedy", "langgraph") > 0
+        assert await limiter.hit("polite", "langgraph") == 0.0
+
+    async def test_backend_limit_spans_keys(self):
+        """The per-backend bucket is shared by all keys."""
+        limiter = InMemoryLimiter(
+            Settings(
+                rate_limit_per_key=0,
+                rate_limit_per_backend=1.0,
+                rate_limit_per_backend_burst=2,
+            )
+        )
+
+        assert await limiter.hit("a", "openai") == 0.0
+        assert await limiter.hit("b", "openai") == 0.0
+        assert await limiter.hit("c", "openai") > 0
+        assert await limiter.hit("c", "langgraph") == 0.0
+
+    async def test_rejected_request_is_not_charged(self):
+        """A request refused by the backend bucket leaves the key bucket intact."""
+        limiter = InMemoryLimiter(
+            Settings(
+                rate_limit_per_key=1.0,
+                rate_limit_per_key_burst=1,
+                rate_limit_per_backend=1.0,
+                rate_limit_per_backend_burst=1,
+            )
+        )
+        assert await limiter.hit("a", "openai") == 0.0
+
+        assert await limiter.hit("b", "openai") > 0
+        assert await limiter.hit("b", "langgraph") == 0.0
+
+    async def test_websocket_slots(self):
+        """Sessions beyond the per-key limit are refused until one closes."""
+        limiter = InMemoryLimiter(Settings(max_websockets_per_key=2))
+
+        assert await limiter.open_websocket("a", "langgraph")
+        assert await limiter.open_websocket("a", "openai")
+        assert not await limiter.open_websocket("a", "langgraph")
+        assert await limiter.open_websocket("b", "langgraph")
+
+        await limiter.close_websocket("a", "openai")
+        assert await limiter.open_websocket("a", "langgraph")
+
+
+class TestGatewayAdmission:
+    """Tests for 429 and close-code rejections through the gateway."""
+
+    def test_http_429_with_retry_after(self, strict_limits, gateway_client):
+        """Requests past the burst get 429 and a Retry-After header."""
+        responses = [gateway_client.get("/api/mock/echo/x") for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert int(responses[-1].headers["retry-after"]) >= 1
+
+    def test_websocket_rejected_over_session_limit(self, strict_limits, gateway_client):
+        """A second concurrent session for the same key is closed with 4029."""
+        limiter = gateway_client.app.state.limiter
+        asyncio.run(limiter.open_websocket("anonymous:testclient", "mock"))
+
+        with gateway_client.websocket_connect("/api/mock/ws") as ws:
+            with pytest.raises(WebSocketDisconnect) as exc:
+                ws.receive_text()
+
+        assert exc.value.code == WS_CLOSE_TOO_MANY
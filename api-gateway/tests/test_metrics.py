@@ -0,0 +1,114 @@
+"""Tests for the Prometheus metrics surface."""
+
+import pytest
+from prometheus_client import REGISTRY
+
+from api_gateway.config import get_settings
+from api_gateway.metrics import route_label
+
+
+@pytest.fixture
+def unlimited(monkeypatch):
+    """Disable rate limiting so synthetic load is not throttled."""
+    monkeypatch.setenv("GATEWAY_RATE_LIMIT_PER_KEY", "0")
+    get_settings.cache_clear()
+    yield
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestRouteLabel:
+    """Tests for route template labels."""
+
+    @pytest.mark.parametrize(
+        ("path", "label"),
+        [
+            ("/sessions", "/sessions"),
+            ("/sessions/abc-123/history", "/sessions/{id}/history"),
+            ("/users/me/preferences", "/users/me/preferences"),
+            ("/users/42", "/users/{id}"),
+            ("/agents", "/agents"),
+            ("/", "/"),
+            ("/wp-admin/login.php", "other"),
+        ],
+    )
+    def test_ids_collapsed(self, path: str, label: str):
+        """Identifiers are replaced and unknown paths share one label."""
+        assert route_label(path) == label
+
+
+class TestMetrics:
+    """Counters under synthetic load."""
+
+    def test_http_counters(self, unlimited, gateway_client):
+        """Every proxied request is counted and timed once."""
+        labels = {"route": "/sessions/{id}/history", "backend": "mock"}
+        before_count = _sample(
+            "gateway_http_requests_total", method="GET", status="404", **labels
+        )
+        before_hist = _sample("gateway_http_request_duration_seconds_count", **labels)
+
+        for i in range(50):
+            resp = gateway_client.get(f"/api/mock/sessions/s{i}/history")
+            assert resp.status_code == 404
+
+        assert (
+            _sample("gateway_http_requests_total", method="GET", status="404", **labels)
+            == before_count + 50
+        )
+        assert (
+            _sample("gateway_http_request_duration_seconds_count", **labels)
+            == before_hist + 50
+        )
+
+    def test_websocket_counters(self, unlimited, echo_backend, gateway_client):
+        """Relayed frames and bytes are counted per direction."""
+        frames = {
+            d: _sample("gateway_websocket_frames_total", backend="mock", direction=d)
+            for d in ("to_backend", "to_client")
+        }
+        sent = _sample(
+            "gateway_websocket_bytes_total", backend="mock", direction="to_backend"
+        )
+
+        with gateway_client.websocket_connect("/api/mock/ws") as ws:
+            for i in range(20):
+                ws.send_text(f"frame-{i:02d}")
+                assert ws.receive_text() == f"frame-{i:02d}"
+            ws.send_bytes(b"\x00" * 100)
+            assert ws.receive_bytes() == b"\x00" * 100
+            assert _sample("gateway_websocket_connections_active", backend="mock") >= 1
+
+        assert (
+            _sample(
+                "gateway_websocket_frames_total", backend="mock", direction="to_backend"
+            )
+            == frames["to_backend"] + 21
+        )
+        assert (
+            _sample(
+                "gateway_websocket_frames_total", backend="mock", direction="to_client"
+            )
+            == frames["to_client"] + 21
+        )
+        assert (
+            _sample(
+                "gateway_websocket_bytes_total", backend="mock", direction="to_backend"
+            )
+            == sent + 20 * 8 + 100
+        )
+
+    def test_metrics_endpoint(self, gateway_client):
+        """/metrics serves the Prometheus text format."""
+        gateway_client.get("/api/mock/echo/x")
+
+        resp = gateway_client.get("/metrics")
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        assert "gateway_http_requests_total" in resp.text
+        assert "gateway_websocket_connections_active" in resp.text
@@ -0,0 +1,99 @@
+"""Tests for multiplexed backend WebSocket connections."""
+
+import threading
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+from websockets.sync.server import serve
+
+from api_gateway import proxy
+from api_gateway.config import get_settings
+from api_gateway.mux import CLOSE, DATA, OPEN, decode, encode
+
+
+@pytest.fixture
+def mux_backend(monkeypatch):
+    """Run a /ws/mux backend that echoes every stream's frames.
+
+    A "bye" frame makes it end that stream, so sessions finish from the
+    backend side.
+    """
+    connections = []
+
+    def handler(ws):
+        connections.append(ws.request.path)
+        for message in ws:
+            stream_id, op, payload = decode(message)
+            if payload == "bye":
+                ws.send(encode(stream_id, CLOSE))
+            elif op == DATA:
+                ws.send(encode(stream_id, DATA, payload))
+
+    server = serve(handler, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.socket.getsockname()[1]}"
+    monkeypatch.setattr(proxy, "BACKENDS", {"openai": [url], "mock": [url]})
+    monkeypatch.setenv("GATEWAY_WS_MULTIPLEX_BACKENDS", "mock")
+    monkeypatch.setenv("GATEWAY_WS_MUX_CONNECTIONS", "1")
+    get_settings.cache_clear()
+    yield connections
+    server.shutdown()
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+class TestFraming:
+    """Tests for the stream header encoding."""
+
+    @pytest.mark.parametrize("payload", ['{"type": "RUN_STARTED"}\n', b"\x00\n\xff"])
+    def test_round_trip(self, payload):
+        """Text and binary payloads keep their type and content."""
+        assert decode(encode(7, DATA, payload)) == (7, DATA, payload)
+
+    def test_control_frames(self):
+        """Open and close frames carry no payload."""
+        assert encode(3, OPEN) == "3 open\n"
+        assert decode("3 close\n") == (3, CLOSE, "")
+
+    def test_malformed_header(self):
+        """Frames without a stream header are rejected."""
+        with pytest.raises(ValueError):
+            decode('{"type": "RUN_STARTED"}')
+
+
+class TestGatewayMultiplexing:
+    """Tests for client sessions sharing one backend connection."""
+
+    def test_sessions_share_one_connection(self, mux_backend, gateway_client):
+        """Two clients are relayed over a single /ws/mux connection."""
+        with (
+            gateway_client.websocket_connect("/api/mock/ws") as first,
+            gateway_client.websocket_connect("/api/mock/ws") as second,
+        ):
+            first.send_text('{"threadId": "a"}')
+            second.send_text('{"threadId": "b"}')
+            second.send_bytes(b"\x00\x01")
+
+            assert first.receive_text() == '{"threadId": "a"}'
+            assert second.receive_text() == '{"threadId": "b"}'
+            assert second.receive_bytes() == b"\x00\x01"
+
+            first.send_text("bye")
+            with pytest.raises(WebSocketDisconnect):
+                first.receive_text()
+            second.send_text('{"threadId": "b"}')
+            assert second.receive_text() == '{"threadId": "b"}'
+            second.send_text("bye")
+            with pytest.raises(WebSocketDisconnect):
+                second.receive_text()
+
+        assert mux_backend == ["/ws/mux"]
+
+    def test_other_backends_connect_directly(self, mux_backend, gateway_client):
+        """Backends not listed for multiplexing keep one socket per client."""
+        with gateway_client.websocket_connect("/api/openai/ws") as ws:
+            ws.send_text("1 data\nraw")
+            assert ws.receive_text() == "1 data\nraw"
+
+        assert mux_backend == ["/ws"]
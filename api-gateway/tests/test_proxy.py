@@ -0,0 +1,36 @@
+"""Tests for the HTTP proxy."""
+
+
+class TestProxyHttp:
+    """Tests for proxy_http with pooled upstream clients."""
+
+    def test_get_is_forwarded_without_body(self, gateway_client):
+        """Bodiless GETs should not be sent upstream as chunked requests."""
+        resp = gateway_client.get("/api/mock/echo/sessions?user_id=koen")
+
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["method"] == "GET"
+        assert data["path"] == "sessions"
+        assert data["query"] == "user_id=koen"
+        assert data["body"] == ""
+        assert data["transfer_encoding"] is None
+
+    def test_post_body_is_streamed_upstream(self, gateway_client):
+        """Request bodies should arrive intact at the backend."""
+        payload = '{"title": "' + "x" * 100_000 + '"}'
+        resp = gateway_client.post(
+            "/api/langgraph/echo/sessions",
+            content=payload,
+            headers={"content-type": "application/json"},
+        )
+
+        assert resp.status_code == 200
+        assert resp.json()["body"] == payload
+
+    def test_default_backend_used_without_prefix(self, gateway_client):
+        """Paths without /api/{backend} prefix go to the default backend."""
+        resp = gateway_client.get("/echo/agents")
+
+        assert resp.status_code == 200
+        assert resp.json()["path"] == "agents"
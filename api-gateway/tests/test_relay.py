@@ -0,0 +1,92 @@
+"""Tests for the WebSocket relay."""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketState
+
+from api_gateway.main import app
+from api_gateway.relay import RelayStats, relay
+
+
+class SlowClient:
+    """Client WebSocket stand-in whose sends block until released."""
+
+    def __init__(self):
+        self.client_state = WebSocketState.CONNECTED
+        self.released = asyncio.Event()
+        self.sent: list[str] = []
+
+    async def receive(self):
+        await asyncio.Event().wait()
+
+    async def send_text(self, data: str) -> None:
+        await self.released.wait()
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.client_state = WebSocketState.DISCONNECTED
+
+
+class ChattyBackend:
+    """Backend stand-in that streams many token frames as fast as it is read."""
+
+    def __init__(self, frames: int):
+        self.frames = frames
+        self.pulled = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        if self.pulled >= self.frames:
+            raise StopAsyncIteration
+        self.pulled += 1
+        return f'{{"type": "TEXT_MESSAGE_CONTENT", "delta": "t{self.pulled}"}}'
+
+    async def send(self, frame) -> None:
+        pass
+
+
+class TestRelay:
+    """Tests for bounded buffering and frame pass-through."""
+
+    async def test_slow_client_applies_backpressure(self):
+        """A stalled client stops the gateway reading from the backend."""
+        client = SlowClient()
+        backend = ChattyBackend(frames=1000)
+        stats = RelayStats()
+
+        task = asyncio.create_task(
+            relay(client, backend, stats, lambda f: False, 8, send_timeout=30)
+        )
+        await asyncio.sleep(0.05)
+
+        # Queue (8) + one frame in the client send + one waiting on put
+        assert backend.pulled <= 10
+        assert stats.peak_buffered == 8
+
+        client.released.set()
+        await asyncio.wait_for(task, timeout=5)
+        assert len(client.sent) == 1000
+        assert stats.frames_to_client == 1000
+
+    async def test_stalled_client_is_disconnected(self):
+        """A client that accepts nothing within send_timeout is closed."""
+        client = SlowClient()
+
+        await asyncio.wait_for(
+            relay(client, ChattyBackend(10), RelayStats(), lambda f: False, 4, 0.05),
+            timeout=5,
+        )
+
+        assert client.client_state == WebSocketState.DISCONNECTED
+
+    def test_text_and_binary_frames_pass_through(self, echo_backend):
+        """Both frame types reach the backend and come back unchanged."""
+        with TestClient(app) as client:
+            with client.websocket_connect("/api/mock/ws") as ws:
+                ws.send_text('{"threadId": "t-1", "messages": []}')
+                assert ws.receive_text() == '{"threadId": "t-1", "messages": []}'
+                ws.send_bytes(b"\x00\x01audio")
+                assert ws.receive_bytes() == b"\x00\x01audio"
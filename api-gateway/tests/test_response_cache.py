@@ -0,0 +1,162 @@
+"""Tests for the polled-GET response cache."""
+
+import asyncio
+
+import pytest
+
+from api_gateway.config import Settings, get_settings
+from api_gateway.response_cache import CachedResponse, ResponseCache
+
+
+@pytest.fixture
+def long_ttl(monkeypatch):
+    """Keep cached responses long enough that expiry never races the test."""
+    monkeypatch.setenv("GATEWAY_RESPONSE_CACHE_TTL", "60")
+    get_settings.cache_clear()
+    yield
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+def _response(body: bytes = b"{}", status_code: int = 200) -> CachedResponse:
+    return CachedResponse.build(status_code, {"content-type": "application/json"}, body)
+
+
+class TestResponseCache:
+    """Tests for singleflight, TTL and invalidation."""
+
+    async def test_concurrent_misses_share_one_load(self):
+        """Identical in-flight GETs are coalesced into one upstream call."""
+        cache = ResponseCache(Settings())
+        loads = 0
+
+        async def load():
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0.05)
+            return _response()
+
+        key = cache.key("langgraph", "/sessions", "user_id=koen")
+        results = await asyncio.gather(
+            *(cache.get_or_load("langgraph", key, load) for _ in range(10))
+        )
+
+        assert loads == 1
+        assert sorted(r for _, r in results) == ["coalesced"] * 9 + ["miss"]
+        assert (await cache.get_or_load("langgraph", key, load))[1] == "hit"
+
+    async def test_errors_are_not_cached(self):
+        """A failed load reaches every waiter and the next call retries."""
+        cache = ResponseCache(Settings())
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("backend down")
+
+        key = cache.key("langgraph", "/agents", "")
+        results = await asyncio.gather(
+            cache.get_or_load("langgraph", key, fail),
+            cache.get_or_load("langgraph", key, fail),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        async def ok():
+            return _response()
+
+        assert (await cache.get_or_load("langgraph", key, ok))[1] == "miss"
+
+    async def test_invalidation_discards_inflight_load(self):
+        """A load that started before a mutation is not stored."""
+        cache = ResponseCache(Settings())
+        started = asyncio.Event()
+
+        async def slow_load():
+            started.set()
+            await asyncio.sleep(0.05)
+            return _response(b"stale")
+
+        key = cache.key("langgraph", "/sessions", "")
+        pending = asyncio.create_task(cache.get_or_load("langgraph", key, slow_load))
+        await started.wait()
+        cache.invalidate("langgraph")
+        await pending
+
+        async def fresh_load():
+            return _response(b"fresh")
+
+        entry, result = await cache.get_or_load("langgraph", key, fresh_load)
+        assert (entry.body, result) == (b"fresh", "miss")
+
+    def test_etag_matching(self):
+        """If-None-Match matches the ETag, including weak and listed forms."""
+        entry = _response(b'{"sessions": []}')
+
+        assert entry.matches(entry.etag)
+        assert entry.matches(f'"other", W/{entry.etag}')
+        assert entry.matches("*")
+        assert not entry.matches('"other"')
+        assert not entry.matches(None)
+
+
+class TestGatewayCaching:
+    """Tests for cached GETs through the gateway."""
+
+    def test_poll_served_from_cache(self, long_ttl, backend_app, gateway_client):
+        """Repeated polls hit the backend once."""
+        responses = [
+            gateway_client.get("/api/mock/sessions?user_id=koen") for _ in range(5)
+        ]
+
+        assert [r.headers["x-gateway-cache"] for r in responses] == [
+            "miss",
+            "hit",
+            "hit",
+            "hit",
+            "hit",
+        ]
+        assert len(backend_app.state.requests) == 1
+        assert responses[0].json() == responses[-1].json()
+
+    def test_if_none_match_returns_304(self, long_ttl, gateway_client):
+        """A client revalidating with the current ETag gets an empty 304."""
+        first = gateway_client.get("/api/mock/sessions")
+        etag = first.headers["etag"]
+
+        second = gateway_client.get(
+            "/api/mock/sessions", headers={"If-None-Match": etag}
+        )
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    def test_put_invalidates(self, long_ttl, backend_app, gateway_client):
+        """Renaming a session is visible on the next poll."""
+        before = gateway_client.get("/api/mock/sessions").json()
+
+        gateway_client.put("/api/mock/sessions/s1", json={"title": "Hernoemd"})
+        after = gateway_client.get("/api/mock/sessions")
+
+        assert before["sessions"][0]["title"] == "Inspectie"
+        assert after.headers["x-gateway-cache"] == "miss"
+        assert after.json()["sessions"][0]["title"] == "Hernoemd"
+
+    def test_other_routes_not_cached(self, long_ttl, backend_app, gateway_client):
+        """GETs outside the polled routes always reach the backend."""
+        for _ in range(3):
+            resp = gateway_client.get("/api/mock/echo/x")
+            assert "x-gateway-cache" not in resp.headers
+
+        assert len(backend_app.state.requests) == 3
+
+    def test_run_finished_invalidates(self, long_ttl, echo_backend, gateway_client):
+        """RUN_FINISHED relayed to the client drops cached session lists."""
+        gateway_client.get("/api/mock/sessions")
+
+        with gateway_client.websocket_connect("/api/mock/ws") as ws:
+            ws.send_text('{"type": "RUN_FINISHED", "threadId": "s1"}')
+            ws.receive_text()
+
+        resp = gateway_client.get("/api/mock/sessions")
+        assert resp.headers["x-gateway-cache"] == "miss"
@@ -0,0 +1,127 @@
+"""Tests for the prefetched ElevenLabs STT token pool."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+
+from api_gateway.config import Settings, get_settings
+from api_gateway.stt_tokens import STTTokenPool, TokenMintError
+
+
+@pytest.fixture
+async def elevenlabs_client(backend_app: FastAPI):
+    """Client whose requests go to the stand-in token endpoint."""
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=backend_app)
+    ) as client:
+        yield client
+
+
+def _settings(**overrides) -> Settings:
+    return Settings(
+        elevenlabs_api_key="test-key",
+        elevenlabs_base_url="http://elevenlabs",
+        **overrides,
+    )
+
+
+async def _wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+def _pool_tokens_served() -> float:
+    return (
+        REGISTRY.get_sample_value("gateway_stt_tokens_total", {"source": "pool"})
+        or 0.0
+    )
+
+
+class TestSTTTokenPool:
+    """Tests for prefetching, expiry and fallback."""
+
+    async def test_prefetches_and_refills(self, elevenlabs_client, backend_app):
+        """The pool fills up front and tops itself up after a token is taken."""
+        pool = STTTokenPool(elevenlabs_client, _settings(elevenlabs_token_pool_size=2))
+        await pool.start()
+        try:
+            await _wait_for(lambda: len(pool) == 2)
+            minted = len(backend_app.state.requests)
+
+            first = pool.take()
+            second = pool.take()
+            assert first != second
+            # Taking from a full pool needed no upstream call
+            assert len(backend_app.state.requests) == minted
+
+            await _wait_for(lambda: len(pool) == 2)
+            assert len(backend_app.state.requests) == minted + 2
+        finally:
+            await pool.aclose()
+
+    async def test_expired_tokens_not_handed_out(self, elevenlabs_client):
+        """Tokens older than the max age are dropped instead of returned."""
+        pool = STTTokenPool(
+            elevenlabs_client,
+            _settings(elevenlabs_token_pool_size=1, elevenlabs_token_max_age=0.05),
+        )
+        pool._tokens.append(({"token": "stale"}, time.monotonic() - 1))
+
+        assert pool.take() is None
+        fresh = await pool.get()
+        assert fresh["token"] != "stale"
+
+    async def test_falls_back_to_sync_mint(self, elevenlabs_client, backend_app):
+        """With prefetching disabled, get() still mints a token on demand."""
+        pool = STTTokenPool(elevenlabs_client, _settings(elevenlabs_token_pool_size=0))
+        await pool.start()
+
+        token = await pool.get()
+
+        assert token["token"].startswith("token-")
+        assert len(backend_app.state.requests) == 1
+
+    async def test_mint_failure_raises(self):
+        """A rejected mint surfaces as TokenMintError."""
+        transport = httpx.MockTransport(lambda _: httpx.Response(401, text="nope"))
+        async with httpx.AsyncClient(transport=transport) as client:
+            pool = STTTokenPool(client, _settings())
+            with pytest.raises(TokenMintError):
+                await pool.get()
+
+
+class TestTokenEndpoint:
+    """Tests for /gateway/elevenlabs/token."""
+
+    @pytest.fixture
+    def stt_env(self, monkeypatch):
+        """Enable ElevenLabs with a pool of two tokens before the app starts."""
+        monkeypatch.setenv("GATEWAY_ELEVENLABS_API_KEY", "test-key")
+        monkeypatch.setenv("GATEWAY_ELEVENLABS_BASE_URL", "http://elevenlabs")
+        monkeypatch.setenv("GATEWAY_ELEVENLABS_TOKEN_POOL_SIZE", "2")
+        get_settings.cache_clear()
+        yield
+        monkeypatch.undo()
+        get_settings.cache_clear()
+
+    def test_serves_pooled_token(self, stt_env, backend_app, gateway_client):
+        """The endpoint hands out a prefetched token without minting one."""
+        pool = gateway_client.app.state.stt_tokens
+        deadline = time.monotonic() + 2
+        while len(pool) < 2:
+            assert time.monotonic() < deadline, "pool not filled in time"
+            time.sleep(0.01)
+        served_from_pool = _pool_tokens_served()
+
+        resp = gateway_client.post("/gateway/elevenlabs/token")
+
+        assert resp.status_code == 200
+        # The oldest prefetched token, not one minted for this request
+        assert resp.json()["token"] == "token-1"
+        assert _pool_tokens_served() == served_from_pool + 1
@@ -0,0 +1,150 @@
+"""Tests for the disk-backed TTS audio cache."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from api_gateway.config import get_settings
+from api_gateway.tts_cache import TTSCache
+
+
+@pytest.fixture
+def tts_env(monkeypatch, tmp_path):
+    """Enable ElevenLabs against the stand-in, caching under tmp_path."""
+    cache_dir = tmp_path / "tts"
+    monkeypatch.setenv("GATEWAY_ELEVENLABS_API_KEY", "test-key")
+    monkeypatch.setenv("GATEWAY_ELEVENLABS_BASE_URL", "http://elevenlabs")
+    monkeypatch.setenv("GATEWAY_TTS_CACHE_DIR", str(cache_dir))
+    monkeypatch.setenv("GATEWAY_ELEVENLABS_TOKEN_POOL_SIZE", "0")
+    get_settings.cache_clear()
+    yield cache_dir
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+async def put(cache: TTSCache, key: str, audio: bytes) -> None:
+    writer = await cache.open_writer(key)
+    await writer.write(audio)
+    await writer.commit()
+
+
+async def cached(cache: TTSCache, key: str) -> bytes | None:
+    file = await cache.get(key)
+    if file is None:
+        return None
+    return b"".join([chunk async for chunk in cache.read(file)])
+
+
+class TestTTSCache:
+    """Tests for cache keys, writes and LRU eviction."""
+
+    def test_key_covers_voice_text_and_settings(self):
+        """Any change to voice, text or voice settings is a different entry."""
+        body = {"text": "Hallo", "voice_settings": {"stability": 0.5}}
+        key = TTSCache.key("voice-a", body)
+
+        assert key == TTSCache.key("voice-a", dict(reversed(body.items())))
+        assert key != TTSCache.key("voice-b", body)
+        assert key != TTSCache.key("voice-a", {**body, "text": "Dag"})
+        assert key != TTSCache.key(
+            "voice-a", {**body, "voice_settings": {"stability": 0.6}}
+        )
+
+    async def test_commit_and_abort(self, tmp_path):
+        """Only committed writes become visible; aborted ones leave no files."""
+        cache = TTSCache(tmp_path, max_bytes=1000)
+
+        writer = await cache.open_writer("a")
+        await writer.write(b"partial")
+        await writer.abort()
+        assert await cache.get("a") is None
+        assert list(tmp_path.iterdir()) == []
+
+        await put(cache, "a", b"audio")
+        assert await cached(cache, "a") == b"audio"
+        assert cache.total_bytes == 5
+
+    async def test_evicts_least_recently_used(self, tmp_path):
+        """Total size stays under the limit, dropping the oldest entry first."""
+        cache = TTSCache(tmp_path, max_bytes=250)
+        for key in ["a", "b"]:
+            await put(cache, key, b"x" * 100)
+
+        await cached(cache, "a")  # b is now least recently used
+        await put(cache, "c", b"x" * 100)
+
+        assert await cache.get("b") is None
+        assert await cached(cache, "a") is not None
+        assert await cached(cache, "c") is not None
+        assert cache.total_bytes == 200
+
+    async def test_entry_evicted_while_streaming(self, tmp_path):
+        """A hit keeps streaming when its entry is evicted mid-response."""
+        cache = TTSCache(tmp_path, max_bytes=250)
+        await put(cache, "a", b"a" * 200)
+
+        file = await cache.get("a")
+        await put(cache, "b", b"b" * 200)  # evicts a
+
+        assert not cache.path_for("a").exists()
+        assert b"".join([chunk async for chunk in cache.read(file)]) == b"a" * 200
+
+    async def test_eviction_deletes_files_off_the_event_loop(
+        self, tmp_path, monkeypatch
+    ):
+        """Files evicted by a commit are deleted from a worker thread."""
+        cache = TTSCache(tmp_path, max_bytes=250)
+        await put(cache, "a", b"a" * 200)
+        unlink = Path.unlink
+        threads = []
+
+        def record_unlink(path, missing_ok=False):
+            threads.append(threading.current_thread())
+            unlink(path, missing_ok=missing_ok)
+
+        monkeypatch.setattr(Path, "unlink", record_unlink)
+        await put(cache, "b", b"b" * 200)  # evicts a
+
+        assert not cache.path_for("a").exists()
+        assert threads
+        assert threading.main_thread() not in threads
+
+    async def test_reindexes_existing_entries(self, tmp_path):
+        """A restarted gateway picks up audio cached by the previous process."""
+        await put(TTSCache(tmp_path, max_bytes=1000), "a", b"audio")
+
+        cache = TTSCache(tmp_path, max_bytes=1000)
+        assert await cached(cache, "a") == b"audio"
+        assert cache.total_bytes == 5
+
+
+class TestTTSEndpoint:
+    """Tests for /gateway/elevenlabs/tts against a stand-in TTS endpoint."""
+
+    def test_second_request_served_from_cache(
+        self, tts_env, backend_app, gateway_client
+    ):
+        """A repeated phrase is synthesized once and then streamed from disk."""
+        payload = {"voice_id": "v1", "text": "Modus gewijzigd"}
+
+        first = gateway_client.post("/gateway/elevenlabs/tts", json=payload)
+        second = gateway_client.post("/gateway/elevenlabs/tts", json=payload)
+
+        assert first.status_code == second.status_code == 200
+        assert first.headers["x-tts-cache"] == "miss"
+        assert second.headers["x-tts-cache"] == "hit"
+        assert second.content == first.content == b"v1:Modus gewijzigd" * 1000
+        assert len(backend_app.state.requests) == 1
+        assert len(list(tts_env.glob("*.mp3"))) == 1
+
+    def test_different_text_is_a_miss(self, tts_env, backend_app, gateway_client):
+        """Different phrases are synthesized separately."""
+        for text in ["een", "twee"]:
+            resp = gateway_client.post(
+                "/gateway/elevenlabs/tts", json={"voice_id": "v1", "text": text}
+            )
+            assert resp.headers["x-tts-cache"] == "miss"
+            assert resp.content == f"v1:{text}".encode() * 1000
+
+        assert len(backend_app.state.requests) == 2
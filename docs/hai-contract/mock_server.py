@@ -14,6 +14,12 @@ Supports Demo Scenario 1: Inspecteur Koen - Restaurant Bella Rosa
 
 Usage:
     python mock_server.py
+    python mock_server.py --perf --tokens-per-second 50 --response-tokens 100
+
+Performance mode (--perf, or MOCK_PERF_MODE=1) turns the server into a load
+target for the gateway and frontend. Every run gets the same canned response,
+streamed at a configurable token rate. Event payloads are precomputed, and
+there is no per-event logging or per-connection conversation state.
 
 WebSocket Input (RunAgentInput):
     {
@@ -40,8 +46,10 @@ Endpoints:
         DELETE /users/{user_id}
 """
 
+import argparse
 import asyncio
 import json
+import os
 import re
 import time
 import uuid
@@ -423,9 +431,10 @@ class UpdateSessionRequest(BaseModel):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown."""
+    mode = "Demo Mode" if PERF is None else "Performance Mode"
     print()
     print("=" * 64)
-    print("  AG-UI Protocol Mock Server v2.4.0 - Demo Mode (FastAPI)")
+    print(f"  AG-UI Protocol Mock Server v2.4.0 - {mode} (FastAPI)")
     print("=" * 64)
     print()
     print("  WebSocket: ws://localhost:8000/ws")
@@ -780,7 +789,9 @@ def to_spoken_text(text: str) -> str:
 
 
 def log_event(direction: str, event_type: str, detail: str = "") -> None:
-    """Log an event with timestamp."""
+    """Log an event with timestamp (silent in performance mode)."""
+    if PERF is not None:
+        return
     timestamp = time.strftime("%H:%M:%S")
     arrow = "→" if direction == "send" else "←"
     suffix = f" ({detail})" if detail else ""
@@ -811,6 +822,10 @@ async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for AG-UI protocol communication."""
     await websocket.accept()
 
+    if PERF is not None:
+        await perf_session(websocket, PERF)
+        return
+
     state = ConversationState()
 
     try:
@@ -1481,8 +1496,179 @@ async def stream_response(
     )
 
 
+# ---------------------------------------------------------------------------
+# PERFORMANCE MODE
+# ---------------------------------------------------------------------------
+
+PERF_FILLER = (
+    "Op basis van de bevindingen adviseer ik een schriftelijke waarschuwing. "
+    "Bederfelijke waar moet onder 7°C worden bewaard volgens de Hygiënecode "
+    "Horeca artikel 4.2, en de NVWA controleert dit bij een herinspectie. "
+)
+
+
+class PerfStream:
+    """Precomputed AG-UI payloads for the performance mode.
+
+    Every frame that does not depend on the run is serialized once at startup.
+    Per run, only the thread, run and message IDs are spliced in. Timestamps
+    are optional in AG-UI and are left out.
+    """
+
+    def __init__(self, tokens_per_second: float, response_tokens: int):
+        """Build the payloads for a response of response_tokens tokens."""
+        self.interval = 1.0 / tokens_per_second if tokens_per_second > 0 else 0.0
+
+        words = PERF_FILLER.split()
+        deltas = [words[i % len(words)] + " " for i in range(max(response_tokens, 1))]
+        # Message ID is spliced between the head and each tail
+        self.content_tails = [
+            '","delta":' + json.dumps(delta, ensure_ascii=False) + "}"
+            for delta in deltas
+        ]
+        self.spoken_tails = [
+            '","delta":'
+            + json.dumps(to_spoken_text(delta) + " ", ensure_ascii=False)
+            + "}}"
+            for delta in deltas
+        ]
+        self.response_bytes = sum(len(delta.encode()) for delta in deltas)
+
+    async def run(self, websocket: WebSocket, thread_id: str, run_id: str) -> None:
+        """Stream one complete run at the configured token rate."""
+        ids = '"threadId":' + json.dumps(thread_id) + ',"runId":' + json.dumps(run_id)
+        message_id = f"msg-{uuid.uuid4().hex}"
+        send = websocket.send_text
+
+        await send('{"type":"RUN_STARTED",' + ids + "}")
+        await send(
+            '{"type":"STATE_SNAPSHOT","snapshot":{'
+            + ids
+            + f',"currentAgent":"{Agents.GENERAL}","status":"processing"}}}}'
+        )
+        await send(
+            '{"type":"TEXT_MESSAGE_START","messageId":"'
+            + message_id
+            + '","role":"assistant"}'
+        )
+        await send(
+            '{"type":"CUSTOM","name":"agora:spoken_text_start","value":{"messageId":"'
+            + message_id
+            + '","role":"assistant"}}'
+        )
+
+        content_head = '{"type":"TEXT_MESSAGE_CONTENT","messageId":"' + message_id
+        spoken_head = (
+            '{"type":"CUSTOM","name":"agora:spoken_text_content","value":{"messageId":"'
+            + message_id
+        )
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for i, (content, spoken) in enumerate(
+            zip(self.content_tails, self.spoken_tails)
+        ):
+            if self.interval:
+                # Pace against the start time so slow sends don't accumulate drift
+                delay = start + i * self.interval - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await send(content_head + content)
+            await send(spoken_head + spoken)
+
+        await send('{"type":"TEXT_MESSAGE_END","messageId":"' + message_id + '"}')
+        await send(
+            '{"type":"CUSTOM","name":"agora:spoken_text_end","value":{"messageId":"'
+            + message_id
+            + '"}}'
+        )
+        await send(
+            '{"type":"STATE_SNAPSHOT","snapshot":{'
+            + ids
+            + f',"currentAgent":"{Agents.GENERAL}","status":"completed"}}}}'
+        )
+        await send('{"type":"RUN_FINISHED",' + ids + "}")
+
+
+# Set by main() when started with --perf
+PERF: PerfStream | None = None
+
+
+async def perf_session(websocket: WebSocket, stream: PerfStream) -> None:
+    """Serve a connection in performance mode.
+
+    Keeps no conversation state and logs nothing: every RunAgentInput gets
+    the same canned response. Other messages, such as tool approval
+    responses or JSON that is not an object, are ignored.
+    """
+    try:
+        while True:
+            try:
+                data = json.loads(await websocket.receive_text())
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(data, dict):
+                continue
+            thread_id = data.get("threadId") or data.get("thread_id")
+            if thread_id is None:
+                continue
+            run_id = data.get("runId") or data.get("run_id") or str(uuid.uuid4())
+            await stream.run(websocket, thread_id, run_id)
+    except (WebSocketDisconnect, RuntimeError):
+        # RuntimeError: the client went away mid-run
+        pass
+
+
+def raise_open_file_limit() -> int:
+    """Raise the soft open-file limit to the hard limit; each session holds a socket."""
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return -1
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+            soft = hard
+        except (ValueError, OSError):
+            pass
+    return soft
+
+
 def main():
     """Start the mock server."""
+    parser = argparse.ArgumentParser(description="AG-UI Protocol mock server")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address")
+    parser.add_argument("--port", type=int, default=8000, help="Bind port")
+    parser.add_argument(
+        "--perf",
+        action="store_true",
+        default=os.environ.get("MOCK_PERF_MODE", "").lower() in ("1", "true", "yes"),
+        help="Performance mode: canned responses, no logging (env: MOCK_PERF_MODE)",
+    )
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        default=float(os.environ.get("MOCK_TOKENS_PER_SECOND", "50")),
+        help="Token rate in performance mode, 0 for unpaced (default: 50)",
+    )
+    parser.add_argument(
+        "--response-tokens",
+        type=int,
+        default=int(os.environ.get("MOCK_RESPONSE_TOKENS", "100")),
+        help="Tokens per response in performance mode (default: 100)",
+    )
+    parser.add_argument(
+        "--backlog",
+        type=int,
+        default=4096,
+        help="Listen backlog in performance mode (default: 4096)",
+    )
+    args = parser.parse_args()
+
+    if args.perf:
+        run_perf(args)
+        return
+
     print()
     print("REST API Endpoints:")
     print()
@@ -1521,7 +1707,31 @@ def main():
     print(f"  - {Agents.REPORTING}")
     print()
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+def run_perf(args: argparse.Namespace) -> None:
+    """Start the server in performance mode."""
+    global PERF
+    PERF = PerfStream(args.tokens_per_second, args.response_tokens)
+    open_files = raise_open_file_limit()
+
+    rate = f"{args.tokens_per_second:g} tokens/s" if PERF.interval else "unpaced"
+    print()
+    print(
+        f"Responses: {args.response_tokens} tokens ({PERF.response_bytes} bytes), {rate}"
+    )
+    print(f"Open file limit: {open_files if open_files >= 0 else 'unknown'}")
+    print()
+
+    uvicorn.run(
+        app,
+        host=args.host,
+        port=args.port,
+        backlog=args.backlog,
+        log_level="warning",
+        access_log=False,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,482 @@
+"""Latency-injecting stand-ins for the AGORA MCP servers.
+
+Each stand-in exposes the same tool names and input schemas as the real
+inspection-history, regulation-analysis or reporting server, but answers
+from canned data after an injected delay. Latency distribution, payload
+size and failure rates are configurable per server and per tool, so tool
+fan-out, handoffs and timeouts in the orchestrators can be benchmarked
+without Weaviate, OpenAI or the KVK API.
+
+Usage:
+    python server.py inspection-history --port 5005 --latency lognormal:150:0.6
+    python server.py regulation-analysis --port 5002 --latency uniform:200:800 --payload-bytes 20000
+    python server.py reporting --port 5003 --config profile.json --failure-rate 0.05
+
+Latency specs (milliseconds):
+    fixed:MS
+    uniform:LOW:HIGH
+    normal:MEAN:STDDEV
+    lognormal:MEDIAN:SIGMA
+    exponential:MEAN
+
+Besides /mcp and /health, each stand-in serves /stats with per-tool call
+counts, injected failures and the peak number of concurrent calls.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SERVERS = ("inspection-history", "regulation-analysis", "reporting")
+
+DISTRIBUTIONS = {
+    "fixed": 1,
+    "uniform": 2,
+    "normal": 2,
+    "lognormal": 2,
+    "exponential": 1,
+}
+
+
+@dataclass(frozen=True)
+class Latency:
+    """A latency distribution, sampled in seconds."""
+
+    kind: str = "fixed"
+    params: tuple[float, ...] = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        """Parse a spec such as "lognormal:150:0.6" (times in milliseconds)."""
+        kind, *raw = spec.split(":")
+        if kind not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        if len(raw) != DISTRIBUTIONS[kind]:
+            raise ValueError(f"'{kind}' takes {DISTRIBUTIONS[kind]} parameter(s): {spec}")
+        return cls(kind, tuple(float(p) for p in raw))
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a delay in seconds, never negative."""
+        p = self.params
+        if self.kind == "fixed":
+            ms = p[0]
+        elif self.kind == "uniform":
+            ms = rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            ms = rng.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            ms = rng.lognormvariate(math.log(p[0]), p[1]) if p[0] > 0 else 0.0
+        else:
+            ms = rng.expovariate(1.0 / p[0]) if p[0] > 0 else 0.0
+        return max(ms, 0.0) / 1000
+
+
+@dataclass(frozen=True)
+class Behaviour:
+    """How a tool misbehaves."""
+
+    latency: Latency = field(default_factory=Latency)
+    payload_bytes: int = 0
+    failure_rate: float = 0.0
+    timeout_rate: float = 0.0
+    hang_seconds: float = 600.0
+
+    def merged(self, overrides: dict[str, Any]) -> "Behaviour":
+        """Return a copy with the given config keys replaced."""
+        values = dict(overrides)
+        if isinstance(values.get("latency"), str):
+            values["latency"] = Latency.parse(values["latency"])
+        return Behaviour(**{**self.__dict__, **values})
+
+
+@dataclass
+class ToolStats:
+    """Counters for one tool."""
+
+    calls: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+class StandIn:
+    """Applies the configured behaviour to every tool call."""
+
+    def __init__(
+        self,
+        server: str,
+        default: Behaviour,
+        tools: Optional[dict[str, Behaviour]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.server = server
+        self.default = default
+        self.tools = tools or {}
+        self.rng = random.Random(seed)
+        self.stats: dict[str, ToolStats] = {}
+
+    def behaviour(self, tool: str) -> Behaviour:
+        return self.tools.get(tool, self.default)
+
+    async def respond(self, tool: str, result: dict, pad_key: Optional[str] = None) -> dict:
+        """Return a canned result after the injected delay, or fail.
+
+        Args:
+            tool: Tool name, for per-tool behaviour and stats
+            result: Canned result shaped like the real server's
+            pad_key: List in the result to repeat up to the payload size
+        """
+        behaviour = self.behaviour(tool)
+        stats = self.stats.setdefault(tool, ToolStats())
+        stats.calls += 1
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            if self.rng.random() < behaviour.timeout_rate:
+                stats.timeouts += 1
+                await asyncio.sleep(behaviour.hang_seconds)
+            await asyncio.sleep(behaviour.latency.sample(self.rng))
+            if self.rng.random() < behaviour.failure_rate:
+                stats.failures += 1
+                raise RuntimeError(f"Injected failure in {tool}")
+            return pad(result, behaviour.payload_bytes, pad_key)
+        finally:
+            stats.in_flight -= 1
+
+
+def pad(result: dict, payload_bytes: int, pad_key: Optional[str] = None) -> dict:
+    """Grow a result to roughly payload_bytes of JSON.
+
+    Repeats the items of result[pad_key] when it is a non-empty list, so the
+    payload keeps its real shape; otherwise adds a "padding" string.
+    """
+    size = len(json.dumps(result, ensure_ascii=False).encode())
+    if size >= payload_bytes:
+        return result
+
+    items = result.get(pad_key) if pad_key else None
+    if isinstance(items, list) and items:
+        item_size = sum(len(json.dumps(i, ensure_ascii=False).encode()) + 2 for i in items) / len(items)
+        repeats = math.ceil((payload_bytes - size) / item_size)
+        return {**result, pad_key: items + [items[i % len(items)] for i in range(repeats)]}
+    return {**result, "padding": "x" * (payload_bytes - size)}
+
+
+# ============================================================================
+# CANNED DATA
+# ============================================================================
+
+DEMO_INSPECTION = {
+    "inspection_id": "INS-2022-001234",
+    "date": "2022-05-15",
+    "inspector": "Jan Pietersen",
+    "inspection_type": "hygiene_routine",
+    "location": "Den Haag",
+    "overall_score": "voldoende_met_opmerkingen",
+    "violations": [
+        {
+            "violation_id": "VIO-2022-001234-01",
+            "category": "hygiene_measures",
+            "severity": "warning",
+            "description": "Onvoldoende hygiënemaatregelen in de keuken",
+            "regulation": "Hygiënecode Horeca artikel 4.2",
+            "resolved": False,
+            "follow_up_required": True,
+        }
+    ],
+    "notes": "Bedrijfsleider was coöperatief.",
+}
+
+DEMO_REGULATION = {
+    "content": (
+        "Levensmiddelen moeten worden beschermd tegen verontreiniging. "
+        "Bederfelijke waar wordt bewaard bij een temperatuur van ten hoogste 7°C."
+    ),
+    "citation": "Source: Verordening (EG) nr. 852/2004 | Article: Bijlage II, Hoofdstuk IX",
+    "score": 0.87,
+    "regulation_type": "food_safety",
+    "source_type": "EU",
+    "article": "Bijlage II, Hoofdstuk IX",
+    "section": "Voorschriften voor levensmiddelen",
+    "document_summary": "Algemene hygiënevoorschriften voor levensmiddelenbedrijven.",
+}
+
+
+# ============================================================================
+# SERVERS
+# ============================================================================
+
+
+def register_inspection_history(mcp: FastMCP, stand_in: StandIn) -> None:
+    @mcp.tool()
+    async def check_company_exists(kvk_number: str) -> dict:
+        """Check if a company exists in the KVK register.
+
+        Args:
+            kvk_number: 8-digit KVK (Chamber of Commerce) number
+        """
+        result = {"status": "success", "exists": True, "kvk_number": kvk_number, "active": True}
+        return await stand_in.respond("check_company_exists", result)
+
+    @mcp.tool()
+    async def get_inspection_history(kvk_number: str, limit: int = 10) -> dict:
+        """Haal inspectiegeschiedenis op voor een bedrijf op basis van KVK nummer."""
+        result = {
+            "status": "success",
+            "kvk_number": kvk_number,
+            "company_name": "Restaurant Bella Rosa",
+            "total_inspections": 1,
+            "returned_inspections": 1,
+            "inspections": [DEMO_INSPECTION],
+        }
+        return await stand_in.respond("get_inspection_history", result, pad_key="inspections")
+
+
+def register_regulation_analysis(mcp: FastMCP, stand_in: StandIn) -> None:
+    @mcp.tool()
+    async def search_regulations(query: str, filters: Optional[Dict[str, str]] = None, limit: int = 10) -> dict:
+        """Search for relevant regulation articles using vector and hybrid search.
+
+        Args:
+            query: Natural language query describing what you're looking for
+            filters: Optional filters (source_type: Dutch/EU/SPEC, regulation_type: microbiological_criteria/allergens/food_information)
+            limit: Maximum number of results to return (default 10)
+        """
+        result = {"query": query, "filters": filters or {}, "found": 1, "results": [DEMO_REGULATION]}
+        return await stand_in.respond("search_regulations", result, pad_key="results")
+
+    @mcp.tool()
+    async def get_regulation_context(chunk_id: str, context_size: int = 2) -> dict:
+        """Get surrounding chunks for additional context around a specific regulation chunk.
+
+        Args:
+            chunk_id: The ID of the chunk to get context for
+            context_size: Number of chunks before and after to retrieve (default 2)
+        """
+        result = {"chunk_id": chunk_id, "context_size": context_size, "chunks": [DEMO_REGULATION]}
+        return await stand_in.respond("get_regulation_context", result, pad_key="chunks")
+
+    @mcp.tool()
+    async def lookup_regulation_articles(domain: str, keywords: list[str]) -> dict:
+        """Search for relevant regulation articles by domain and keywords (legacy interface).
+
+        Args:
+            domain: Regulation domain (microbiological_criteria, allergens, food_information, etc)
+            keywords: Keywords to search for in regulations
+        """
+        result = {"query": " ".join(keywords), "filters": {"regulation_type": domain}, "found": 1, "results": [DEMO_REGULATION]}
+        return await stand_in.respond("lookup_regulation_articles", result, pad_key="results")
+
+    @mcp.tool()
+    async def analyze_document(document_uri: str, analysis_type: str) -> dict:
+        """Analyze a document for summary, risks, or non-compliance issues.
+
+        Args:
+            document_uri: URI or path to the document to analyze
+            analysis_type: Type of analysis ('summary', 'risks', 'noncompliance')
+        """
+        result = {
+            "document_uri": document_uri,
+            "analysis_type": analysis_type,
+            "result": f"Analysis of type '{analysis_type}' for document: {document_uri}",
+            "findings": ["This is a placeholder for document analysis"],
+        }
+        return await stand_in.respond("analyze_document", result, pad_key="findings")
+
+    @mcp.tool()
+    async def get_database_stats() -> dict:
+        """Get statistics about the regulation database.
+
+        Returns information about total documents, chunks, and collection status.
+        """
+        result = {"status": "connected", "total_chunks": 12500, "collection": "RegulationChunk"}
+        return await stand_in.respond("get_database_stats", result)
+
+
+def register_reporting(mcp: FastMCP, stand_in: StandIn) -> None:
+    @mcp.tool()
+    async def extract_inspection_data(
+        session_id: str,
+        inspection_summary: str,
+        company_name: str | None = None,
+        company_address: str | None = None,
+        inspector_name: str | None = None,
+        inspector_email: str | None = None,
+        max_questions: int = 3,
+    ) -> dict:
+        """Extract structured HAP inspection data and generate verification questions.
+
+        Args:
+            session_id: Unique session identifier for this inspection
+            inspection_summary: Summary of user/assistant conversation about the inspection.
+            company_name: Name of the inspected company
+            company_address: Address of the inspected company
+            inspector_name: Name of the inspector conducting the inspection
+            inspector_email: Email address of the inspector for report delivery
+            max_questions: Maximum number of verification questions to generate (default: 3)
+        """
+        questions = [
+            {"field": "inspection_date", "question": "Op welke datum vond de inspectie plaats?"},
+            {"field": "follow_up", "question": "Is er een vervolginspectie gepland?"},
+            {"field": "measures", "question": "Welke maatregel is opgelegd?"},
+        ][:max_questions]
+        result = {
+            "success": True,
+            "session_id": session_id,
+            "extracted_data": {"company_name": company_name or "Restaurant Bella Rosa"},
+            "completeness": {"completion_percentage": 80.0},
+            "overall_confidence": 0.8,
+            "fields_needing_verification": [q["field"] for q in questions],
+            "verification_questions": questions,
+            "question_count": len(questions),
+            "message": f"Data geëxtraheerd met 80.0% compleetheid. {len(questions)} verificatievragen gegenereerd.",
+        }
+        return await stand_in.respond("extract_inspection_data", result, pad_key="verification_questions")
+
+    @mcp.tool()
+    async def submit_verification_answers(session_id: str, answers: dict | str) -> dict:
+        """Submit answers to verification questions and update the report data.
+
+        Args:
+            session_id: Session identifier
+            answers: Dictionary of field: value pairs or natural language responses
+        """
+        result = {
+            "success": True,
+            "session_id": session_id,
+            "completeness": {"completion_percentage": 100.0},
+            "message": "Antwoorden verwerkt.",
+        }
+        return await stand_in.respond("submit_verification_answers", result)
+
+    @mcp.tool()
+    async def generate_final_report(session_id: str, send_email: bool = True) -> dict:
+        """Generate final HAP inspection report in JSON and PDF formats.
+
+        Args:
+            session_id: Session identifier
+            send_email: Whether to send the report via email (default: True)
+        """
+        result = {
+            "success": True,
+            "session_id": session_id,
+            "report_id": f"HAP-{session_id[:8]}",
+            "download_urls": {
+                "json": f"http://localhost:5003/reports/{session_id}/json",
+                "pdf": f"http://localhost:5003/reports/{session_id}/pdf",
+            },
+            "email_sent": False,
+            "email_error": None,
+            "message": f"Rapport HAP-{session_id[:8]} succesvol gegenereerd.",
+        }
+        return await stand_in.respond("generate_final_report", result)
+
+    @mcp.tool()
+    async def get_report_status(session_id: str) -> dict:
+        """Get the current status and completion percentage of an inspection report.
+
+        Args:
+            session_id: Session identifier
+        """
+        result = {"success": True, "session_id": session_id, "status": "verification", "completion_percentage": 80.0}
+        return await stand_in.respond("get_report_status", result)
+
+
+REGISTRARS = {
+    "inspection-history": register_inspection_history,
+    "regulation-analysis": register_regulation_analysis,
+    "reporting": register_reporting,
+}
+
+
+def create_server(stand_in: StandIn, host: str = "127.0.0.1", port: int = 8000) -> FastMCP:
+    """Build the FastMCP app for a stand-in."""
+    mcp = FastMCP(
+        f"{stand_in.server} (stand-in)",
+        host=host,
+        port=port,
+        stateless_http=True,
+        log_level="WARNING",
+    )
+    REGISTRARS[stand_in.server](mcp, stand_in)
+
+    @mcp.custom_route("/health", methods=["GET"])
+    async def health_check(request: Request) -> JSONResponse:
+        """Health check endpoint, same as the real servers."""
+        return JSONResponse(
+            {
+                "status": "healthy",
+                "server": stand_in.server,
+                "stand_in": True,
+                "timestamp": datetime.now().isoformat(),
+            }
+        )
+
+    @mcp.custom_route("/stats", methods=["GET"])
+    async def stats(request: Request) -> JSONResponse:
+        """Per-tool call counters."""
+        return JSONResponse({tool: asdict(s) for tool, s in stand_in.stats.items()})
+
+    return mcp
+
+
+def load_stand_in(args: argparse.Namespace) -> StandIn:
+    """Combine the config file and command line into a StandIn."""
+    config: dict[str, Any] = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+
+    overrides = {
+        key: value
+        for key, value in (
+            ("latency", args.latency),
+            ("payload_bytes", args.payload_bytes),
+            ("failure_rate", args.failure_rate),
+            ("timeout_rate", args.timeout_rate),
+        )
+        if value is not None
+    }
+    default = Behaviour().merged({**config.get("default", {}), **overrides})
+    tools = {name: default.merged(values) for name, values in config.get("tools", {}).items()}
+    return StandIn(args.server, default, tools, seed=args.seed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Latency-injecting MCP server stand-in")
+    parser.add_argument("server", choices=SERVERS, help="Which MCP server to stand in for")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", help="Latency distribution, e.g. lognormal:150:0.6 (default: fixed:0)")
+    parser.add_argument("--payload-bytes", type=int, help="Minimum result size in bytes")
+    parser.add_argument("--failure-rate", type=float, help="Fraction of calls that return a tool error")
+    parser.add_argument("--timeout-rate", type=float, help="Fraction of calls that hang (for client timeouts)")
+    parser.add_argument("--config", help='JSON file: {"default": {...}, "tools": {"<tool>": {...}}}')
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+    args = parser.parse_args()
+
+    stand_in = load_stand_in(args)
+    logger.info(
+        f"Starting {args.server} stand-in on http://{args.host}:{args.port}/mcp "
+        f"(latency={stand_in.default.latency.kind}{list(stand_in.default.latency.params)}, "
+        f"payload_bytes={stand_in.default.payload_bytes}, failure_rate={stand_in.default.failure_rate})"
+    )
+    create_server(stand_in, args.host, args.port).run(transport="streamable-http")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+AGORA fake OpenAI server
+
+OpenAI-compatible stand-in for benchmarking server-langgraph and
+server-openai end to end without network access or token costs. Serves:
+- POST /v1/chat/completions (streaming and non-streaming, tool calls),
+  used by langchain-openai in server-langgraph
+- POST /v1/responses (streaming and non-streaming, function calls), used by
+  the Agents SDK in server-openai
+- GET /v1/models
+
+Responses are deterministic. A script (JSON) maps regexes on the latest
+user message to the tools to call and the text to answer with:
+
+    {
+      "rules": [
+        {
+          "match": "genereer rapport",
+          "tools": ["transfer_to_*report*", "generate_final_report"],
+          "response": "Het rapport is gegenereerd."
+        }
+      ],
+      "default_response": null
+    }
+
+On every request the first matching rule's next tool is called that (a) is
+offered in the request's tools (names may be fnmatch patterns, so one rule
+covers both backends' handoff names) and (b) has not been called since the
+user message. Once no such tool is left, the model answers with text, so
+handoff chains play out one tool per LLM call and always terminate. Tool
+arguments come from the rule ("tools": [{"name": ..., "arguments": {...}}])
+or are filled from the tool's JSON schema, taking KVK numbers and queries
+from the user message.
+
+Text is streamed word by word after --ttft seconds at --tokens-per-second.
+With --prefill-tokens-per-second the time to first token also grows with the
+prompt, like a real model reading its context.
+Without a scripted response, --response-tokens words of filler are sent.
+
+Usage:
+    python scripts/fake_llm_server.py --port 9999 --ttft 0.3 --tokens-per-second 80
+
+    # Point a backend at it (no MCP servers needed), then load test it
+    LANGGRAPH_OPENAI_BASE_URL=http://127.0.0.1:9999/v1 LANGGRAPH_OPENAI_API_KEY=fake \\
+        uvicorn agora_langgraph.api.server:app --port 8002
+    OPENAI_AGENTS_OPENAI_BASE_URL=http://127.0.0.1:9999/v1 OPENAI_AGENTS_OPENAI_API_KEY=fake \\
+        uvicorn agora_openai.api.server:app --port 8003
+    python scripts/test_api.py --base-url http://localhost:8002 --load --sessions 20
+
+Requirements:
+    pip install fastapi uvicorn
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+try:
+    import uvicorn
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, StreamingResponse
+except ImportError:
+    print("Missing fastapi/uvicorn. Install with: pip install fastapi uvicorn")
+    raise SystemExit(1)
+
+DEFAULT_SCRIPT = Path(__file__).resolve().parent / "fake_llm_script.json"
+
+FILLER = (
+    "Op basis van de beschikbare gegevens is de situatie bij dit bedrijf "
+    "beoordeeld en zijn de relevante bevindingen vastgelegd voor de inspectie"
+).split()
+
+KVK_RE = re.compile(r"\b\d{8}\b")
+WORD_RE = re.compile(r"\S+\s*")
+
+
+@dataclass
+class Rule:
+    pattern: re.Pattern
+    tools: list[dict]
+    response: Optional[str] = None
+
+
+@dataclass
+class Config:
+    ttft: float = 0.3
+    tokens_per_second: float = 50.0
+    prefill_tokens_per_second: float = 0.0
+    response_tokens: int = 60
+    rules: list[Rule] = field(default_factory=list)
+    default_response: Optional[str] = None
+
+
+def load_script(path: Optional[Path]) -> tuple[list[Rule], Optional[str]]:
+    """Read rules from a script file (see module docstring)."""
+    if path is None or not path.exists():
+        return [], None
+    data = json.loads(path.read_text(encoding="utf-8"))
+    rules = []
+    for rule in data.get("rules", []):
+        tools = [t if isinstance(t, dict) else {"name": t} for t in rule.get("tools", [])]
+        rules.append(Rule(re.compile(rule["match"], re.IGNORECASE), tools, rule.get("response")))
+    return rules, data.get("default_response")
+
+
+# ---------------------------------------------------------------------------
+# Decision logic, shared by both APIs
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Turn:
+    """What the model has seen: the latest user message and tools since then."""
+
+    user_message: str
+    called_since_user: list[str]
+    offered: dict[str, dict]  # tool name -> JSON schema of its parameters
+
+
+@dataclass
+class Decision:
+    text: Optional[str] = None
+    tool_name: Optional[str] = None
+    tool_arguments: Optional[dict] = None
+
+
+def decide(turn: Turn, config: Config) -> Decision:
+    """Pick the next tool call or the text answer for a turn."""
+    for rule in config.rules:
+        if not rule.pattern.search(turn.user_message):
+            continue
+        for tool in rule.tools:
+            for name, schema in turn.offered.items():
+                if fnmatch.fnmatch(name, tool["name"]) and name not in turn.called_since_user:
+                    arguments = tool.get("arguments") or fill_arguments(schema, turn.user_message)
+                    return Decision(tool_name=name, tool_arguments=arguments)
+        return Decision(text=rule.response or config.default_response)
+    return Decision(text=config.default_response)
+
+
+def fill_arguments(schema: dict, user_message: str) -> dict:
+    """Deterministic arguments for a tool's required parameters."""
+    properties = schema.get("properties", {})
+    arguments: dict[str, Any] = {}
+    for name in schema.get("required", list(properties)):
+        prop = properties.get(name, {})
+        kind = prop.get("type", "string")
+        if "enum" in prop:
+            arguments[name] = prop["enum"][0]
+        elif kind == "string":
+            kvk = KVK_RE.search(user_message)
+            if "kvk" in name.lower() and kvk:
+                arguments[name] = kvk.group()
+            elif name.lower() in ("query", "question", "text", "description", "content"):
+                arguments[name] = user_message
+            else:
+                arguments[name] = "test"
+        elif kind in ("integer", "number"):
+            arguments[name] = 1
+        elif kind == "boolean":
+            arguments[name] = False
+        elif kind == "array":
+            arguments[name] = []
+        else:
+            arguments[name] = {}
+    return arguments
+
+
+def response_words(decision: Decision, config: Config) -> list[str]:
+    """The answer split into streamed tokens (words with trailing space)."""
+    if decision.text:
+        return WORD_RE.findall(decision.text)
+    words = [FILLER[i % len(FILLER)] for i in range(config.response_tokens)]
+    return [w + " " for w in words[:-1]] + [words[-1] + "."]
+
+
+def time_to_first_token(prompt_tokens: int, config: Config) -> float:
+    """TTFT for a prompt: the fixed --ttft plus prefill time, if configured."""
+    if config.prefill_tokens_per_second <= 0:
+        return config.ttft
+    return config.ttft + prompt_tokens / config.prefill_tokens_per_second
+
+
+async def paced(words: list[str], config: Config, ttft: float) -> AsyncIterator[str]:
+    """Yield tokens after the TTFT at the configured rate, without drift."""
+    await asyncio.sleep(ttft)
+    started = time.perf_counter()
+    interval = 1 / config.tokens_per_second if config.tokens_per_second > 0 else 0
+    for i, word in enumerate(words):
+        delay = started + i * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield word
+
+
+def _text(content: Any) -> str:
+    """Flatten OpenAI message content (string or parts) to text."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(p.get("text", "") for p in content if isinstance(p, dict))
+    return ""
+
+
+def _usage(prompt: str, words: int) -> tuple[int, int]:
+    return max(1, len(prompt) // 4), words
+
+
+# ---------------------------------------------------------------------------
+# Chat Completions API
+# ---------------------------------------------------------------------------
+
+
+def chat_turn(body: dict) -> Turn:
+    """Read the latest user message and tools called since from a chat request."""
+    messages = body.get("messages", [])
+    user_message, called = "", []
+    for message in messages:
+        if message.get("role") == "user":
+            user_message, called = _text(message.get("content")), []
+        for call in message.get("tool_calls") or []:
+            called.append(call.get("function", {}).get("name", ""))
+    offered = {
+        t["function"]["name"]: t["function"].get("parameters", {})
+        for t in body.get("tools", [])
+        if t.get("type") == "function"
+    }
+    return Turn(user_message, called, offered)
+
+
+def _sse(data: Any, event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def chat_completions(body: dict, config: Config):
+    turn = chat_turn(body)
+    decision = decide(turn, config)
+    model = body.get("model", "fake")
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+    prompt_tokens, _ = _usage(json.dumps(body.get("messages", [])), 0)
+    ttft = time_to_first_token(prompt_tokens, config)
+
+    if decision.tool_name:
+        call = {
+            "id": f"call_{uuid.uuid4().hex[:24]}",
+            "type": "function",
+            "function": {"name": decision.tool_name, "arguments": json.dumps(decision.tool_arguments)},
+        }
+        words: list[str] = []
+        finish_reason = "tool_calls"
+    else:
+        call = None
+        words = response_words(decision, config)
+        finish_reason = "stop"
+    usage = {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": len(words) or 1,
+        "total_tokens": prompt_tokens + (len(words) or 1),
+    }
+
+    if not body.get("stream"):
+        await asyncio.sleep(ttft + len(words) / max(config.tokens_per_second, 1e-9))
+        message: dict[str, Any] = {"role": "assistant", "content": "".join(words) or None}
+        if call:
+            message["tool_calls"] = [call]
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": usage,
+        })
+
+    def chunk(delta: dict, finish: Optional[str] = None) -> str:
+        return _sse({
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+        })
+
+    async def stream() -> AsyncIterator[str]:
+        yield chunk({"role": "assistant", "content": ""})
+        if call:
+            await asyncio.sleep(ttft)
+            yield chunk({"tool_calls": [{"index": 0, **call}]})
+        else:
+            async for word in paced(words, config, ttft):
+                yield chunk({"content": word})
+        yield chunk({}, finish_reason)
+        if (body.get("stream_options") or {}).get("include_usage"):
+            yield _sse({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [],
+                "usage": usage,
+            })
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+# ---------------------------------------------------------------------------
+# Responses API
+# ---------------------------------------------------------------------------
+
+
+def responses_turn(body: dict) -> Turn:
+    """Read the latest user message and tools called since from a Responses request."""
+    items = body.get("input", [])
+    if isinstance(items, str):
+        items = [{"role": "user", "content": items}]
+    user_message, called = "", []
+    for item in items:
+        if item.get("role") == "user":
+            user_message, called = _text(item.get("content")), []
+        elif item.get("type") == "function_call":
+            called.append(item.get("name", ""))
+    offered = {
+        t["name"]: t.get("parameters", {})
+        for t in body.get("tools", [])
+        if t.get("type") == "function"
+    }
+    return Turn(user_message, called, offered)
+
+
+async def responses(body: dict, config: Config):
+    turn = responses_turn(body)
+    decision = decide(turn, config)
+    response_id = f"resp_{uuid.uuid4().hex}"
+    input_tokens, _ = _usage(json.dumps(body.get("input", [])), 0)
+    ttft = time_to_first_token(input_tokens, config)
+
+    if decision.tool_name:
+        item_id = f"fc_{uuid.uuid4().hex[:24]}"
+        arguments = json.dumps(decision.tool_arguments)
+        item: dict[str, Any] = {
+            "id": item_id,
+            "type": "function_call",
+            "call_id": f"call_{uuid.uuid4().hex[:24]}",
+            "name": decision.tool_name,
+            "arguments": arguments,
+            "status": "completed",
+        }
+        words: list[str] = []
+    else:
+        item_id = f"msg_{uuid.uuid4().hex[:24]}"
+        words = response_words(decision, config)
+        item = {
+            "id": item_id,
+            "type": "message",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": "".join(words), "annotations": []}],
+        }
+
+    def envelope(status: str, output: list) -> dict:
+        output_tokens = len(words) or 1
+        return {
+            "id": response_id,
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": status,
+            "model": body.get("model", "fake"),
+            "output": output,
+            "parallel_tool_calls": True,
+            "tool_choice": body.get("tool_choice", "auto"),
+            "tools": body.get("tools", []),
+            "usage": {
+                "input_tokens": input_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens": output_tokens,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": input_tokens + output_tokens,
+            } if status == "completed" else None,
+        }
+
+    if not body.get("stream"):
+        await asyncio.sleep(ttft + len(words) / max(config.tokens_per_second, 1e-9))
+        return JSONResponse(envelope("completed", [item]))
+
+    async def stream() -> AsyncIterator[str]:
+        seq = 0
+
+        def event(kind: str, **data) -> str:
+            nonlocal seq
+            seq += 1
+            return _sse({"type": kind, "sequence_number": seq, **data}, event=kind)
+
+        yield event("response.created", response=envelope("in_progress", []))
+        yield event("response.in_progress", response=envelope("in_progress", []))
+
+        if decision.tool_name:
+            await asyncio.sleep(ttft)
+            yield event("response.output_item.added", output_index=0, item={**item, "arguments": "", "status": "in_progress"})
+            yield event("response.function_call_arguments.delta", item_id=item_id, output_index=0, delta=item["arguments"])
+            yield event("response.function_call_arguments.done", item_id=item_id, output_index=0, arguments=item["arguments"])
+        else:
+            part = {"type": "output_text", "text": "", "annotations": []}
+            yield event("response.output_item.added", output_index=0, item={**item, "content": [], "status": "in_progress"})
+            yield event("response.content_part.added", item_id=item_id, output_index=0, content_index=0, part=part)
+            async for word in paced(words, config, ttft):
+                yield event("response.output_text.delta", item_id=item_id, output_index=0, content_index=0, delta=word, logprobs=[])
+            text = "".join(words)
+            yield event("response.output_text.done", item_id=item_id, output_index=0, content_index=0, text=text, logprobs=[])
+            yield event("response.content_part.done", item_id=item_id, output_index=0, content_index=0, part={**part, "text": text})
+        yield event("response.output_item.done", output_index=0, item=item)
+        yield event("response.completed", response=envelope("completed", [item]))
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+# ---------------------------------------------------------------------------
+# App
+# ---------------------------------------------------------------------------
+
+
+def create_app(config: Config) -> FastAPI:
+    app = FastAPI(title="AGORA fake OpenAI server")
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "fake", "object": "model", "owned_by": "agora"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat(request: Request):
+        return await chat_completions(await request.json(), config)
+
+    @app.post("/v1/responses")
+    async def create_response(request: Request):
+        return await responses(await request.json(), config)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible fake LLM for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9999)
+    parser.add_argument("--ttft", type=float, default=0.3, help="Seconds before the first token (default: 0.3)")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Streaming rate (default: 50, 0 = unpaced)")
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=0.0, help="Prompt tokens read per second before the first token (default: 0 = fixed TTFT)")
+    parser.add_argument("--response-tokens", type=int, default=60, help="Words in unscripted answers (default: 60)")
+    parser.add_argument("--script", type=Path, default=DEFAULT_SCRIPT, help="Rules file (default: fake_llm_script.json)")
+    args = parser.parse_args()
+
+    rules, default_response = load_script(args.script)
+    config = Config(
+        ttft=args.ttft,
+        tokens_per_second=args.tokens_per_second,
+        prefill_tokens_per_second=args.prefill_tokens_per_second,
+        response_tokens=args.response_tokens,
+        rules=rules,
+        default_response=default_response,
+    )
+    print(f"Fake OpenAI server on http://{args.host}:{args.port}/v1 ({len(rules)} rules)")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
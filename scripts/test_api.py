@@ -7,10 +7,17 @@ Tests the production API endpoints including:
 - WebSocket streaming
 - All backend routes (langgraph, openai, mock)
 
+Also has a load mode that replays the DEMO_SCENARIOS.md conversations over
+concurrent AG-UI WebSocket sessions and reports latency percentiles as JSON.
+
 Usage:
     python scripts/test_api.py --api-key YOUR_API_KEY
     python scripts/test_api.py --api-key YOUR_API_KEY --base-url https://your-domain.com
 
+    # Load test: 20 concurrent sessions against the langgraph backend
+    python scripts/test_api.py --api-key YOUR_API_KEY --base-url http://localhost:8000 \
+        --load --sessions 20 --backend langgraph --output langgraph.json
+
 Requirements:
     pip install websockets httpx
 """
@@ -21,7 +28,8 @@ import json
 import sys
 import time
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Optional
 
 try:
@@ -346,16 +354,292 @@ class APITester:
         print(f"{'='*60}\n")
 
 
+DEFAULT_SCENARIOS = Path(__file__).resolve().parent.parent / "DEMO_SCENARIOS.md"
+
+
+def load_scenarios(path: Path) -> dict[str, list[str]]:
+    """Parse the quick copy-paste inputs of DEMO_SCENARIOS.md.
+
+    Returns scenario title -> user messages, in order. Only the code blocks
+    under "### Scenario" headings before the first "## " section that
+    follows them are used.
+    """
+    scenarios: dict[str, list[str]] = {}
+    current: Optional[str] = None
+    block: Optional[list[str]] = None
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if block is not None:
+            if line.strip() == "```":
+                if current and block:
+                    scenarios[current].append("\n".join(block).strip())
+                block = None
+            else:
+                block.append(line)
+        elif line.startswith("### Scenario"):
+            current = line.removeprefix("### ").strip()
+            scenarios[current] = []
+        elif line.startswith("## ") and scenarios:
+            break
+        elif line.strip() == "```" and current:
+            block = []
+    return {name: turns for name, turns in scenarios.items() if turns}
+
+
+def percentiles(values: list[float]) -> dict:
+    """Summarize samples with nearest-rank p50/p95/p99."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))], 1)
+
+    return {
+        "count": len(ordered),
+        "p50": rank(50),
+        "p95": rank(95),
+        "p99": rank(99),
+        "mean": round(sum(ordered) / len(ordered), 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+@dataclass
+class RunMetrics:
+    """Timings (ms, relative to sending the input) of a single agent run."""
+
+    scenario: str
+    turn: int
+    run_started_ms: Optional[float] = None
+    first_text_ms: Optional[float] = None
+    first_spoken_ms: Optional[float] = None
+    finished_ms: Optional[float] = None
+    inter_token_ms: list[float] = field(default_factory=list)
+    tool_call_ms: list[float] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class LoadTester:
+    """Replays demo scenarios over N concurrent AG-UI WebSocket sessions.
+
+    Each session plays one scenario (round-robin) on its own thread, sending
+    the next message once the previous run has finished. Tool approval
+    requests are approved automatically so report generation runs end to end.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str],
+        backend: Optional[str],
+        scenarios: dict[str, list[str]],
+        sessions: int,
+        ramp_up: float,
+        run_timeout: float,
+    ):
+        self.ws_url = base_url.rstrip("/").replace("https://", "wss://").replace("http://", "ws://")
+        self.api_key = api_key
+        self.backend = backend
+        self.scenarios = list(scenarios.items())
+        self.sessions = sessions
+        self.ramp_up = ramp_up
+        self.run_timeout = run_timeout
+        self.runs: list[RunMetrics] = []
+
+    def _endpoint(self) -> str:
+        path = f"/api/{self.backend}/ws" if self.backend else "/ws"
+        return f"{self.ws_url}{path}" + (f"?token={self.api_key}" if self.api_key else "")
+
+    async def run(self) -> dict:
+        """Run every session to completion and return the JSON report."""
+        started = time.perf_counter()
+        await asyncio.gather(*(self._session(i) for i in range(self.sessions)))
+        return self.report(time.perf_counter() - started)
+
+    async def _session(self, index: int) -> None:
+        await asyncio.sleep(self.ramp_up * index / max(1, self.sessions))
+        name, turns = self.scenarios[index % len(self.scenarios)]
+        thread_id = str(uuid.uuid4())
+        user_id = str(uuid.uuid4())
+        try:
+            async with websockets.connect(self._endpoint(), close_timeout=5, max_size=None) as ws:
+                for turn, content in enumerate(turns):
+                    metrics = RunMetrics(scenario=name, turn=turn)
+                    self.runs.append(metrics)
+                    try:
+                        await asyncio.wait_for(
+                            self._play_turn(ws, thread_id, user_id, content, metrics),
+                            self.run_timeout,
+                        )
+                    except asyncio.TimeoutError:
+                        metrics.error = "timeout"
+                    if metrics.error and metrics.error != "run_error":
+                        # The connection state is unknown; skip the rest of the scenario
+                        return
+        except Exception as e:
+            self.runs.append(RunMetrics(scenario=name, turn=-1, error=f"connect: {e}"))
+
+    async def _play_turn(self, ws, thread_id: str, user_id: str, content: str, metrics: RunMetrics) -> None:
+        request = {
+            "threadId": thread_id,
+            "runId": str(uuid.uuid4()),
+            "userId": user_id,
+            "messages": [{"role": "user", "content": content}],
+        }
+        sent = time.perf_counter()
+        await ws.send(json.dumps(request))
+
+        def elapsed() -> float:
+            return (time.perf_counter() - sent) * 1000
+
+        last_token: Optional[float] = None
+        tool_starts: dict[str, float] = {}
+        async for msg in ws:
+            event = json.loads(msg)
+            event_type = event.get("type", "")
+            now = elapsed()
+
+            if event_type == "RUN_STARTED" and metrics.run_started_ms is None:
+                metrics.run_started_ms = now
+            elif event_type == "TEXT_MESSAGE_CONTENT":
+                if metrics.first_text_ms is None:
+                    metrics.first_text_ms = now
+                if last_token is not None:
+                    metrics.inter_token_ms.append(now - last_token)
+                last_token = now
+            elif event_type == "TOOL_CALL_START":
+                tool_starts[event.get("toolCallId", "")] = now
+            elif event_type == "TOOL_CALL_RESULT":
+                start = tool_starts.pop(event.get("toolCallId", ""), None)
+                if start is not None:
+                    metrics.tool_call_ms.append(now - start)
+            elif event_type == "CUSTOM":
+                name = event.get("name")
+                if name == "agora:spoken_text_content" and metrics.first_spoken_ms is None:
+                    metrics.first_spoken_ms = now
+                elif name == "agora:tool_approval_request":
+                    approval_id = (event.get("value") or {}).get("approvalId")
+                    await ws.send(json.dumps({
+                        "type": "CUSTOM",
+                        "name": "agora:tool_approval_response",
+                        "value": {"approvalId": approval_id, "approved": True},
+                    }))
+            elif event_type == "RUN_ERROR":
+                metrics.error = "run_error"
+                metrics.finished_ms = now
+                return
+            elif event_type == "RUN_FINISHED":
+                metrics.finished_ms = now
+                return
+        metrics.error = "connection_closed"
+
+    def report(self, wall_seconds: float) -> dict:
+        """Aggregate all runs into percentiles (all timings in ms)."""
+        ok = [r for r in self.runs if not r.error]
+        errors: dict[str, int] = {}
+        for r in self.runs:
+            if r.error:
+                kind = r.error.split(":")[0]
+                errors[kind] = errors.get(kind, 0) + 1
+
+        def collect(attr: str) -> list[float]:
+            return [getattr(r, attr) for r in ok if getattr(r, attr) is not None]
+
+        return {
+            "endpoint": self._endpoint().split("?")[0],
+            "backend": self.backend or "default",
+            "sessions": self.sessions,
+            "scenarios": [name for name, _ in self.scenarios],
+            "runs": len(self.runs),
+            "errors": errors,
+            "error_rate": round(1 - len(ok) / len(self.runs), 4) if self.runs else 0.0,
+            "wall_seconds": round(wall_seconds, 2),
+            "runs_per_second": round(len(ok) / wall_seconds, 3) if wall_seconds else 0.0,
+            "time_to_run_started_ms": percentiles(collect("run_started_ms")),
+            "time_to_first_text_ms": percentiles(collect("first_text_ms")),
+            "time_to_first_spoken_ms": percentiles(collect("first_spoken_ms")),
+            "inter_token_ms": percentiles([t for r in ok for t in r.inter_token_ms]),
+            "tool_call_ms": percentiles([t for r in ok for t in r.tool_call_ms]),
+            "run_duration_ms": percentiles(collect("finished_ms")),
+        }
+
+
 def main():
     parser = argparse.ArgumentParser(description="Test AGORA API endpoints")
-    parser.add_argument("--api-key", required=True, help="API key for authentication")
+    parser.add_argument("--api-key", default=None, help="API key for authentication")
     parser.add_argument(
         "--base-url",
         default="https://agora.gradient-testing.nl",
         help="Base URL for the API (default: https://agora.gradient-testing.nl)"
     )
+
+    load = parser.add_argument_group("load test")
+    load.add_argument(
+        "--load",
+        action="store_true",
+        help="Run the concurrent load test instead of the checks"
+    )
+    load.add_argument(
+        "--sessions",
+        type=int,
+        default=10,
+        help="Concurrent WebSocket sessions (default: 10)"
+    )
+    load.add_argument(
+        "--backend",
+        choices=["langgraph", "openai", "mock"],
+        default=None,
+        help="Route through /api/{backend}/ws (default: the gateway's /ws)"
+    )
+    load.add_argument(
+        "--scenarios",
+        type=Path,
+        default=DEFAULT_SCENARIOS,
+        help="Scenario file (default: DEMO_SCENARIOS.md)"
+    )
+    load.add_argument(
+        "--ramp-up",
+        type=float,
+        default=5.0,
+        help="Seconds over which sessions are started (default: 5)"
+    )
+    load.add_argument(
+        "--run-timeout",
+        type=float,
+        default=180.0,
+        help="Seconds before a single run counts as failed (default: 180)"
+    )
+    load.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Also write the JSON report to this file"
+    )
     args = parser.parse_args()
 
+    if args.load:
+        scenarios = load_scenarios(args.scenarios)
+        if not scenarios:
+            parser.error(f"no scenarios found in {args.scenarios}")
+        tester = LoadTester(
+            args.base_url,
+            args.api_key,
+            args.backend,
+            scenarios,
+            sessions=args.sessions,
+            ramp_up=args.ramp_up,
+            run_timeout=args.run_timeout,
+        )
+        report = asyncio.run(tester.run())
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        print(output)
+        if args.output:
+            args.output.write_text(output + "\n")
+        sys.exit(0 if report["runs"] and report["error_rate"] < 1 else 1)
+
+    if not args.api_key:
+        parser.error("--api-key is required")
+
     tester = APITester(args.base_url, args.api_key)
     success = asyncio.run(tester.run_all_tests())
     sys.exit(0 if success else 1)
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+AGORA LangGraph agent answer benchmark
+
+Measures time to first written token (TTFT) and LLM cost per turn for turns
+the agent answers without tool calls, with and without stream_agent_answer:
+
+- regenerate: the agent's answer is discarded and generate_written produces
+  the written text again (agent + written + spoken LLM calls)
+- stream: the agent's answer is streamed to the written channel as it is
+  generated; only the spoken text is generated separately
+
+With --spoken-text-type dictate the user speaks the written text, so
+generate_spoken is not dispatched at all.
+
+The graph runs in-process against scripts/fake_llm_server.py, started on a
+free port, with an in-memory checkpointer and without MCP servers.
+
+Usage:
+    python server-langgraph/benchmarks/bench_agent_answer.py --turns 20 --ttft 0.3
+
+Requirements:
+    pip install -e server-langgraph fastapi uvicorn
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+import httpx
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+FAKE_LLM = Path(__file__).resolve().parents[2] / "scripts" / "fake_llm_server.py"
+
+QUESTIONS = [
+    "Waar moet ik op letten bij de koelcel?",
+    "Hoe leg ik een bevinding over hygiëne vast?",
+    "Welke vragen stel ik aan de ondernemer?",
+    "Wat is een goede volgorde voor de inspectie?",
+]
+
+
+class LLMCallCounter(UsageMetadataCallbackHandler):
+    """Token usage per model, plus the number of LLM calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def on_llm_end(self, response: Any, **kwargs: Any) -> None:
+        self.calls += 1
+        super().on_llm_end(response, **kwargs)
+
+
+llm_counter_var: ContextVar[LLMCallCounter | None] = ContextVar(
+    "bench_llm_counter", default=None
+)
+register_configure_hook(llm_counter_var, inheritable=True)
+
+
+class BenchUserManager:
+    """UserManager stand-in returning one user with the benchmarked preference."""
+
+    def __init__(self, spoken_text_type: str) -> None:
+        self.spoken_text_type = spoken_text_type
+
+    async def get_user(self, user_id: str) -> dict:
+        return {
+            "id": user_id,
+            "email": "bench@example.com",
+            "name": "Bench",
+            "preferences": {"spoken_text_type": self.spoken_text_type},
+        }
+
+
+class RecordingHandler:
+    """Protocol handler stand-in that records when the written text starts."""
+
+    is_connected = True
+
+    def __init__(self) -> None:
+        self.first_written: float | None = None
+
+    async def send_text_message_content(self, message_id: str, delta: str) -> None:
+        if self.first_written is None:
+            self.first_written = time.perf_counter()
+
+    def __getattr__(self, name: str):
+        async def ignore(*args: Any, **kwargs: Any) -> None:
+            return None
+
+        return ignore
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_llm(args: argparse.Namespace, script: Path) -> tuple[Any, str]:
+    """Start the fake LLM server and wait until it serves requests."""
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(FAKE_LLM),
+            "--port",
+            str(port),
+            "--ttft",
+            str(args.ttft),
+            "--tokens-per-second",
+            str(args.tokens_per_second),
+            "--response-tokens",
+            str(args.response_tokens),
+            "--script",
+            str(script),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}/v1"
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}/models").raise_for_status()
+            return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Fake LLM server did not start")
+
+
+async def run_mode(mode: str, turns: int, spoken_text_type: str) -> dict:
+    """Run `turns` turns (a new session each) in one mode."""
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    from agora_langgraph.adapters.audit_logger import AuditLogger
+    from agora_langgraph.common.ag_ui_types import RunAgentInput
+    from agora_langgraph.core import agents
+    from agora_langgraph.core.graph import build_agent_graph
+    from agora_langgraph.pipelines.moderator import ModerationPipeline
+    from agora_langgraph.pipelines.orchestrator import Orchestrator
+
+    stream_agent_answer = mode == "stream"
+    graph = build_agent_graph({}, stream_agent_answer=stream_agent_answer)
+    orchestrator = Orchestrator(
+        graph=graph.compile(checkpointer=InMemorySaver()),
+        moderator=ModerationPipeline(),
+        audit_logger=AuditLogger(),
+        user_manager=BenchUserManager(spoken_text_type),
+        stream_agent_answer=stream_agent_answer,
+    )
+    # The fake server reports usage when asked to, like api.openai.com
+    for agent_id in agents.AGENT_NODES:
+        agents.get_llm_for_agent(agent_id).stream_usage = True
+    agents.get_llm_for_spoken().stream_usage = True
+
+    ttfts: list[float] = []
+    durations: list[float] = []
+    counter = LLMCallCounter()
+    token = llm_counter_var.set(counter)
+    try:
+        for turn in range(turns):
+            handler = RecordingHandler()
+            agent_input = RunAgentInput(
+                thread_id=f"bench-{mode}-{uuid.uuid4()}",
+                user_id=str(uuid.uuid4()),
+                messages=[
+                    {"role": "user", "content": QUESTIONS[turn % len(QUESTIONS)]}
+                ],
+            )
+            started = time.perf_counter()
+            await orchestrator.process_message(agent_input, handler)
+            durations.append((time.perf_counter() - started) * 1000)
+            if handler.first_written is not None:
+                ttfts.append((handler.first_written - started) * 1000)
+    finally:
+        llm_counter_var.reset(token)
+
+    usage = list(counter.usage_metadata.values())
+    input_tokens = sum(u["input_tokens"] for u in usage)
+    output_tokens = sum(u["output_tokens"] for u in usage)
+    return {
+        "mode": mode,
+        "spoken_text_type": spoken_text_type,
+        "turns": turns,
+        "ttft_ms": {
+            "p50": round(percentile(ttfts, 50), 1),
+            "p95": round(percentile(ttfts, 95), 1),
+        },
+        "turn_ms": {
+            "mean": round(statistics.fmean(durations), 1),
+            "p95": round(percentile(durations, 95), 1),
+        },
+        "per_turn": {
+            "llm_calls": round(counter.calls / turns, 2),
+            "input_tokens": round(input_tokens / turns, 1),
+            "output_tokens": round(output_tokens / turns, 1),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark streaming the agent's answer vs regenerating it"
+    )
+    parser.add_argument("--turns", type=int, default=20, help="Turns per mode")
+    parser.add_argument(
+        "--ttft", type=float, default=0.3, help="Fake LLM seconds to first token"
+    )
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=80.0, help="Fake LLM stream rate"
+    )
+    parser.add_argument(
+        "--response-tokens", type=int, default=60, help="Words per fake LLM answer"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["regenerate", "stream", "both"],
+        default="both",
+        help="Which mode to benchmark",
+    )
+    parser.add_argument(
+        "--spoken-text-type",
+        choices=["summarize", "dictate"],
+        default="summarize",
+        help="The user's spoken text preference",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # No rules: every LLM call answers with text, no tool calls
+        script = Path(tmp) / "script.json"
+        script.write_text(json.dumps({"rules": [], "default_response": None}))
+        process, base_url = start_fake_llm(args, script)
+        try:
+            os.environ["LANGGRAPH_OPENAI_BASE_URL"] = base_url
+            os.environ.setdefault("LANGGRAPH_OPENAI_API_KEY", "fake")
+            modes = ["regenerate", "stream"] if args.mode == "both" else [args.mode]
+            results = [
+                asyncio.run(run_mode(mode, args.turns, args.spoken_text_type))
+                for mode in modes
+            ]
+        finally:
+            process.terminate()
+            process.wait()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
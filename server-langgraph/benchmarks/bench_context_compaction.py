@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+AGORA LangGraph context compaction benchmark
+
+Plays one long inspection session and reports, per turn, the prompt tokens
+sent to the LLM and the turn latency, with and without context compaction:
+
+- off: every LLM call gets the whole conversation
+- on: older turns are summarized once the context exceeds --budget tokens,
+  the last --keep-turns turns are sent verbatim
+
+The graph runs in-process against scripts/fake_llm_server.py, started on a
+free port. Its time to first token grows with the prompt
+(--prefill-tokens-per-second), so latency reflects prompt size like a real
+model. Prompt tokens of the summarization calls are included in the turns
+where compaction ran.
+
+Usage:
+    python server-langgraph/benchmarks/bench_context_compaction.py --turns 40
+    python server-langgraph/benchmarks/bench_context_compaction.py --budget 4000 --keep-turns 4
+
+Requirements:
+    pip install -e server-langgraph fastapi uvicorn
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+import httpx
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+FAKE_LLM = Path(__file__).resolve().parents[2] / "scripts" / "fake_llm_server.py"
+
+QUESTIONS = [
+    "We zijn bij Bakkerij De Korenschoof, KVK 92251854. Waar begin ik?",
+    "De koelcel staat op 9 graden. Is dat een overtreding?",
+    "Welke regelgeving geldt voor allergeneninformatie op de toonbank?",
+    "Er ligt ongedierte in het magazijn. Wat moet ik vastleggen?",
+    "Hoe vaak moet de ondernemer de temperatuur registreren?",
+    "Wat waren de bevindingen bij de vorige inspectie?",
+]
+
+
+class UsageCounter(UsageMetadataCallbackHandler):
+    """Token usage of all LLM calls while it is active."""
+
+
+usage_counter_var: ContextVar[UsageCounter | None] = ContextVar(
+    "bench_usage_counter", default=None
+)
+register_configure_hook(usage_counter_var, inheritable=True)
+
+
+class SilentHandler:
+    """Protocol handler stand-in that ignores all events."""
+
+    is_connected = True
+
+    def __getattr__(self, name: str):
+        async def ignore(*args: Any, **kwargs: Any) -> None:
+            return None
+
+        return ignore
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_llm(args: argparse.Namespace, script: Path) -> tuple[Any, str]:
+    """Start the fake LLM server and wait until it serves requests."""
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(FAKE_LLM),
+            "--port",
+            str(port),
+            "--ttft",
+            str(args.ttft),
+            "--prefill-tokens-per-second",
+            str(args.prefill_tokens_per_second),
+            "--tokens-per-second",
+            "0",
+            "--response-tokens",
+            str(args.response_tokens),
+            "--script",
+            str(script),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}/v1"
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}/models").raise_for_status()
+            return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Fake LLM server did not start")
+
+
+async def run_session(mode: str, args: argparse.Namespace) -> dict:
+    """Run one session of `args.turns` turns."""
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    from agora_langgraph.adapters.audit_logger import AuditLogger
+    from agora_langgraph.common.ag_ui_types import RunAgentInput
+    from agora_langgraph.core import agents
+    from agora_langgraph.core.graph import build_agent_graph
+    from agora_langgraph.pipelines.moderator import ModerationPipeline
+    from agora_langgraph.pipelines.orchestrator import Orchestrator
+
+    graph = build_agent_graph(
+        {},
+        context_token_budget=args.budget if mode == "on" else 0,
+        context_keep_turns=args.keep_turns,
+    )
+    orchestrator = Orchestrator(
+        graph=graph.compile(checkpointer=InMemorySaver()),
+        moderator=ModerationPipeline(),
+        audit_logger=AuditLogger(),
+    )
+    # The fake server reports usage when asked to, like api.openai.com
+    for agent_id in agents.AGENT_NODES:
+        agents.get_llm_for_agent(agent_id).stream_usage = True
+    agents.get_llm_for_spoken().stream_usage = True
+
+    thread_id = f"bench-{mode}-{uuid.uuid4()}"
+    turns = []
+    for turn in range(args.turns):
+        counter = UsageCounter()
+        token = usage_counter_var.set(counter)
+        try:
+            agent_input = RunAgentInput(
+                thread_id=thread_id,
+                user_id="bench-user",
+                messages=[
+                    {"role": "user", "content": QUESTIONS[turn % len(QUESTIONS)]}
+                ],
+            )
+            started = time.perf_counter()
+            await orchestrator.process_message(agent_input, SilentHandler())
+            duration = (time.perf_counter() - started) * 1000
+        finally:
+            usage_counter_var.reset(token)
+        usage = list(counter.usage_metadata.values())
+        turns.append(
+            {
+                "turn": turn + 1,
+                "input_tokens": sum(u["input_tokens"] for u in usage),
+                "turn_ms": round(duration, 1),
+            }
+        )
+
+    last = turns[-10:]
+    return {
+        "compaction": mode,
+        "turns": args.turns,
+        "per_turn": [t for t in turns if t["turn"] == 1 or t["turn"] % args.every == 0],
+        "last_10_turns": {
+            "input_tokens_mean": round(
+                statistics.fmean(t["input_tokens"] for t in last)
+            ),
+            "turn_ms_mean": round(statistics.fmean(t["turn_ms"] for t in last), 1),
+            "turn_ms_p95": round(percentile([t["turn_ms"] for t in last], 95), 1),
+        },
+        "input_tokens_total": sum(t["input_tokens"] for t in turns),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark prompt size and latency of a long session"
+    )
+    parser.add_argument("--turns", type=int, default=40, help="Turns in the session")
+    parser.add_argument(
+        "--budget", type=int, default=4000, help="Context token budget when on"
+    )
+    parser.add_argument(
+        "--keep-turns", type=int, default=4, help="Turns kept verbatim when on"
+    )
+    parser.add_argument(
+        "--ttft", type=float, default=0.2, help="Fake LLM fixed seconds to first token"
+    )
+    parser.add_argument(
+        "--prefill-tokens-per-second",
+        type=float,
+        default=5000.0,
+        help="Fake LLM prompt tokens read per second",
+    )
+    parser.add_argument(
+        "--response-tokens", type=int, default=150, help="Words per fake LLM answer"
+    )
+    parser.add_argument("--every", type=int, default=5, help="Report every n-th turn")
+    parser.add_argument(
+        "--mode",
+        choices=["off", "on", "both"],
+        default="both",
+        help="Run without compaction, with it, or both",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # No rules: every LLM call answers with text, no tool calls
+        script = Path(tmp) / "script.json"
+        script.write_text(json.dumps({"rules": [], "default_response": None}))
+        process, base_url = start_fake_llm(args, script)
+        try:
+            os.environ["LANGGRAPH_OPENAI_BASE_URL"] = base_url
+            os.environ.setdefault("LANGGRAPH_OPENAI_API_KEY", "fake")
+            modes = ["off", "on"] if args.mode == "both" else [args.mode]
+            results = [asyncio.run(run_session(mode, args)) for mode in modes]
+        finally:
+            process.terminate()
+            process.wait()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
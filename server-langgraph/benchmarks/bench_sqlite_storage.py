@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+AGORA LangGraph sessions.db concurrency benchmark
+
+Simulates many simultaneous sessions hitting sessions.db the way a turn does:
+the pre-run reads (session metadata, user, checkpointed thread state), a graph
+run that writes a checkpoint per step, and the end-of-turn metadata update.
+Reports turn throughput, latency percentiles and "database is locked" errors
+for two layouts:
+
+- shared: one SQLiteStorage connection for the checkpointer, the session
+  metadata and user managers (WAL, synchronous=NORMAL, one write per turn end)
+- separate: the previous layout, with one connection per component,
+  synchronous=FULL, and an extra last_activity write at the start of a turn
+
+Usage:
+    python server-langgraph/benchmarks/bench_sqlite_storage.py --sessions 200 --turns 5
+    python server-langgraph/benchmarks/bench_sqlite_storage.py --layout shared --db /tmp/b.db
+
+Requirements:
+    pip install -e server-langgraph
+"""
+
+import argparse
+import asyncio
+import json
+import sqlite3
+import statistics
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from datetime import UTC, datetime
+from pathlib import Path
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from agora_langgraph.adapters.session_metadata import SessionMetadataManager
+from agora_langgraph.adapters.storage import SQLiteStorage
+from agora_langgraph.adapters.user_manager import UserManager
+
+# Nodes of the stand-in graph; each step writes a checkpoint like an agent hop
+GRAPH_STEPS = ("routing", "agent", "generate_written")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def build_graph() -> StateGraph:
+    """A graph without LLM calls that checkpoints as often as a real turn."""
+    graph = StateGraph(MessagesState)
+    previous = START
+    for step in GRAPH_STEPS:
+
+        def node(state: MessagesState, step: str = step) -> dict:
+            return {"messages": [AIMessage(content=f"{step} " + "x" * 400)]}
+
+        graph.add_node(step, node)
+        graph.add_edge(previous, step)
+        previous = step
+    graph.add_edge(previous, END)
+    return graph
+
+
+async def open_layout(layout: str, db_path: str, stack: AsyncExitStack):
+    """Open the checkpointer and managers for a layout."""
+    if layout == "shared":
+        storage = SQLiteStorage(db_path)
+        await storage.initialize()
+        stack.push_async_callback(storage.close)
+        checkpointer = storage.create_checkpointer()
+        metadata = SessionMetadataManager(storage=storage)
+        users = UserManager(storage=storage)
+    else:
+        checkpointer = await stack.enter_async_context(
+            AsyncSqliteSaver.from_conn_string(db_path)
+        )
+        await checkpointer.conn.execute("PRAGMA synchronous=FULL")
+        metadata = SessionMetadataManager(db_path)
+        users = UserManager(db_path)
+
+    await checkpointer.setup()
+    for manager in (metadata, users):
+        await manager.initialize()
+        stack.push_async_callback(manager.close)
+        if layout == "separate":
+            await manager._connection.execute("PRAGMA synchronous=FULL")
+    return checkpointer, metadata, users
+
+
+async def run_layout(layout: str, db_path: str, sessions: int, turns: int) -> dict:
+    """Run `turns` turns for each of `sessions` concurrent sessions."""
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+
+    async with AsyncExitStack() as stack:
+        checkpointer, metadata, users = await open_layout(layout, db_path, stack)
+        graph = build_graph().compile(checkpointer=checkpointer)
+        user = await users.create_user("bench@example.com", "Bench")
+        user_id = user["id"] if user else ""
+
+        async def turn(session_id: str, number: int) -> None:
+            config = {"configurable": {"thread_id": session_id}}
+            message = f"Vraag {number} over inspectie {session_id}"
+            await asyncio.gather(
+                metadata.create_or_update_metadata(session_id, user_id, message),
+                users.get_user(user_id),
+                graph.aget_state(config),
+            )
+            if layout == "separate" and number > 0:
+                # Previous layout: last_activity was written at the start too
+                async with metadata._storage.transaction() as connection:
+                    await connection.execute(
+                        "UPDATE session_metadata SET last_activity = ? "
+                        "WHERE session_id = ?",
+                        (datetime.now(UTC).isoformat(), session_id),
+                    )
+            await graph.ainvoke({"messages": [HumanMessage(content=message)]}, config)
+            await metadata.finish_turn(session_id)
+
+        async def session(index: int) -> None:
+            for number in range(turns):
+                started = time.perf_counter()
+                try:
+                    await turn(f"bench-{index}", number)
+                except sqlite3.Error as e:
+                    errors[str(e)] = errors.get(str(e), 0) + 1
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(session(i) for i in range(sessions)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "layout": layout,
+        "sessions": sessions,
+        "turns": len(latencies),
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "turns_per_s": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 2),
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark concurrent sessions on sessions.db"
+    )
+    parser.add_argument(
+        "--sessions", type=int, default=200, help="Simultaneous sessions"
+    )
+    parser.add_argument("--turns", type=int, default=5, help="Turns per session")
+    parser.add_argument(
+        "--layout",
+        choices=["shared", "separate", "both"],
+        default="both",
+        help="Connection layout to benchmark",
+    )
+    parser.add_argument(
+        "--db",
+        default=None,
+        help="Database file (a fresh file per layout in a temp dir by default)",
+    )
+    args = parser.parse_args()
+
+    layouts = ["separate", "shared"] if args.layout == "both" else [args.layout]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout in layouts:
+            db_path = args.db or str(Path(tmp) / f"{layout}.db")
+            results.append(
+                asyncio.run(run_layout(layout, db_path, args.sessions, args.turns))
+            )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
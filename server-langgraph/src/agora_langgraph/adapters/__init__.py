@@ -6,10 +6,12 @@ from agora_langgraph.adapters.mcp_client import (
     MCPClientManager,
     create_mcp_client_manager,
 )
+from agora_langgraph.adapters.storage import SQLiteStorage
 
 __all__ = [
     "MCPClientManager",
     "create_mcp_client_manager",
     "create_checkpointer",
+    "SQLiteStorage",
     "AuditLogger",
 ]
@@ -5,28 +5,118 @@ from __future__ import annotations
 import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from datetime import UTC, datetime
 
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 
+from agora_langgraph.adapters.storage import SQLiteStorage
+
 log = logging.getLogger(__name__)
 
+# Generation accumulators that used to keep every turn's text (see AgentState)
+GENERATION_CHANNELS = ("written", "spoken")
+
+COMPACTION_NAME = "trim_generation_accumulators"
+
 
 @asynccontextmanager
 async def create_checkpointer(
-    db_path: str = "sessions.db",
+    storage: SQLiteStorage,
 ) -> AsyncGenerator[AsyncSqliteSaver, None]:
     """Create an async SQLite checkpointer for session persistence.
 
+    The checkpointer shares the storage's connection and write lock with the
+    session metadata and user managers. The connection is owned by the
+    storage and stays open after the checkpointer is done.
+
     Args:
-        db_path: Path to the SQLite database file
+        storage: Initialized shared SQLite storage
 
     Yields:
         Configured AsyncSqliteSaver instance
     """
-    log.info(f"Creating SQLite checkpointer at {db_path}")
+    log.info(f"Creating SQLite checkpointer at {storage.db_path}")
+
+    checkpointer = storage.create_checkpointer()
+    await checkpointer.setup()
+    await compact_checkpoints(storage, checkpointer)
+    log.info("Checkpointer initialized successfully")
+    yield checkpointer
+
+
+async def compact_checkpoints(
+    storage: SQLiteStorage, checkpointer: AsyncSqliteSaver
+) -> int:
+    """Trim the generation accumulators of checkpoints written before they reset.
+
+    The written/spoken lists in AgentState used to grow by one item per turn,
+    so every checkpoint of a long session carried all previous answers. Only
+    the last item is ever read, so older items are dropped. Runs once per
+    database; later calls return immediately.
+
+    Args:
+        storage: Initialized shared SQLite storage
+        checkpointer: Checkpointer set up on the storage
+
+    Returns:
+        Number of checkpoints rewritten
+    """
+    connection = storage.connection
+    async with storage.transaction():
+        await connection.execute("""
+            CREATE TABLE IF NOT EXISTS agora_compactions (
+                name TEXT PRIMARY KEY,
+                applied_at TEXT NOT NULL
+            )
+            """)
+    async with connection.execute(
+        "SELECT 1 FROM agora_compactions WHERE name = ?", (COMPACTION_NAME,)
+    ) as cursor:
+        if await cursor.fetchone():
+            return 0
+
+    async with connection.execute(
+        "SELECT thread_id, checkpoint_ns, checkpoint_id FROM checkpoints"
+    ) as cursor:
+        keys = list(await cursor.fetchall())
+
+    compacted = 0
+    async with storage.transaction():
+        for key in keys:
+            async with connection.execute(
+                "SELECT type, checkpoint FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                key,
+            ) as cursor:
+                row = await cursor.fetchone()
+            if not row:
+                continue
+
+            checkpoint = checkpointer.serde.loads_typed((row[0], row[1]))
+            values = checkpoint.get("channel_values", {})
+            trimmed = False
+            for channel in GENERATION_CHANNELS:
+                items = values.get(channel)
+                if isinstance(items, list) and len(items) > 1:
+                    values[channel] = items[-1:]
+                    trimmed = True
+            if not trimmed:
+                continue
+
+            await connection.execute(
+                "UPDATE checkpoints SET type = ?, checkpoint = ? "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (*checkpointer.serde.dumps_typed(checkpoint), *key),
+            )
+            compacted += 1
 
-    async with AsyncSqliteSaver.from_conn_string(db_path) as checkpointer:
-        log.info("Checkpointer initialized successfully")
-        yield checkpointer
+        await connection.execute(
+            "INSERT INTO agora_compactions (name, applied_at) VALUES (?, ?)",
+            (COMPACTION_NAME, datetime.now(UTC).isoformat()),
+        )
 
-    log.info("Checkpointer connection closed")
+    log.info(
+        f"Compacted {compacted} of {len(keys)} checkpoints "
+        f"({COMPACTION_NAME}); run VACUUM to reclaim the freed space"
+    )
+    return compacted
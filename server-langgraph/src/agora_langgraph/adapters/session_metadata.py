@@ -11,6 +11,8 @@ from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
 from pydantic import SecretStr
 
+from agora_langgraph.adapters.storage import SQLiteStorage
+
 log = logging.getLogger(__name__)
 
 TITLE_GENERATION_PROMPT = (
@@ -33,13 +35,18 @@ class SessionMetadataManager:
     to avoid coupling with framework internals.
     """
 
-    def __init__(self, db_path: str = "sessions.db"):
+    def __init__(
+        self, db_path: str = "sessions.db", storage: SQLiteStorage | None = None
+    ):
         """Initialize the session metadata manager.
 
         Args:
-            db_path: Path to the SQLite database file
+            db_path: Path to the SQLite database file (ignored if storage is given)
+            storage: Shared storage; the manager opens its own if not given
         """
-        self.db_path = db_path
+        self._owns_storage = storage is None
+        self._storage = storage or SQLiteStorage(db_path)
+        self.db_path = self._storage.db_path
         self._connection: aiosqlite.Connection | None = None
 
     async def initialize(self) -> None:
@@ -47,7 +54,9 @@ class SessionMetadataManager:
 
         Must be called during application startup (lifespan).
         """
-        self._connection = await aiosqlite.connect(self.db_path)
+        if self._owns_storage:
+            await self._storage.initialize()
+        self._connection = self._storage.connection
         await self._ensure_tables()
         log.info(f"SessionMetadataManager initialized with database: {self.db_path}")
 
@@ -57,7 +66,8 @@ class SessionMetadataManager:
         Should be called during application shutdown.
         """
         if self._connection:
-            await self._connection.close()
+            if self._owns_storage:
+                await self._storage.close()
             self._connection = None
             log.info("SessionMetadataManager connection closed")
 
@@ -66,26 +76,26 @@ class SessionMetadataManager:
         if not self._connection:
             raise RuntimeError("SessionMetadataManager not initialized")
 
-        await self._connection.execute(
+        async with self._storage.transaction() as connection:
+            await connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS session_metadata (
+                    session_id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    first_message_preview TEXT,
+                    message_count INTEGER DEFAULT 1,
+                    created_at TEXT DEFAULT (datetime('now')),
+                    last_activity TEXT DEFAULT (datetime('now'))
+                )
             """
-            CREATE TABLE IF NOT EXISTS session_metadata (
-                session_id TEXT PRIMARY KEY,
-                user_id TEXT NOT NULL,
-                title TEXT NOT NULL,
-                first_message_preview TEXT,
-                message_count INTEGER DEFAULT 1,
-                created_at TEXT DEFAULT (datetime('now')),
-                last_activity TEXT DEFAULT (datetime('now'))
             )
-        """
-        )
-        await self._connection.execute(
+            await connection.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_session_metadata_user_activity
+                ON session_metadata (user_id, last_activity DESC)
             """
-            CREATE INDEX IF NOT EXISTS idx_session_metadata_user_activity
-            ON session_metadata (user_id, last_activity DESC)
-        """
-        )
-        await self._connection.commit()
+            )
 
     async def list_sessions(
         self,
@@ -196,11 +206,11 @@ class SessionMetadataManager:
         if not self._connection:
             raise RuntimeError("SessionMetadataManager not initialized")
 
-        cursor = await self._connection.execute(
-            "DELETE FROM session_metadata WHERE session_id = ?",
-            (session_id,),
-        )
-        await self._connection.commit()
+        async with self._storage.transaction() as connection:
+            cursor = await connection.execute(
+                "DELETE FROM session_metadata WHERE session_id = ?",
+                (session_id,),
+            )
         return cursor.rowcount > 0
 
     async def create_or_update_metadata(
@@ -208,93 +218,120 @@ class SessionMetadataManager:
         session_id: str,
         user_id: str,
         first_message: str | None = None,
-        api_key: str | None = None,
-        base_url: str = "https://api.openai.com/v1",
-    ) -> None:
-        """Create session metadata entry or update if exists.
+    ) -> bool:
+        """Create session metadata entry if it doesn't exist yet.
 
         On first message for a session:
-        - Creates metadata entry with auto-generated title (LLM if api_key provided)
+        - Creates metadata entry with a title truncated from the message
+          (see generate_title for the LLM title, which is patched in later)
         - Sets first_message_preview from message content
 
-        On subsequent calls:
-        - Updates last_activity timestamp
+        On subsequent calls nothing is written: last_activity is updated
+        together with the message count when the turn ends (see finish_turn).
 
         Args:
             session_id: Session identifier
             user_id: User identifier (inspector persona ID)
-            first_message: First user message (for title generation)
-            api_key: OpenAI API key (enables LLM title generation)
-            base_url: API base URL (for OpenAI-compatible providers)
+            first_message: First user message (for the initial title)
+
+        Returns:
+            True if a new entry was created
         """
         if not self._connection:
             raise RuntimeError("SessionMetadataManager not initialized")
 
-        now = datetime.now(UTC).isoformat()
-
         # Check if session already exists
         cursor = await self._connection.execute(
             "SELECT session_id FROM session_metadata WHERE session_id = ?",
             (session_id,),
         )
-        existing = await cursor.fetchone()
+        if await cursor.fetchone():
+            return False
 
-        if existing:
-            # Update last_activity only
-            await self._connection.execute(
-                """
-                UPDATE session_metadata
-                SET last_activity = ?
-                WHERE session_id = ?
-                """,
-                (now, session_id),
-            )
-        else:
-            # Create new entry
-            # Generate title
-            if first_message:
-                if api_key:
-                    title = await self._generate_title_with_llm(
-                        first_message, api_key, base_url=base_url
-                    )
-                else:
-                    title = self._generate_title(first_message)
-            else:
-                title = "New Conversation"
-            preview = first_message[:200] if first_message else None
-
-            await self._connection.execute(
+        # Create new entry
+        now = datetime.now(UTC).isoformat()
+        title = self._generate_title(first_message or "")
+        preview = first_message[:200] if first_message else None
+
+        async with self._storage.transaction() as connection:
+            cursor = await connection.execute(
                 """
-                INSERT INTO session_metadata
+                INSERT OR IGNORE INTO session_metadata
                 (session_id, user_id, title, first_message_preview,
                  message_count, created_at, last_activity)
                 VALUES (?, ?, ?, ?, 1, ?, ?)
                 """,
                 (session_id, user_id, title, preview, now, now),
             )
+        return cursor.rowcount > 0
 
-        await self._connection.commit()
+    async def generate_title(
+        self,
+        session_id: str,
+        first_message: str,
+        api_key: str,
+        base_url: str = "https://api.openai.com/v1",
+    ) -> str | None:
+        """Replace a new session's truncated title with an LLM-generated one.
 
-    async def increment_message_count(self, session_id: str) -> None:
-        """Increment message count and update last_activity.
+        Meant to run in the background after create_or_update_metadata. The
+        title is only replaced while it is still the truncated placeholder,
+        so a rename in the meantime wins.
 
         Args:
             session_id: Session identifier
+            first_message: First user message
+            api_key: OpenAI API key
+            base_url: API base URL (for OpenAI-compatible providers)
+
+        Returns:
+            The new title, or None if the session was not updated
         """
         if not self._connection:
             raise RuntimeError("SessionMetadataManager not initialized")
 
-        now = datetime.now(UTC).isoformat()
-        await self._connection.execute(
-            """
-            UPDATE session_metadata
-            SET message_count = message_count + 1,
-                last_activity = ?
-            WHERE session_id = ?
-            """,
-            (now, session_id),
+        placeholder = self._generate_title(first_message)
+        title = await self._generate_title_with_llm(
+            first_message, api_key, base_url=base_url
         )
-        await self._connection.commit()
+        if title == placeholder:
+            return None
+
+        async with self._storage.transaction() as connection:
+            cursor = await connection.execute(
+                """
+                UPDATE session_metadata
+                SET title = ?
+                WHERE session_id = ? AND title = ?
+                """,
+                (title, session_id, placeholder),
+            )
+        return title if cursor.rowcount > 0 else None
+
+    async def finish_turn(self, session_id: str, completed: bool = True) -> None:
+        """Record the end of a turn in a single write.
+
+        Updates last_activity, and increments the message count for the
+        assistant response if the turn completed.
+
+        Args:
+            session_id: Session identifier
+            completed: Whether the turn produced a response
+        """
+        if not self._connection:
+            raise RuntimeError("SessionMetadataManager not initialized")
+
+        now = datetime.now(UTC).isoformat()
+        async with self._storage.transaction() as connection:
+            await connection.execute(
+                """
+                UPDATE session_metadata
+                SET message_count = message_count + ?,
+                    last_activity = ?
+                WHERE session_id = ?
+                """,
+                (1 if completed else 0, now, session_id),
+            )
 
     async def update_session_title(
         self, session_id: str, title: str
@@ -314,8 +351,8 @@ class SessionMetadataManager:
         title = title.strip()[:200]
         now = datetime.now(UTC).isoformat()
 
-        async with self._connection.cursor() as cursor:
-            await cursor.execute(
+        async with self._storage.transaction() as connection:
+            cursor = await connection.execute(
                 """
                 UPDATE session_metadata
                 SET title = ?, last_activity = ?
@@ -323,10 +360,9 @@ class SessionMetadataManager:
                 """,
                 (title, now, session_id),
             )
-            await self._connection.commit()
 
-            if cursor.rowcount == 0:
-                return None
+        if cursor.rowcount == 0:
+            return None
 
         return await self.get_session(session_id)
 
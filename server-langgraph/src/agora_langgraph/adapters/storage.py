@@ -0,0 +1,91 @@
+"""Shared SQLite storage for sessions.db.
+
+The checkpointer, SessionMetadataManager and UserManager all live in the same
+database file. Instead of each opening its own connection (and committing in
+rollback-journal mode, where writers serialize and readers block), they share
+one connection configured for concurrent use:
+
+- WAL journal mode, so reads never wait for a writer
+- synchronous=NORMAL, which is durable in WAL mode without an fsync per commit
+- busy_timeout, so other processes on the same file wait instead of failing
+
+All writes go through a single lock. The checkpointer is given the same lock,
+so a transaction of one component is never committed halfway by another.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+log = logging.getLogger(__name__)
+
+
+class SQLiteStorage:
+    """Managed SQLite connection shared by the components using sessions.db."""
+
+    def __init__(self, db_path: str = "sessions.db", busy_timeout_ms: int = 5000):
+        """Initialize the storage.
+
+        Args:
+            db_path: Path to the SQLite database file
+            busy_timeout_ms: How long to wait for a lock held by another process
+        """
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.lock = asyncio.Lock()
+        self._connection: aiosqlite.Connection | None = None
+
+    async def initialize(self) -> None:
+        """Open the connection and configure it.
+
+        Must be called during application startup (lifespan).
+        """
+        self._connection = await aiosqlite.connect(self.db_path)
+        await self._connection.execute("PRAGMA journal_mode=WAL")
+        await self._connection.execute("PRAGMA synchronous=NORMAL")
+        await self._connection.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        log.info(f"SQLiteStorage initialized with database: {self.db_path}")
+
+    async def close(self) -> None:
+        """Close the connection.
+
+        Should be called during application shutdown.
+        """
+        if self._connection:
+            await self._connection.close()
+            self._connection = None
+            log.info("SQLiteStorage connection closed")
+
+    @property
+    def connection(self) -> aiosqlite.Connection:
+        """The shared connection, for reads."""
+        if not self._connection:
+            raise RuntimeError("SQLiteStorage not initialized")
+        return self._connection
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Run writes in one transaction, committed once at the end.
+
+        Rolls back if the block raises. Transactions do not nest.
+        """
+        async with self.lock:
+            connection = self.connection
+            try:
+                yield connection
+            except BaseException:
+                await connection.rollback()
+                raise
+            await connection.commit()
+
+    def create_checkpointer(self) -> AsyncSqliteSaver:
+        """Create a LangGraph checkpointer on the shared connection and lock."""
+        checkpointer = AsyncSqliteSaver(self.connection)
+        checkpointer.lock = self.lock
+        return checkpointer
@@ -10,6 +10,8 @@ from typing import Any
 
 import aiosqlite
 
+from agora_langgraph.adapters.storage import SQLiteStorage
+
 log = logging.getLogger(__name__)
 
 
@@ -26,13 +28,18 @@ class UserManager:
     to enable cascade deletes when a user is deleted.
     """
 
-    def __init__(self, db_path: str = "sessions.db"):
+    def __init__(
+        self, db_path: str = "sessions.db", storage: SQLiteStorage | None = None
+    ):
         """Initialize the user manager.
 
         Args:
-            db_path: Path to the SQLite database file
+            db_path: Path to the SQLite database file (ignored if storage is given)
+            storage: Shared storage; the manager opens its own if not given
         """
-        self.db_path = db_path
+        self._owns_storage = storage is None
+        self._storage = storage or SQLiteStorage(db_path)
+        self.db_path = self._storage.db_path
         self._connection: aiosqlite.Connection | None = None
 
     async def initialize(self) -> None:
@@ -40,7 +47,9 @@ class UserManager:
 
         Must be called during application startup (lifespan).
         """
-        self._connection = await aiosqlite.connect(self.db_path)
+        if self._owns_storage:
+            await self._storage.initialize()
+        self._connection = self._storage.connection
         await self._ensure_tables()
         log.info(f"UserManager initialized with database: {self.db_path}")
 
@@ -50,7 +59,8 @@ class UserManager:
         Should be called during application shutdown.
         """
         if self._connection:
-            await self._connection.close()
+            if self._owns_storage:
+                await self._storage.close()
             self._connection = None
             log.info("UserManager connection closed")
 
@@ -59,26 +69,26 @@ class UserManager:
         if not self._connection:
             raise RuntimeError("UserManager not initialized")
 
-        await self._connection.execute(
+        async with self._storage.transaction() as connection:
+            await connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS users (
+                    id TEXT PRIMARY KEY,
+                    email TEXT UNIQUE NOT NULL,
+                    name TEXT NOT NULL,
+                    role TEXT DEFAULT 'inspector',
+                    preferences TEXT,
+                    created_at TEXT DEFAULT (datetime('now')),
+                    last_activity TEXT DEFAULT (datetime('now'))
+                )
             """
-            CREATE TABLE IF NOT EXISTS users (
-                id TEXT PRIMARY KEY,
-                email TEXT UNIQUE NOT NULL,
-                name TEXT NOT NULL,
-                role TEXT DEFAULT 'inspector',
-                preferences TEXT,
-                created_at TEXT DEFAULT (datetime('now')),
-                last_activity TEXT DEFAULT (datetime('now'))
             )
-        """
-        )
-        await self._connection.execute(
+            await connection.execute(
+                """
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email
+                ON users (email)
             """
-            CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email
-            ON users (email)
-        """
-        )
-        await self._connection.commit()
+            )
 
     async def create_user(
         self,
@@ -103,14 +113,14 @@ class UserManager:
         now = datetime.now(UTC).isoformat()
 
         try:
-            await self._connection.execute(
-                """
-                INSERT INTO users (id, email, name, role, created_at, last_activity)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (user_id, email, name, role, now, now),
-            )
-            await self._connection.commit()
+            async with self._storage.transaction() as connection:
+                await connection.execute(
+                    """
+                    INSERT INTO users (id, email, name, role, created_at, last_activity)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (user_id, email, name, role, now, now),
+                )
             log.info(f"Created user: {user_id} ({email})")
 
             return {
@@ -228,15 +238,15 @@ class UserManager:
 
         params.append(user_id)
 
-        cursor = await self._connection.execute(
-            f"""
-            UPDATE users
-            SET {', '.join(updates)}
-            WHERE id = ?
-            """,
-            params,
-        )
-        await self._connection.commit()
+        async with self._storage.transaction() as connection:
+            cursor = await connection.execute(
+                f"""
+                UPDATE users
+                SET {', '.join(updates)}
+                WHERE id = ?
+                """,
+                params,
+            )
 
         if cursor.rowcount == 0:
             return None
@@ -285,26 +295,26 @@ class UserManager:
         if not self._connection:
             raise RuntimeError("UserManager not initialized")
 
-        # Count sessions first
-        cursor = await self._connection.execute(
-            "SELECT COUNT(*) FROM session_metadata WHERE user_id = ?",
-            (user_id,),
-        )
-        row = await cursor.fetchone()
-        session_count = row[0] if row else 0
+        async with self._storage.transaction() as connection:
+            # Count sessions first
+            cursor = await connection.execute(
+                "SELECT COUNT(*) FROM session_metadata WHERE user_id = ?",
+                (user_id,),
+            )
+            row = await cursor.fetchone()
+            session_count = row[0] if row else 0
 
-        # Delete sessions
-        await self._connection.execute(
-            "DELETE FROM session_metadata WHERE user_id = ?",
-            (user_id,),
-        )
+            # Delete sessions
+            await connection.execute(
+                "DELETE FROM session_metadata WHERE user_id = ?",
+                (user_id,),
+            )
 
-        # Delete user
-        cursor = await self._connection.execute(
-            "DELETE FROM users WHERE id = ?",
-            (user_id,),
-        )
-        await self._connection.commit()
+            # Delete user
+            cursor = await connection.execute(
+                "DELETE FROM users WHERE id = ?",
+                (user_id,),
+            )
 
         if cursor.rowcount == 0:
             return False, 0
@@ -0,0 +1,177 @@
+"""Demultiplexer for the API gateway's shared WebSocket connections.
+
+The gateway can carry many AG-UI sessions over a few persistent connections
+to /ws/mux. Every frame starts with a header line naming the logical stream
+and an operation:
+
+    "<stream id> open\\n"             start a session
+    "<stream id> data\\n<payload>"    an AG-UI frame, either direction
+    "<stream id> close\\n"            end a session, either direction
+
+Each stream is served by the same session loop as a plain /ws connection,
+through a StreamSocket that stands in for the WebSocket. AG-UI sessions are
+text only: a binary data frame ends its stream, like a binary frame fails a
+plain /ws session.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+log = logging.getLogger(__name__)
+
+OPEN = "open"
+DATA = "data"
+CLOSE = "close"
+
+
+def encode(stream_id: int, op: str, payload: str = "") -> str:
+    """Prefix a payload with its stream header."""
+    return f"{stream_id} {op}\n{payload}"
+
+
+def decode(frame: str | bytes) -> tuple[int, str, str | bytes]:
+    """Split a multiplexed frame into (stream id, operation, payload).
+
+    The payload of a binary frame stays bytes; only its header is decoded.
+
+    Raises:
+        ValueError: If the frame has no valid header
+    """
+    payload: str | bytes
+    if isinstance(frame, bytes):
+        raw_header, _, payload = frame.partition(b"\n")
+        header = raw_header.decode()
+    else:
+        header, _, payload = frame.partition("\n")
+    stream_id, op = header.split(" ", 1)
+    return int(stream_id), op, payload
+
+
+class StreamSocket:
+    """One logical session on a multiplexed connection.
+
+    Provides the subset of the WebSocket interface AGUIProtocolHandler uses.
+    """
+
+    def __init__(self, channel: MuxChannel, stream_id: int):
+        """Create a stream on a channel."""
+        self._channel = channel
+        self.stream_id = stream_id
+        self._inbox: asyncio.Queue[str | None] = asyncio.Queue()
+        self.closed = False
+
+    @property
+    def client(self) -> Any:
+        """Address of the gateway carrying this stream."""
+        return self._channel.websocket.client
+
+    async def receive_text(self) -> str:
+        """Receive the next frame of this stream."""
+        message = await self._inbox.get()
+        if message is None:
+            raise WebSocketDisconnect(1000)
+        return message
+
+    async def send_text(self, data: str) -> None:
+        """Send a frame on this stream."""
+        if self.closed:
+            # Same error Starlette raises, which the handler already expects
+            raise RuntimeError("Cannot call websocket.send after stream close")
+        await self._channel.send(encode(self.stream_id, DATA, data))
+
+    def feed(self, message: str | None) -> None:
+        """Deliver a frame from the gateway; None ends the stream."""
+        if message is None:
+            self.closed = True
+        self._inbox.put_nowait(message)
+
+
+class MuxChannel:
+    """Serves every stream of one multiplexed gateway connection."""
+
+    def __init__(self, websocket: WebSocket):
+        """Wrap an accepted gateway connection."""
+        self.websocket = websocket
+        self._send_lock = asyncio.Lock()
+        self._streams: dict[int, StreamSocket] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def send(self, frame: str) -> None:
+        """Send a frame, serialized with the other streams' sends."""
+        async with self._send_lock:
+            await self.websocket.send_text(frame)
+
+    async def serve(self, session: Callable[[StreamSocket], Awaitable[None]]) -> None:
+        """Route frames to streams until the gateway disconnects.
+
+        Args:
+            session: Session loop run for each opened stream
+        """
+        try:
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                frame = message.get("text") or message.get("bytes") or ""
+                try:
+                    stream_id, op, payload = decode(frame)
+                except (ValueError, UnicodeDecodeError):
+                    log.warning("Dropping malformed multiplexed frame")
+                    continue
+
+                if op == OPEN:
+                    stream = StreamSocket(self, stream_id)
+                    self._streams[stream_id] = stream
+                    task = asyncio.create_task(self._run(stream, session))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                elif (target := self._streams.get(stream_id)) is None:
+                    continue
+                elif op == DATA:
+                    if isinstance(payload, bytes):
+                        log.warning(
+                            "Ending multiplexed stream %d: binary frames are not "
+                            "supported",
+                            stream_id,
+                        )
+                        # The session ends and _run tells the gateway
+                        target.feed(None)
+                    else:
+                        target.feed(payload)
+                elif op == CLOSE:
+                    self._streams.pop(stream_id, None)
+                    target.feed(None)
+        finally:
+            # Every session sees a disconnect and cancels its own runs
+            for stream in self._streams.values():
+                stream.feed(None)
+            self._streams.clear()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(
+        self, stream: StreamSocket, session: Callable[[StreamSocket], Awaitable[None]]
+    ) -> None:
+        log.info("Multiplexed AG-UI stream %d opened", stream.stream_id)
+        try:
+            await session(stream)
+        finally:
+            log.info("Multiplexed AG-UI stream %d closed", stream.stream_id)
+            if self._streams.pop(stream.stream_id, None) is not None:
+                stream.closed = True
+                try:
+                    await self.send(encode(stream.stream_id, CLOSE))
+                except Exception:
+                    pass
+
+
+async def serve_multiplexed(
+    websocket: WebSocket, session: Callable[[StreamSocket], Awaitable[None]]
+) -> None:
+    """Serve the AG-UI sessions multiplexed on an accepted gateway connection."""
+    await MuxChannel(websocket).serve(session)
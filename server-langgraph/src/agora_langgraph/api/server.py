@@ -18,8 +18,10 @@ from agora_langgraph.adapters.audit_logger import AuditLogger
 from agora_langgraph.adapters.checkpointer import create_checkpointer
 from agora_langgraph.adapters.mcp_client import create_mcp_client_manager
 from agora_langgraph.adapters.session_metadata import SessionMetadataManager
+from agora_langgraph.adapters.storage import SQLiteStorage
 from agora_langgraph.adapters.user_manager import UserManager
 from agora_langgraph.api.ag_ui_handler import AGUIProtocolHandler
+from agora_langgraph.api.mux import StreamSocket, serve_multiplexed
 from agora_langgraph.common.ag_ui_types import (
     RunAgentInput,
     ToolApprovalResponsePayload,
@@ -53,19 +55,29 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         mcp_tools_by_server = mcp_manager.get_tools_by_server()
         log.info("Loaded MCP tools from %d servers", len(mcp_tools_by_server))
 
-        graph = build_agent_graph(mcp_tools_by_server)
+        graph = build_agent_graph(
+            mcp_tools_by_server,
+            stream_agent_answer=settings.stream_agent_answer,
+            context_token_budget=settings.context_token_budget,
+            context_keep_turns=settings.context_keep_turns,
+            compact_tool_results=settings.compact_tool_results,
+        )
+
+        # One connection to sessions.db, shared by all three components
+        storage = SQLiteStorage(settings.sessions_db_path)
+        await storage.initialize()
 
-        async with create_checkpointer(settings.sessions_db_path) as checkpointer:
+        async with create_checkpointer(storage) as checkpointer:
             compiled_graph = graph.compile(checkpointer=checkpointer)
             log.info("LangGraph compiled with checkpointer")
 
             moderator = ModerationPipeline(enabled=settings.guardrails_enabled)
             audit_logger = AuditLogger(otel_endpoint=settings.otel_endpoint)
 
-            session_metadata = SessionMetadataManager(db_path=settings.sessions_db_path)
+            session_metadata = SessionMetadataManager(storage=storage)
             await session_metadata.initialize()
 
-            user_manager = UserManager(db_path=settings.sessions_db_path)
+            user_manager = UserManager(storage=storage)
             await user_manager.initialize()
 
             # Set UserManager for settings tool
@@ -77,6 +89,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
                 audit_logger=audit_logger,
                 session_metadata=session_metadata,
                 user_manager=user_manager,
+                stream_agent_answer=settings.stream_agent_answer,
             )
 
             app.state.orchestrator = orchestrator
@@ -90,6 +103,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             await session_metadata.close()
             await user_manager.close()
 
+        await storage.close()
+
     log.info("Shutting down AGORA LangGraph Server")
 
 
@@ -124,6 +139,7 @@ async def root() -> dict[str, str]:
         "protocol": "AG-UI",
         "docs": "/docs",
         "websocket": "/ws",
+        "websocket_multiplexed": "/ws/mux",
     }
 
 
@@ -521,7 +537,18 @@ async def delete_user(user_id: str) -> dict[str, Any]:
 async def websocket_endpoint(websocket: WebSocket) -> None:
     """WebSocket endpoint for AG-UI protocol."""
     await websocket.accept()
+    await serve_agui_session(websocket)
+
+
+@app.websocket("/ws/mux")
+async def websocket_mux_endpoint(websocket: WebSocket) -> None:
+    """Multiplexed AG-UI sessions from the API gateway (see api/mux.py)."""
+    await websocket.accept()
+    await serve_multiplexed(websocket, serve_agui_session)
+
 
+async def serve_agui_session(websocket: WebSocket | StreamSocket) -> None:
+    """Run the AG-UI session loop on an accepted WebSocket (or mux stream)."""
     handler = AGUIProtocolHandler(websocket)
     orchestrator: Orchestrator = app.state.orchestrator
 
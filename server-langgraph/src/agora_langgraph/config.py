@@ -39,6 +39,32 @@ class Settings(BaseSettings):
         description="API key for spoken model (defaults to openai_api_key if not set)",
     )
 
+    stream_agent_answer: bool = Field(
+        default=False,
+        description=(
+            "Stream the agent's final answer as the written text instead of "
+            "regenerating it in generate_written (one LLM call less per turn)"
+        ),
+    )
+
+    context_token_budget: int = Field(
+        default=24000,
+        description=(
+            "Estimated tokens of conversation context above which older turns "
+            "are summarized before the agent runs (0 disables compaction)"
+        ),
+    )
+    context_keep_turns: int = Field(
+        default=4, description="Recent turns always sent to the LLM verbatim"
+    )
+    compact_tool_results: bool = Field(
+        default=True,
+        description=(
+            "Compact MCP tool results (drop weak search hits, trim content, "
+            "reference repeated chunks) before they enter the LLM context"
+        ),
+    )
+
     mcp_servers: str = Field(
         default="",
         description=(
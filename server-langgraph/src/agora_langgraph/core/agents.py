@@ -10,6 +10,7 @@ from langchain_openai import ChatOpenAI
 
 from agora_langgraph.config import get_settings
 from agora_langgraph.core.agent_definitions import get_agent_by_id
+from agora_langgraph.core.context import get_context_messages, with_context_summary
 from agora_langgraph.core.state import AgentState
 from agora_langgraph.core.tools import AGENT_MCP_MAPPING
 
@@ -185,8 +186,11 @@ async def _run_agent_node(
 
         instructions = f"{instructions}\n\n" + "\n".join(context_parts)
 
+    # Older turns are replaced by their summary once compact_context ran
+    instructions = with_context_summary(instructions, state)
+
     system_message = {"role": "system", "content": instructions}
-    messages_with_system = [system_message] + list(state["messages"])
+    messages_with_system = [system_message] + get_context_messages(state)
 
     try:
         response = await llm_with_tools.ainvoke(messages_with_system)
@@ -0,0 +1,99 @@
+"""Conversation context sent to the LLM.
+
+AgentState.messages keeps the whole conversation (it is also the session
+history shown in the UI). Once compact_context has summarized older turns,
+the LLM only gets the summary plus the messages after the last summarized
+one. Token counts are estimates (about 4 characters per token), which is
+precise enough for a budget and needs no tokenizer download.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+CHARS_PER_TOKEN = 4
+# Role and separator tokens each chat message costs on top of its content
+MESSAGE_OVERHEAD_TOKENS = 4
+# Characters of a tool result kept in the transcript that gets summarized
+ELIDED_TOOL_OUTPUT_CHARS = 200
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def message_tokens(message: BaseMessage) -> int:
+    """Estimate the tokens a message costs in an LLM prompt."""
+    tokens = MESSAGE_OVERHEAD_TOKENS + estimate_tokens(str(message.content))
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += estimate_tokens(tool_call.get("name", ""))
+        tokens += estimate_tokens(json.dumps(tool_call.get("args", {})))
+    return tokens
+
+
+def get_context_messages(state: Any) -> list[BaseMessage]:
+    """Messages the LLM sees: those after the last summarized message."""
+    messages = list(state.get("messages", []))
+    summarized_until = state.get("context_summary_until")
+    if summarized_until:
+        for index, message in enumerate(messages):
+            if message.id == summarized_until:
+                return messages[index + 1 :]
+    return messages
+
+
+def with_context_summary(instructions: str, state: Any) -> str:
+    """Add the summary of earlier turns (if any) to a system prompt."""
+    summary = state.get("context_summary", "")
+    if not summary:
+        return instructions
+    return (
+        f"{instructions}\n\n"
+        f"SUMMARY OF THE CONVERSATION SO FAR (older messages are not shown):\n"
+        f"{summary}"
+    )
+
+
+def split_turns(messages: list[BaseMessage]) -> list[list[BaseMessage]]:
+    """Split messages into turns, each starting at a user message."""
+    turns: list[list[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def render_transcript(messages: list[BaseMessage]) -> str:
+    """Render messages as plain text for summarization.
+
+    Tool results are cut to their first ELIDED_TOOL_OUTPUT_CHARS characters;
+    the agent's answers already contain what mattered in them.
+    """
+    lines = []
+    for message in messages:
+        content = str(message.content)
+        if isinstance(message, HumanMessage):
+            lines.append(f"Inspector: {content}")
+        elif isinstance(message, ToolMessage):
+            if len(content) > ELIDED_TOOL_OUTPUT_CHARS:
+                elided = len(content) - ELIDED_TOOL_OUTPUT_CHARS
+                content = (
+                    f"{content[:ELIDED_TOOL_OUTPUT_CHARS]}... "
+                    f"[{elided} characters elided]"
+                )
+            lines.append(f"Tool result ({message.name}): {content}")
+        elif isinstance(message, AIMessage):
+            agent_id = message.additional_kwargs.get("agent_id", "assistant")
+            if content:
+                lines.append(f"Assistant ({agent_id}): {content}")
+            for tool_call in message.tool_calls:
+                lines.append(
+                    f"Tool call ({agent_id}): {tool_call['name']}"
+                    f"({json.dumps(tool_call.get('args', {}), ensure_ascii=False)})"
+                )
+    return "\n".join(lines)
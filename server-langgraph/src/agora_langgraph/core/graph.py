@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import re
 import time
+from functools import partial
 from typing import Any, Literal
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
@@ -23,11 +24,37 @@ from agora_langgraph.core.agents import (
     reporting_agent,
     set_agent_tools,
 )
+from agora_langgraph.core.context import (
+    estimate_tokens,
+    get_context_messages,
+    message_tokens,
+    render_transcript,
+    split_turns,
+    with_context_summary,
+)
 from agora_langgraph.core.state import AgentState, GeneratorState
+from agora_langgraph.core.tool_results import compact_tool_result
 from agora_langgraph.core.tools import get_tools_for_agent
 
 log = logging.getLogger(__name__)
 
+# Between the texts of consecutive agent LLM runs in a streamed answer
+ANSWER_SEPARATOR = "\n\n"
+
+CONTEXT_SUMMARY_PROMPT = (
+    "You summarize an NVWA inspection conversation between an inspector and "
+    "the AGORA assistant, so the assistant can continue without the full "
+    "history.\n\n"
+    "- Write the summary in Dutch (Nederlands)\n"
+    "- Keep every fact the rest of the inspection may need: company name, KVK "
+    "number, location, findings, violations, regulations cited, decisions, "
+    "open questions and the state of the report\n"
+    "- Leave out greetings, small talk and how tools were called\n"
+    "- If a previous summary is given, merge it with the new messages into "
+    "one summary\n"
+    "- Answer with the summary only"
+)
+
 
 VALID_AGENTS = {
     "general-agent",
@@ -168,6 +195,70 @@ def wake_word_handler_node(state: AgentState) -> dict[str, Any]:
     return result
 
 
+async def compact_context_node(
+    state: AgentState, token_budget: int, keep_turns: int
+) -> dict[str, Any]:
+    """Summarize older turns once the context exceeds the token budget.
+
+    Runs at the start of a feedback-mode turn, before the first agent. When
+    the estimated tokens of the context (summary plus unsummarized messages)
+    exceed token_budget, all but the last keep_turns turns are folded into
+    context_summary (build_agent_graph binds both arguments). Tool results in
+    those turns are elided before summarizing. The messages stay in state for
+    the session history; agents and generators only see the messages after
+    context_summary_until.
+    """
+    messages = get_context_messages(state)
+    summary = state.get("context_summary", "")
+    tokens = estimate_tokens(summary) + sum(message_tokens(m) for m in messages)
+
+    if tokens <= token_budget:
+        return {}
+
+    turns = split_turns(messages)
+    if len(turns) <= keep_turns:
+        log.info(
+            f"compact_context: {tokens} tokens over budget, but only "
+            f"{len(turns)} turns to keep"
+        )
+        return {}
+
+    older = [m for turn in turns[:-keep_turns] for m in turn]
+    if not older[-1].id:
+        log.warning("compact_context: Messages have no ids, cannot compact")
+        return {}
+
+    transcript = render_transcript(older)
+    if summary:
+        transcript = f"Previous summary:\n{summary}\n\nNew messages:\n{transcript}"
+
+    start_time = time.time()
+    try:
+        llm = get_llm_for_agent("general-agent")
+        response = await llm.ainvoke(
+            [
+                SystemMessage(content=CONTEXT_SUMMARY_PROMPT),
+                HumanMessage(content=transcript),
+            ]
+        )
+    except Exception as e:
+        log.error(f"compact_context: Summarization failed, keeping full context: {e}")
+        return {}
+
+    new_summary = str(response.content)
+    kept = messages[len(older) :]
+    compacted = estimate_tokens(new_summary) + sum(message_tokens(m) for m in kept)
+    log.info(
+        f"compact_context: {tokens} -> {compacted} tokens, summarized "
+        f"{len(older)} messages in {time.time() - start_time:.2f}s"
+    )
+
+    return {
+        "context_summary": new_summary,
+        "context_summary_until": older[-1].id,
+    }
+
+
 def route_from_start(state: AgentState) -> str:
     """Route from START based on interaction mode and wake word.
 
@@ -244,6 +335,7 @@ def is_handoff_tool(tool_name: str) -> bool:
 
 def route_from_agent(
     state: AgentState,
+    stream_agent_answer: bool = False,
 ) -> Literal["tools"] | list[Send]:
     """Route from any agent based on the last message.
 
@@ -256,6 +348,7 @@ def route_from_agent(
 
     Args:
         state: Current graph state
+        stream_agent_answer: Passed on to _create_parallel_sends
 
     Returns:
         "tools" or list of Send commands for parallel generation
@@ -268,17 +361,17 @@ def route_from_agent(
     )
 
     if not messages:
-        return _create_parallel_sends(state)
+        return _create_parallel_sends(state, stream_agent_answer)
 
     last_message = messages[-1]
 
     if not isinstance(last_message, AIMessage):
-        return _create_parallel_sends(state)
+        return _create_parallel_sends(state, stream_agent_answer)
 
     tool_calls = getattr(last_message, "tool_calls", None)
     if not tool_calls:
         log.info("route_from_agent: No tool calls, forking to parallel generation")
-        return _create_parallel_sends(state)
+        return _create_parallel_sends(state, stream_agent_answer)
 
     tool_name = tool_calls[0].get("name", "")
     log.info(f"route_from_agent: Tool call '{tool_name}' → routing to ToolNode first")
@@ -314,7 +407,29 @@ def route_after_tools(state: AgentState) -> str:
     return current
 
 
-def _create_parallel_sends(state: AgentState) -> list[Send]:
+def _turn_agent_texts(messages: list[BaseMessage]) -> list[AIMessage]:
+    """Agent messages with text since the latest user message."""
+    texts: list[AIMessage] = []
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        if isinstance(message, AIMessage) and message.content:
+            texts.append(message)
+    return texts[::-1]
+
+
+def _agent_answer(messages: list[BaseMessage]) -> str:
+    """Text the agents wrote this turn, as streamed with stream_agent_answer.
+
+    Includes text written before a tool call; runs are separated like the
+    orchestrator separates them in the written channel.
+    """
+    return ANSWER_SEPARATOR.join(str(m.content) for m in _turn_agent_texts(messages))
+
+
+def _create_parallel_sends(
+    state: AgentState, stream_agent_answer: bool = False
+) -> list[Send]:
     """Create Send commands for parallel spoken and written generation.
 
     This is used by route_from_agent to dispatch parallel generator instances with:
@@ -322,10 +437,19 @@ def _create_parallel_sends(state: AgentState) -> list[Send]:
     - Different system prompts (written vs spoken)
 
     The agent's final response (if any) is filtered out since we regenerate
-    it with separate written/spoken prompts.
+    it with separate written/spoken prompts. With stream_agent_answer the
+    written generator uses the agents' text of this turn as-is instead (see
+    _agent_answer), since the orchestrator already streamed it to the written
+    channel.
+
+    generate_spoken is only dispatched when the user's spoken_text_type (in
+    state metadata) is "summarize"; in "dictate" mode the orchestrator speaks
+    the written text, so a spoken generation would be discarded.
 
     Args:
         state: Current agent state after tool execution
+        stream_agent_answer: Pass the agent's final response to
+            generate_written instead of regenerating it
 
     Returns:
         List of Send commands for parallel generator dispatch
@@ -336,23 +460,28 @@ def _create_parallel_sends(state: AgentState) -> list[Send]:
     agent_config = get_agent_by_id(agent_id)
     written_prompt = agent_config["instructions"] if agent_config else ""
     spoken_prompt = get_spoken_prompt(agent_id) or ""
+    written_prompt = with_context_summary(written_prompt, state)
+    spoken_prompt = with_context_summary(spoken_prompt, state)
 
     # Filter out system messages - we'll add our own per-stream
-    raw_messages = state.get("messages", [])
+    raw_messages = get_context_messages(state)
     messages: list[BaseMessage] = [
         m for m in raw_messages if not isinstance(m, SystemMessage)
     ]
 
     # Filter out the last AI message if it has no tool calls
     # This is the "wasted" response from the agent that we're regenerating
+    answer: str | None = None
     if messages and isinstance(messages[-1], AIMessage):
         last_msg = messages[-1]
         if not getattr(last_msg, "tool_calls", None):
             log.info("_create_parallel_sends: Filtering out agent's final response")
             messages = messages[:-1]
+            if stream_agent_answer:
+                answer = _agent_answer(raw_messages)
 
     log.info(
-        f"_create_parallel_sends: Dispatching parallel streams for {agent_id} "
+        f"_create_parallel_sends: Dispatching streams for {agent_id} "
         f"with {len(messages)} messages"
     )
 
@@ -360,8 +489,10 @@ def _create_parallel_sends(state: AgentState) -> list[Send]:
     session_id = state.get("session_id", "")
     metadata = state.get("metadata", {})
 
+    spoken_mode = metadata.get("spoken_text_type", "summarize")
+
     # Dispatch to separate nodes for easy identification in astream_events
-    return [
+    sends = [
         Send(
             "generate_written",
             GeneratorState(
@@ -371,6 +502,7 @@ def _create_parallel_sends(state: AgentState) -> list[Send]:
                 agent_id=agent_id,
                 session_id=session_id,
                 metadata=metadata,
+                answer=answer,
             ),
         ),
         Send(
@@ -382,9 +514,14 @@ def _create_parallel_sends(state: AgentState) -> list[Send]:
                 agent_id=agent_id,
                 session_id=session_id,
                 metadata=metadata,
+                answer=None,
             ),
         ),
     ]
+    if spoken_mode == "dictate":
+        log.info("_create_parallel_sends: Dictate mode, skipping generate_spoken")
+        sends = sends[:1]
+    return sends
 
 
 async def _generate_stream(
@@ -449,7 +586,12 @@ async def generate_written_node(state: GeneratorState) -> dict[str, list[str]]:
 
     This node is easily identifiable in astream_events by name,
     allowing the orchestrator to route chunks to the written channel.
+    Without an LLM call when the agent's answer is passed through.
     """
+    answer = state.get("answer")
+    if answer is not None:
+        log.info(f"generate_written: Using agent's answer ({len(answer)} chars)")
+        return {"written": [answer]}
     return await _generate_stream(state, "written")
 
 
@@ -469,8 +611,9 @@ def merge_parallel_outputs(state: AgentState) -> dict[str, Any]:
     and produces final merged output. Also adds written response
     as AIMessage to conversation history.
 
-    Note: The written/spoken lists use operator.add reducer and accumulate
-    across turns. We only use the LAST item (current turn's generation).
+    Note: The written/spoken lists use operator.add reducer. They are cleared
+    here once read, so they never carry earlier turns into the checkpoint.
+    Only generate_written runs in dictate mode; see _create_parallel_sends.
 
     Args:
         state: State with accumulated written/spoken lists
@@ -482,10 +625,30 @@ def merge_parallel_outputs(state: AgentState) -> dict[str, Any]:
     spoken_parts = state.get("spoken", [])
 
     # Only use the last item from each list (current turn's generation)
-    # The lists accumulate across turns due to operator.add reducer
     written_content = written_parts[-1] if written_parts else ""
     spoken_content = spoken_parts[-1] if spoken_parts else ""
 
+    # In dictate mode generate_spoken did not run; the spoken text is the
+    # written text
+    metadata = state.get("metadata", {})
+    if metadata.get("spoken_text_type") == "dictate":
+        spoken_content = written_content
+
+    # If the agents' text was used as the written output, update the final
+    # answer in place (same id) instead of adding a duplicate. Text written
+    # before a tool call is part of that answer now, so it is cleared from
+    # the tool-calling messages: history and context show it once.
+    answer_message: AIMessage | None = None
+    earlier_texts: list[AIMessage] = []
+    messages = state.get("messages", [])
+    if messages and isinstance(messages[-1], AIMessage):
+        last_msg = messages[-1]
+        if not last_msg.tool_calls and _agent_answer(messages) == written_content:
+            answer_message = last_msg
+            earlier_texts = [
+                m for m in _turn_agent_texts(messages) if m is not last_msg
+            ]
+
     log.info(
         f"merge_parallel_outputs: written={len(written_content)} chars, "
         f"spoken={len(spoken_content)} chars"
@@ -502,30 +665,50 @@ def merge_parallel_outputs(state: AgentState) -> dict[str, Any]:
     print(spoken_content)
     print("=" * 80 + "\n")
 
+    additional_kwargs = {"spoken_text": spoken_content} if spoken_content else {}
+    if answer_message:
+        message = AIMessage(
+            id=answer_message.id,
+            content=written_content,
+            additional_kwargs={**answer_message.additional_kwargs, **additional_kwargs},
+        )
+    else:
+        message = AIMessage(content=written_content, additional_kwargs=additional_kwargs)
+
+    cleared = [m.model_copy(update={"content": ""}) for m in earlier_texts]
+
     return {
-        "messages": [
-            AIMessage(
-                content=written_content,
-                additional_kwargs={"spoken_text": spoken_content} if spoken_content else {},
-            )
-        ],
+        "messages": [*cleared, message],
         "final_written": written_content,
         "final_spoken": spoken_content,
+        # Clear accumulators using Overwrite to bypass reducer
+        "written": Overwrite([]),
+        "spoken": Overwrite([]),
     }
 
 
 def build_agent_graph(
     mcp_tools_by_server: dict[str, list[Any]] | None = None,
+    stream_agent_answer: bool = False,
+    context_token_budget: int = 0,
+    context_keep_turns: int = 4,
+    compact_tool_results: bool = True,
 ) -> StateGraph[AgentState]:
     """Build the multi-agent StateGraph.
 
     Args:
         mcp_tools_by_server: Optional pre-discovered MCP tools
+        stream_agent_answer: Use the agent's final answer as the written
+            output instead of regenerating it
+        context_token_budget: Estimated tokens of conversation context above
+            which older turns are summarized (0 disables compaction)
+        context_keep_turns: Recent turns never summarized
+        compact_tool_results: Compact tool results before they are added to
+            the conversation (see core/tool_results.py)
 
     Returns:
         Configured StateGraph (not compiled)
     """
-
     if mcp_tools_by_server is None:
         mcp_tools_by_server = {}
 
@@ -556,6 +739,20 @@ def build_agent_graph(
     graph.add_node("process_buffer", process_buffer_node)
     graph.add_node("wake_word_handler", wake_word_handler_node)
 
+    # Context compaction runs before the first agent of a feedback-mode turn
+    entry_agent = "general-agent"
+    if context_token_budget > 0:
+        graph.add_node(
+            "compact_context",
+            partial(
+                compact_context_node,
+                token_budget=context_token_budget,
+                keep_turns=max(1, context_keep_turns),
+            ),
+        )
+        graph.add_edge("compact_context", "general-agent")
+        entry_agent = "compact_context"
+
     # Agent nodes
     graph.add_node("general-agent", general_agent)
     graph.add_node("regulation-agent", regulation_agent)
@@ -564,7 +761,10 @@ def build_agent_graph(
 
     # Tool node
     if unique_tools:
-        tool_node = ToolNode(unique_tools)
+        tool_node = ToolNode(
+            unique_tools,
+            awrap_tool_call=compact_tool_result if compact_tool_results else None,
+        )
         graph.add_node("tools", tool_node)
 
     # Parallel generation nodes (fork happens via Send in route_from_agent)
@@ -581,7 +781,7 @@ def build_agent_graph(
             "buffer_message": "buffer_message",
             "process_buffer": "process_buffer",
             "wake_word_handler": "wake_word_handler",
-            "general-agent": "general-agent",
+            "general-agent": entry_agent,
             "regulation-agent": "regulation-agent",
             "reporting-agent": "reporting-agent",
             "history-agent": "history-agent",
@@ -589,6 +789,7 @@ def build_agent_graph(
     )
 
     # Agent routing - routes to tools or directly dispatches parallel generation via Send
+    route_agent = partial(route_from_agent, stream_agent_answer=stream_agent_answer)
     for agent_id in [
         "general-agent",
         "regulation-agent",
@@ -600,14 +801,14 @@ def build_agent_graph(
             # When returning list[Send], the Send objects specify targets directly
             graph.add_conditional_edges(
                 agent_id,
-                route_from_agent,
+                route_agent,
                 ["tools", "generate_written", "generate_spoken"],
             )
         else:
             # No tools - use conditional edges for Send-based fan-out
             graph.add_conditional_edges(
                 agent_id,
-                route_from_agent,
+                route_agent,
                 ["generate_written", "generate_spoken"],
             )
 
@@ -629,7 +830,7 @@ def build_agent_graph(
     graph.add_edge("buffer_message", END)
 
     # Process buffer then continues to general-agent
-    graph.add_edge("process_buffer", "general-agent")
+    graph.add_edge("process_buffer", entry_agent)
 
     # Wake word handler routes to general-agent if content, otherwise END
     def route_after_wake(state: AgentState) -> str:
@@ -645,7 +846,7 @@ def build_agent_graph(
         "wake_word_handler",
         route_after_wake,
         {
-            "general-agent": "general-agent",
+            "general-agent": entry_agent,
             END: END,
         },
     )
@@ -35,7 +35,8 @@ class AgentState(TypedDict):
     current_agent: str
     pending_approval: dict[str, Any] | None
     metadata: dict[str, Any]
-    # Parallel output accumulators - use operator.add to concatenate results from branches
+    # Parallel output accumulators - use operator.add to concatenate results from branches.
+    # Only hold the current turn: merge_parallel_outputs clears them (via Overwrite)
     written: Annotated[list[str], operator.add]
     spoken: Annotated[list[str], operator.add]
     # Final merged outputs
@@ -45,6 +46,10 @@ class AgentState(TypedDict):
     interaction_mode: str  # "feedback" | "listen"
     message_buffer: Annotated[list[dict[str, Any]], accumulate_messages]
     buffer_context: str  # Processed summary from buffered messages
+    # Context compaction: summary of older turns, and the id of the last
+    # message it covers (the LLM only sees the messages after it)
+    context_summary: str
+    context_summary_until: str | None
 
 
 class GeneratorState(TypedDict):
@@ -60,3 +65,5 @@ class GeneratorState(TypedDict):
     agent_id: str
     session_id: str
     metadata: dict[str, Any]
+    # Agent's final answer to use as-is instead of generating (written only)
+    answer: str | None
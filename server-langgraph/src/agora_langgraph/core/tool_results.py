@@ -0,0 +1,191 @@
+"""Compaction of tool results before they enter the LLM context.
+
+A ToolMessage stays in AgentState.messages and is sent again on every later
+LLM call of the session, so large MCP payloads are compacted first, per tool:
+
+- search_regulations: results scoring far below the best one are dropped,
+  document summaries are sent once, content is trimmed to the tool's token
+  budget, repeated chunks are sent once, and chunks already in the
+  conversation become short references
+- any other tool: text over its token budget is cut off
+
+Compaction runs inside the ToolNode (awrap_tool_call), after the tool itself
+finished, so the on_tool_end event - and the TOOL_CALL_RESULT the frontend
+gets from it - still carries the full payload.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from langchain_core.messages import BaseMessage, ToolMessage
+from langgraph.prebuilt.tool_node import ToolCallRequest
+from langgraph.types import Command
+
+from agora_langgraph.core.context import (
+    CHARS_PER_TOKEN,
+    estimate_tokens,
+    get_context_messages,
+)
+
+log = logging.getLogger(__name__)
+
+# Token budget of a compacted result, per tool
+TOOL_RESULT_TOKEN_BUDGETS: dict[str, int] = {
+    "search_regulations": 1500,
+    "get_regulation_context": 1500,
+    "lookup_regulation_articles": 1500,
+    "get_inspection_history": 1500,
+}
+DEFAULT_TOOL_RESULT_TOKEN_BUDGET = 3000
+
+# search_regulations results scoring below this fraction of the best result
+MIN_RELATIVE_SCORE = 0.5
+# Characters of content kept per search result, whatever the budget
+MIN_RESULT_CONTENT_CHARS = 300
+
+REF_PATTERN = re.compile(r'"ref": "([0-9a-f]{10})"')
+
+ToolResultCompactor = Callable[[Any, int, list[BaseMessage]], Any]
+
+
+def chunk_ref(content: str) -> str:
+    """Short stable reference of a search result's content."""
+    return hashlib.sha1(content.encode()).hexdigest()[:10]
+
+
+def _trim(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [{len(text) - max_chars} characters elided]"
+
+
+def _tool_message_text(message: ToolMessage) -> str:
+    if isinstance(message.content, str):
+        return message.content
+    return "".join(
+        block.get("text", "") if isinstance(block, dict) else str(block)
+        for block in message.content
+    )
+
+
+def compact_search_regulations(
+    payload: Any, budget: int, messages: list[BaseMessage]
+) -> Any:
+    """Compact a search_regulations result (see module docstring)."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("results"), list):
+        return payload
+
+    seen_refs: set[str] = set()
+    seen_text = ""
+    for message in messages:
+        if isinstance(message, ToolMessage):
+            text = _tool_message_text(message)
+            seen_refs.update(REF_PATTERN.findall(text))
+            seen_text += text
+
+    results = [r for r in payload["results"] if isinstance(r, dict)]
+    scores = [r["score"] for r in results if isinstance(r.get("score"), int | float)]
+    if scores:
+        threshold = max(scores) * MIN_RELATIVE_SCORE
+        results = [
+            r
+            for r in results
+            if not isinstance(r.get("score"), int | float) or r["score"] >= threshold
+        ]
+
+    new_refs = {chunk_ref(r.get("content", "")) for r in results} - seen_refs
+    content_chars = (
+        max(MIN_RESULT_CONTENT_CHARS, budget * CHARS_PER_TOKEN // len(new_refs))
+        if new_refs
+        else 0
+    )
+
+    compacted: list[dict[str, Any]] = []
+    summaries: set[str] = set()
+    refs: set[str] = set()
+    for result in results:
+        content = result.get("content", "")
+        ref = chunk_ref(content)
+        if ref in refs:
+            continue
+        refs.add(ref)
+        if ref in seen_refs:
+            compacted.append(
+                {
+                    "ref": ref,
+                    "citation": result.get("citation", ""),
+                    "score": result.get("score"),
+                    "content": "[already in conversation]",
+                }
+            )
+            continue
+
+        item = {k: v for k, v in result.items() if k != "document_summary" and v != ""}
+        item["ref"] = ref
+        item["content"] = _trim(content, content_chars)
+        summary = result.get("document_summary", "")
+        if summary and summary not in summaries and summary not in seen_text:
+            item["document_summary"] = summary
+        summaries.add(summary)
+        compacted.append(item)
+
+    return {**payload, "returned": len(compacted), "results": compacted}
+
+
+TOOL_RESULT_COMPACTORS: dict[str, ToolResultCompactor] = {
+    "search_regulations": compact_search_regulations,
+}
+
+
+def compact_tool_message(
+    message: ToolMessage, messages: list[BaseMessage]
+) -> ToolMessage:
+    """Compact one tool result, given the conversation it is added to."""
+    name = message.name or ""
+    budget = TOOL_RESULT_TOKEN_BUDGETS.get(name, DEFAULT_TOOL_RESULT_TOKEN_BUDGET)
+    text = _tool_message_text(message)
+
+    payload = None
+    compactor = TOOL_RESULT_COMPACTORS.get(name)
+    if compactor is not None:
+        try:
+            payload = json.loads(text)
+        except ValueError:
+            log.warning(f"{name} result is not JSON, trimming it as text")
+
+    if compactor is not None and payload is not None:
+        compacted = json.dumps(compactor(payload, budget, messages), ensure_ascii=False)
+    else:
+        compacted = _trim(text, budget * CHARS_PER_TOKEN)
+
+    if compacted == text:
+        return message
+
+    log.info(
+        f"Compacted {name} result: {estimate_tokens(text)} -> "
+        f"{estimate_tokens(compacted)} tokens"
+    )
+    return message.model_copy(update={"content": compacted})
+
+
+async def compact_tool_result(
+    request: ToolCallRequest,
+    execute: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command[Any]]],
+) -> ToolMessage | Command[Any]:
+    """ToolNode wrapper compacting each tool result (see module docstring).
+
+    Only messages the LLM still sees count as already in the conversation;
+    turns folded into the context summary are not.
+    """
+    result = await execute(request)
+    if not isinstance(result, ToolMessage) or result.status == "error":
+        return result
+    state = request.state
+    messages = get_context_messages(state) if isinstance(state, dict) else []
+    return compact_tool_message(result, messages)
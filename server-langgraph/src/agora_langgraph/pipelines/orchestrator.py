@@ -5,13 +5,15 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
 import uuid
-from typing import Any
+from collections.abc import Awaitable, Coroutine
+from typing import Any, TypeVar
 
 from ag_ui.core import Message as AGUIMessage
 from langchain_core.messages import AIMessage, HumanMessage
 from langgraph.graph.state import CompiledStateGraph
-from langgraph.types import Command
+from langgraph.types import Command, StateSnapshot
 
 from agora_langgraph.adapters.audit_logger import AuditLogger
 from agora_langgraph.adapters.session_metadata import SessionMetadataManager
@@ -23,11 +25,14 @@ from agora_langgraph.common.ag_ui_types import (
 from agora_langgraph.common.schemas import ToolCall
 from agora_langgraph.config import get_settings
 from agora_langgraph.core.approval_logic import requires_human_approval
+from agora_langgraph.core.graph import ANSWER_SEPARATOR
 from agora_langgraph.core.tool_display_names import get_tool_display_name
 from agora_langgraph.pipelines.moderator import ModerationPipeline
 
 log = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def _sanitize_params(params: dict[str, Any]) -> dict[str, Any]:
     """Sanitize tool parameters by removing non-JSON-serializable values.
@@ -45,6 +50,15 @@ def _sanitize_params(params: dict[str, Any]) -> dict[str, Any]:
     return sanitized
 
 
+async def _timed(timings: dict[str, float], step: str, awaitable: Awaitable[T]) -> T:
+    """Await a step and record how long it took in milliseconds."""
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[step] = (time.perf_counter() - started) * 1000
+
+
 class Orchestrator:
     """Orchestration using LangGraph with AG-UI Protocol streaming and approval flow."""
 
@@ -55,14 +69,22 @@ class Orchestrator:
         audit_logger: AuditLogger,
         session_metadata: SessionMetadataManager | None = None,
         user_manager: UserManager | None = None,
+        stream_agent_answer: bool = False,
     ):
-        """Initialize orchestrator."""
+        """Initialize orchestrator.
+
+        With stream_agent_answer, the agent's final answer is streamed to the
+        written channel as it is generated (the graph must be built with the
+        same flag, so generate_written does not generate it again).
+        """
         self.graph = graph
         self.moderator = moderator
         self.audit = audit_logger
         self.session_metadata = session_metadata
         self.user_manager = user_manager
+        self.stream_agent_answer = stream_agent_answer
         self.pending_approvals: dict[str, asyncio.Future[bool]] = {}
+        self._background_tasks: set[asyncio.Task[None]] = set()
 
     async def _handle_tool_approval_flow(
         self,
@@ -120,6 +142,85 @@ class Orchestrator:
         log.warning(f"Received approval for unknown ID: {approval_id}")
         return False
 
+    def _start_background_task(self, coro: Coroutine[Any, Any, None]) -> None:
+        """Run a coroutine off the critical path, keeping a reference until done."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _generate_session_title(
+        self,
+        thread_id: str,
+        first_message: str,
+        protocol_handler: Any | None,
+    ) -> None:
+        """Generate an LLM title for a new session and push it to the client."""
+        if not self.session_metadata:
+            return
+
+        try:
+            settings = get_settings()
+            api_key = settings.openai_api_key.get_secret_value()
+            if not api_key:
+                return
+            title = await self.session_metadata.generate_title(
+                thread_id, first_message, api_key, base_url=settings.openai_base_url
+            )
+        except Exception as e:
+            log.warning(f"Failed to generate session title: {e}")
+            return
+
+        if title and protocol_handler and protocol_handler.is_connected:
+            await protocol_handler.send_session_title(thread_id, title)
+
+    async def _upsert_session_metadata(
+        self, thread_id: str, user_id: str, user_content: str
+    ) -> bool:
+        """Create or update session metadata, returning True for a new session."""
+        if not self.session_metadata:
+            return False
+        try:
+            log.info(
+                f"Creating/updating session metadata: session_id={thread_id}, user_id={user_id}"
+            )
+            is_new_session = await self.session_metadata.create_or_update_metadata(
+                session_id=thread_id,
+                user_id=user_id,
+                first_message=user_content,
+            )
+            log.info(f"Session metadata created/updated successfully for {thread_id}")
+            return is_new_session
+        except Exception as e:
+            log.warning(f"Failed to update session metadata: {e}")
+            return False
+
+    async def _fetch_user(self, user_id: str) -> dict[str, Any] | None:
+        """Fetch the user record once per turn for metadata and preferences."""
+        if not self.user_manager:
+            return None
+        try:
+            return await self.user_manager.get_user(user_id)
+        except Exception as e:
+            log.warning(f"Failed to fetch user info: {e}")
+            return None
+
+    async def _fetch_thread_state(self, config: dict[str, Any]) -> StateSnapshot | None:
+        """Read the persisted state of a thread."""
+        try:
+            return await self.graph.aget_state(config)  # type: ignore[arg-type]
+        except Exception as e:
+            log.warning(f"Failed to read persisted state: {e}")
+            return None
+
+    async def _finish_turn(self, thread_id: str, completed: bool) -> None:
+        """Write the per-turn session metadata updates."""
+        if not self.session_metadata:
+            return
+        try:
+            await self.session_metadata.finish_turn(thread_id, completed=completed)
+        except Exception as e:
+            log.warning(f"Failed to update session metadata: {e}")
+
     async def process_message(
         self,
         agent_input: RunAgentInput,
@@ -147,40 +248,44 @@ class Orchestrator:
 
         # Get user_id from top-level field
         user_id = agent_input.user_id
+        config = {"configurable": {"thread_id": thread_id}}
 
-        # Create or update session metadata
-        if self.session_metadata:
-            try:
-                settings = get_settings()
-                log.info(
-                    f"Creating/updating session metadata: session_id={thread_id}, user_id={user_id}"
-                )
-                await self.session_metadata.create_or_update_metadata(
-                    session_id=thread_id,
-                    user_id=user_id,
-                    first_message=user_content,
-                    api_key=settings.openai_api_key.get_secret_value(),
-                    base_url=settings.openai_base_url,
-                )
-                log.info(
-                    f"Session metadata created/updated successfully for {thread_id}"
-                )
-            except Exception as e:
-                log.warning(f"Failed to update session metadata: {e}")
+        # Pre-run I/O steps are independent, so run them concurrently
+        timings: dict[str, float] = {}
+        pre_run_started = time.perf_counter()
+        is_new_session, (is_valid, error), user, existing_state = await asyncio.gather(
+            _timed(
+                timings,
+                "metadata",
+                self._upsert_session_metadata(thread_id, user_id, user_content),
+            ),
+            _timed(timings, "moderation", self.moderator.validate_input(user_content)),
+            _timed(timings, "user", self._fetch_user(user_id)),
+            _timed(timings, "state", self._fetch_thread_state(config)),
+        )
 
-        # Validate input
-        is_valid, error = await self.moderator.validate_input(user_content)
         if not is_valid:
             log.warning("Input validation failed: %s", error)
             return self._create_response_message(
                 f"Input validation failed: {error}", str(uuid.uuid4())
             )
 
-        await self.audit.log_message(
-            session_id=thread_id,
-            role="user",
-            content=user_content,
-            metadata={},
+        if is_new_session and user_content:
+            self._start_background_task(
+                self._generate_session_title(thread_id, user_content, protocol_handler)
+            )
+
+        # Audited only once moderation accepted the input, as before: rejected
+        # input (e.g. script injection) is not written to the audit log
+        await _timed(
+            timings,
+            "audit",
+            self.audit.log_message(
+                session_id=thread_id,
+                role="user",
+                content=user_content,
+                metadata={},
+            ),
         )
 
         try:
@@ -193,59 +298,53 @@ class Orchestrator:
                 await protocol_handler.send_step_started("routing")
 
             message_id = str(uuid.uuid4())
-            config = {"configurable": {"thread_id": thread_id}}
 
             # Include user_id in metadata so agents can access it
             metadata: dict[str, Any] = {"user_id": user_id}
 
-            # Fetch user email and preferences (NOT interaction_mode - that's session-level)
-            if self.user_manager:
-                try:
-                    user = await self.user_manager.get_user(user_id)
-                    if user:
-                        metadata["user_email"] = user.get("email")
-                        metadata["user_name"] = user.get("name")
-                        prefs = user.get("preferences", {})
-                        if prefs:
-                            metadata["email_reports"] = prefs.get("email_reports", True)
-                except Exception as e:
-                    log.warning(f"Failed to fetch user info for metadata: {e}")
-
-            # Check if thread exists and get its persisted state
+            # User email and preferences (NOT interaction_mode - that's session-level)
+            spoken_mode = "summarize"  # default
+            if user:
+                metadata["user_email"] = user.get("email")
+                metadata["user_name"] = user.get("name")
+                prefs = user.get("preferences", {})
+                if prefs:
+                    metadata["email_reports"] = prefs.get("email_reports", True)
+                    spoken_mode = prefs.get("spoken_text_type", "summarize")
+            # The graph only generates spoken text when it will be used
+            metadata["spoken_text_type"] = spoken_mode
+
+            # Check if thread exists from its persisted state
             is_interrupted = False
             is_existing_thread = False
             interaction_mode = "feedback"  # Default for new sessions
 
-            try:
-                existing_state = await self.graph.aget_state(config)  # type: ignore[arg-type]
-                # Check if this is truly an existing thread with messages
-                # (not just an empty state object)
-                if (
-                    existing_state
-                    and existing_state.values
-                    and existing_state.values.get("messages")
-                ):
-                    is_existing_thread = True
-                    # interaction_mode is session-level, read from checkpointed state only
-                    interaction_mode = existing_state.values.get(
-                        "interaction_mode", "feedback"
-                    )
-                    log.info(
-                        f"Existing thread {thread_id}, "
-                        f"interaction_mode={interaction_mode}"
-                    )
-                else:
-                    log.info(f"New thread {thread_id}, will start in feedback mode")
+            # Check if this is truly an existing thread with messages
+            # (not just an empty state object)
+            if (
+                existing_state
+                and existing_state.values
+                and existing_state.values.get("messages")
+            ):
+                is_existing_thread = True
+                # interaction_mode is session-level, read from checkpointed state only
+                interaction_mode = existing_state.values.get(
+                    "interaction_mode", "feedback"
+                )
+                log.info(
+                    f"Existing thread {thread_id}, "
+                    f"interaction_mode={interaction_mode}"
+                )
+            else:
+                log.info(f"New thread {thread_id}, will start in feedback mode")
 
-                if existing_state and existing_state.next:
-                    # Graph is interrupted - there are pending tasks waiting for resume
-                    is_interrupted = True
-                    log.info(
-                        f"Thread {thread_id} is interrupted at {existing_state.next}, "
-                        "will resume with user message"
-                    )
-            except Exception as e:
-                log.warning(f"Failed to read persisted state: {e}")
+            if existing_state and existing_state.next:
+                # Graph is interrupted - there are pending tasks waiting for resume
+                is_interrupted = True
+                log.info(
+                    f"Thread {thread_id} is interrupted at {existing_state.next}, "
+                    "will resume with user message"
+                )
 
             # Determine input for graph invocation
             if is_interrupted:
@@ -287,6 +386,13 @@ class Orchestrator:
                     }
                 )
 
+            timings["total"] = (time.perf_counter() - pre_run_started) * 1000
+            log.info(
+                "Pre-run timings for run %s: %s",
+                run_id,
+                ", ".join(f"{step}={ms:.1f}ms" for step, ms in timings.items()),
+            )
+
             if protocol_handler:
                 response_content, active_agent_id = await self._stream_response(
                     graph_input,
@@ -297,6 +403,7 @@ class Orchestrator:
                     user_id,
                     protocol_handler,
                     interaction_mode,
+                    spoken_mode,
                 )
             else:
                 response_content, active_agent_id = await self._run_blocking(
@@ -316,12 +423,8 @@ class Orchestrator:
                 metadata={"agent_id": active_agent_id},
             )
 
-            # Increment message count for successful response
-            if self.session_metadata:
-                try:
-                    await self.session_metadata.increment_message_count(thread_id)
-                except Exception as e:
-                    log.warning(f"Failed to increment message count: {e}")
+            # Count the response and update last_activity in one write
+            await self._finish_turn(thread_id, completed=True)
 
             if protocol_handler and protocol_handler.is_connected:
                 # Send final state snapshot before finishing
@@ -339,6 +442,8 @@ class Orchestrator:
             return self._create_response_message(response_content, message_id)
 
         except Exception as e:
+            await self._finish_turn(thread_id, completed=False)
+
             if str(e) == "Tool execution rejected by user":
                 log.info("Action cancelled by user")
                 if protocol_handler and protocol_handler.is_connected:
@@ -398,6 +503,7 @@ class Orchestrator:
         user_id: str,
         protocol_handler: Any,
         interaction_mode: str = "feedback",
+        spoken_mode: str = "summarize",
     ) -> tuple[str, str]:
         """Stream graph response using astream_events with AG-UI Protocol.
 
@@ -405,7 +511,8 @@ class Orchestrator:
         via the Send API. Both run simultaneously with shared context but different
         prompts.
 
-        Dual-channel streaming controlled by user's spoken_text_type preference:
+        Dual-channel streaming controlled by spoken_mode, the user's spoken_text_type
+        preference (read once per turn in process_message):
         - 'summarize': Uses generate_spoken output (speech-optimized)
         - 'dictate': Ignores spoken stream, duplicates written to both channels
         """
@@ -422,30 +529,48 @@ class Orchestrator:
         message_started = False
         spoken_message_started = False
 
-        # Agent node names - we don't stream from these (ReAct loop)
+        # Agent node names - we don't stream from these (ReAct loop),
+        # except for final answers with stream_agent_answer
         agent_nodes = {
             "general-agent",
             "regulation-agent",
             "reporting-agent",
             "history-agent",
         }
+        # Last agent LLM run streamed to the written channel
+        answer_run_id: str | None = None
+
+        async def emit_written(content: str) -> None:
+            nonlocal message_started, spoken_message_started
+            # Accumulate for final response
+            full_response.append(content)
+
+            if not protocol_handler.is_connected:
+                return
+
+            # Start written channel on first content
+            if not message_started:
+                log.info(f"Starting text streams (spoken_mode={spoken_mode})")
+                await protocol_handler.send_text_message_start(message_id, "assistant")
+                message_started = True
+                # Only start spoken channel if not already started by generate_spoken
+                if not spoken_message_started:
+                    await protocol_handler.send_spoken_text_start(
+                        message_id, "assistant"
+                    )
+                    spoken_message_started = True
+
+            # Send to written channel
+            await protocol_handler.send_text_message_content(message_id, content)
+
+            # In dictate mode: also send written to spoken channel
+            if spoken_mode == "dictate":
+                await protocol_handler.send_spoken_text_content(message_id, content)
 
         await protocol_handler.send_step_finished("routing")
         await protocol_handler.send_step_started("thinking")
         current_step = "thinking"
 
-        # Fetch user preference for spoken response mode
-        spoken_mode = "summarize"  # default
-        if self.user_manager:
-            try:
-                user = await self.user_manager.get_user(user_id)
-                if user:
-                    prefs = user.get("preferences", {})
-                    if prefs:
-                        spoken_mode = prefs.get("spoken_text_type", "summarize")
-            except Exception as e:
-                log.warning(f"Failed to fetch user preferences: {e}, using default")
-
         log.info(f"Spoken mode for user {user_id}: {spoken_mode}")
 
         async for event in self.graph.astream_events(
@@ -457,46 +582,27 @@ class Orchestrator:
 
             if kind == "on_chat_model_stream":
                 chunk = event.get("data", {}).get("chunk")
-                if chunk and hasattr(chunk, "content") and chunk.content:
-                    content = str(chunk.content)
 
-                    # Only stream from generator nodes, not agent nodes
-                    # Agent nodes run during ReAct loop - their output is regenerated
-                    if node_name in agent_nodes:
-                        # Skip streaming from agent nodes (wasted call is filtered)
+                # Agent nodes run during ReAct loop - their output is regenerated
+                # by generate_written, unless stream_agent_answer is set. Then
+                # all agent text goes straight to the written channel, including
+                # text written before a tool call, with ANSWER_SEPARATOR between
+                # LLM runs. generate_written stores the same text (_agent_answer).
+                if node_name in agent_nodes:
+                    if not self.stream_agent_answer or not chunk or not chunk.content:
                         continue
+                    llm_run_id = event.get("run_id", "")
+                    if answer_run_id is not None and llm_run_id != answer_run_id:
+                        await emit_written(ANSWER_SEPARATOR)
+                    answer_run_id = llm_run_id
+                    await emit_written(str(chunk.content))
+                    continue
 
-                    if node_name == "generate_written":
-                        # Accumulate for final response
-                        full_response.append(content)
-
-                        if protocol_handler.is_connected:
-                            # Start written channel on first content
-                            if not message_started:
-                                log.info(
-                                    f"Starting text streams (spoken_mode={spoken_mode})"
-                                )
-                                await protocol_handler.send_text_message_start(
-                                    message_id, "assistant"
-                                )
-                                message_started = True
-                                # Only start spoken channel if not already started by generate_spoken
-                                if not spoken_message_started:
-                                    await protocol_handler.send_spoken_text_start(
-                                        message_id, "assistant"
-                                    )
-                                    spoken_message_started = True
-
-                            # Send to written channel
-                            await protocol_handler.send_text_message_content(
-                                message_id, content
-                            )
+                if chunk and hasattr(chunk, "content") and chunk.content:
+                    content = str(chunk.content)
 
-                            # In dictate mode: also send written to spoken channel
-                            if spoken_mode == "dictate":
-                                await protocol_handler.send_spoken_text_content(
-                                    message_id, content
-                                )
+                    if node_name == "generate_written":
+                        await emit_written(content)
 
                     elif node_name == "generate_spoken":
                         # In summarize mode: send to spoken channel
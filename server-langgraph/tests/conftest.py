@@ -1,6 +1,13 @@
 """Pytest configuration and fixtures for AGORA LangGraph tests."""
 
 import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
 import pytest
 from unittest.mock import MagicMock, AsyncMock
 
@@ -59,3 +66,77 @@ def sample_approval_response():
         approved=True,
         feedback="Approved by user",
     )
+
+
+STAND_INS = (
+    Path(__file__).resolve().parents[2] / "mcp-servers" / "stand-ins" / "server.py"
+)
+
+
+@pytest.fixture
+def mcp_stand_in():
+    """Launch latency-injecting MCP server stand-ins.
+
+    Yields a function taking the server name and stand-in CLI options
+    (e.g. "--latency", "fixed:50") and returning the server's base URL.
+    """
+    processes: list[subprocess.Popen] = []
+
+    def launch(server: str, *options: str) -> str:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        process = subprocess.Popen(
+            [sys.executable, str(STAND_INS), server, "--port", str(port), *options],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        processes.append(process)
+
+        url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 15
+        while True:
+            try:
+                httpx.get(f"{url}/health", timeout=1).raise_for_status()
+                return url
+            except httpx.HTTPError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"MCP stand-in {server} did not start")
+                time.sleep(0.1)
+
+    yield launch
+
+    for process in processes:
+        process.terminate()
+        process.wait(timeout=5)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Replace every LLM of the graph with one fake chat model.
+
+    The model answers each call with `fake_llm.answer` (no tool calls) and
+    records the messages of every call in `fake_llm.calls`.
+    """
+    from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage
+
+    from agora_langgraph.core import agents, graph
+
+    class FakeLLM(GenericFakeChatModel):
+        answer: str = "Controleer de temperatuur van de koelcel. " * 10
+        calls: list = []
+
+        def bind_tools(self, tools, **kwargs):
+            return self
+
+        def _generate(self, messages, *args, **kwargs):
+            self.calls.append(messages)
+            self.messages = iter([AIMessage(content=self.answer)])
+            return super()._generate(messages, *args, **kwargs)
+
+    llm = FakeLLM(messages=iter([]))
+    monkeypatch.setattr(agents, "get_llm_for_agent", lambda agent_id: llm)
+    monkeypatch.setattr(graph, "get_llm_for_agent", lambda agent_id: llm)
+    monkeypatch.setattr(graph, "get_llm_for_spoken", lambda: llm)
+    return llm
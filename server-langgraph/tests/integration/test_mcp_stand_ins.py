@@ -0,0 +1,151 @@
+"""Integration tests for the MCP tools against latency-injecting MCP stand-ins."""
+
+import ast
+import asyncio
+import time
+import typing
+from pathlib import Path
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.prebuilt import ToolNode
+from mcp.server.fastmcp import FastMCP
+
+from agora_langgraph.adapters.mcp_client import MCPClientManager
+from agora_langgraph.core.tool_results import compact_tool_result
+
+
+async def connect(server_urls: dict[str, str]) -> MCPClientManager:
+    manager = MCPClientManager(server_urls)
+    await manager.connect()
+    return manager
+
+
+def tool_text(result) -> str:
+    return "".join(block["text"] for block in result if block.get("type") == "text")
+
+
+MCP_SERVERS = Path(__file__).resolve().parents[3] / "mcp-servers"
+
+
+async def real_tool_schemas(server: str) -> dict[str, dict]:
+    """Input schemas of the tools the real MCP server exposes.
+
+    The real servers need fastmcp and their own dependencies, so only the
+    signatures of their `@mcp.tool` functions are loaded, into the FastMCP
+    the stand-ins run on.
+    """
+    tree = ast.parse((MCP_SERVERS / server / "server.py").read_text())
+    mcp = FastMCP(server)
+    for node in tree.body:
+        if isinstance(node, ast.AsyncFunctionDef) and any(
+            ast.unparse(d).startswith("mcp.tool") for d in node.decorator_list
+        ):
+            node.decorator_list = []
+            node.body = [ast.Expr(ast.Constant(...))]
+            namespace = dict(vars(typing))
+            module = ast.fix_missing_locations(ast.Module([node], []))
+            exec(compile(module, server, "exec"), namespace)
+            mcp.add_tool(namespace[node.name])
+    return {tool.name: tool.inputSchema for tool in await mcp.list_tools()}
+
+
+class TestMCPClientManagerWithStandIns:
+    """MCPClientManager against stand-ins for the real MCP servers."""
+
+    async def test_discovers_tools_per_server(self, mcp_stand_in):
+        manager = await connect(
+            {
+                "inspection-history": mcp_stand_in("inspection-history"),
+                "reporting": mcp_stand_in("reporting"),
+            }
+        )
+
+        history = {t.name for t in manager.get_tools_for_server("inspection-history")}
+        reporting = {t.name for t in manager.get_tools_for_server("reporting")}
+        assert history == {"check_company_exists", "get_inspection_history"}
+        assert {"extract_inspection_data", "generate_final_report"} <= reporting
+
+    @pytest.mark.parametrize(
+        "server", ["inspection-history", "regulation-analysis", "reporting"]
+    )
+    async def test_tool_schemas_match_real_server(self, mcp_stand_in, server):
+        manager = await connect({server: mcp_stand_in(server)})
+
+        stand_in = {t.name: t.args_schema for t in manager.get_tools_for_server(server)}
+        assert stand_in == await real_tool_schemas(server)
+
+    async def test_concurrent_calls_overlap(self, mcp_stand_in):
+        url = mcp_stand_in("regulation-analysis", "--latency", "fixed:300")
+        manager = await connect({"regulation-analysis": url})
+        (search,) = [
+            t for t in manager.get_all_tools() if t.name == "search_regulations"
+        ]
+
+        started = time.perf_counter()
+        await asyncio.gather(*(search.ainvoke({"query": "koeling"}) for _ in range(5)))
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1.2
+        stats = httpx.get(f"{url}/stats").json()["search_regulations"]
+        assert stats["calls"] == 5
+        assert stats["max_in_flight"] > 1
+
+    async def test_payload_size(self, mcp_stand_in):
+        url = mcp_stand_in("inspection-history", "--payload-bytes", "20000")
+        manager = await connect({"inspection-history": url})
+        (history,) = [
+            t for t in manager.get_all_tools() if t.name == "get_inspection_history"
+        ]
+
+        result = await history.ainvoke({"kvk_number": "92251854"})
+
+        assert len(tool_text(result).encode()) >= 20000
+
+    async def test_injected_failure_reaches_the_agent(self, mcp_stand_in):
+        url = mcp_stand_in("inspection-history", "--failure-rate", "1")
+        manager = await connect({"inspection-history": url})
+        (check,) = [
+            t for t in manager.get_all_tools() if t.name == "check_company_exists"
+        ]
+
+        result = await check.ainvoke({"kvk_number": "92251854"})
+
+        assert "Injected failure" in tool_text(result)
+
+
+class TestToolResultCompaction:
+    """The ToolNode compacts results for the LLM, not for the frontend."""
+
+    async def test_payload_is_compacted_after_on_tool_end(self, mcp_stand_in):
+        url = mcp_stand_in("regulation-analysis", "--payload-bytes", "20000")
+        manager = await connect({"regulation-analysis": url})
+        graph = StateGraph(MessagesState)
+        graph.add_node(
+            "tools",
+            ToolNode(manager.get_all_tools(), awrap_tool_call=compact_tool_result),
+        )
+        graph.add_edge(START, "tools")
+        graph.add_edge("tools", END)
+        call = AIMessage(
+            content="",
+            tool_calls=[
+                {"name": "search_regulations", "args": {"query": "koeling"}, "id": "t1"}
+            ],
+        )
+
+        tool_end_output = None
+        async for event in graph.compile().astream_events(
+            {"messages": [call]}, version="v2"
+        ):
+            if event["event"] == "on_tool_end":
+                tool_end_output = event["data"]["output"]
+            elif event["event"] == "on_chain_end" and event["name"] == "LangGraph":
+                final = event["data"]["output"]
+
+        # The frontend's TOOL_CALL_RESULT is built from on_tool_end
+        assert len(tool_text(tool_end_output.content).encode()) >= 20000
+        message = final["messages"][-1]
+        assert len(message.content.encode()) < 2000
@@ -0,0 +1,75 @@
+"""Tests for checkpoint growth and compaction in sessions.db."""
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+
+from agora_langgraph.adapters.checkpointer import (
+    compact_checkpoints,
+    create_checkpointer,
+)
+from agora_langgraph.adapters.storage import SQLiteStorage
+from agora_langgraph.core import graph
+
+
+@pytest.fixture
+async def storage(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "sessions.db"))
+    await storage.initialize()
+    yield storage
+    await storage.close()
+
+
+def state_size(checkpointer, checkpoint) -> int:
+    """Serialized size of the checkpoint's channels other than messages."""
+    values = {k: v for k, v in checkpoint["channel_values"].items() if k != "messages"}
+    return len(checkpointer.serde.dumps_typed(values)[1])
+
+
+async def test_checkpoint_state_stays_flat_across_turns(storage, fake_llm):
+    async with create_checkpointer(storage) as checkpointer:
+        app = graph.build_agent_graph({}).compile(checkpointer=checkpointer)
+        config = {"configurable": {"thread_id": "long-inspection"}}
+
+        sizes = []
+        for turn in range(100):
+            await app.ainvoke(
+                {
+                    "messages": [HumanMessage(content=f"Vraag {turn}")],
+                    "metadata": {"user_id": "inspector"},
+                },
+                config,
+            )
+            saved = await checkpointer.aget_tuple(config)
+            sizes.append(state_size(checkpointer, saved.checkpoint))
+
+    assert saved.checkpoint["channel_values"]["written"] == []
+    assert saved.checkpoint["channel_values"]["spoken"] == []
+    assert max(sizes) == min(sizes)
+
+
+async def test_compaction_trims_accumulated_generations(storage):
+    async with create_checkpointer(storage) as checkpointer:
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {
+            "written": [f"antwoord {turn}" for turn in range(50)],
+            "spoken": [f"samenvatting {turn}" for turn in range(50)],
+            "final_written": "antwoord 49",
+        }
+        config = {"configurable": {"thread_id": "old-session", "checkpoint_ns": ""}}
+        await checkpointer.aput(config, checkpoint, {}, {})
+
+        # Already applied when the checkpointer was created
+        assert await compact_checkpoints(storage, checkpointer) == 0
+
+        await storage.connection.execute("DELETE FROM agora_compactions")
+        assert await compact_checkpoints(storage, checkpointer) == 1
+        assert await compact_checkpoints(storage, checkpointer) == 0
+
+        saved = await checkpointer.aget_tuple(config)
+
+    assert saved.checkpoint["channel_values"] == {
+        "written": ["antwoord 49"],
+        "spoken": ["samenvatting 49"],
+        "final_written": "antwoord 49",
+    }
@@ -0,0 +1,103 @@
+"""Tests for token-budgeted compaction of the conversation context."""
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from agora_langgraph.core import graph
+from agora_langgraph.core.context import get_context_messages, split_turns
+
+PAYLOAD = "Artikel 4.2: koelcellen moeten onder de 7 graden blijven. " * 100
+
+
+def conversation(turns: int) -> list:
+    messages = []
+    for turn in range(turns):
+        messages += [
+            HumanMessage(id=f"human-{turn}", content=f"Vraag {turn}"),
+            AIMessage(
+                id=f"call-{turn}",
+                content="",
+                tool_calls=[
+                    {
+                        "name": "search_regulations",
+                        "args": {"q": "koel"},
+                        "id": f"t{turn}",
+                    }
+                ],
+            ),
+            ToolMessage(
+                id=f"tool-{turn}",
+                content=PAYLOAD,
+                name="search_regulations",
+                tool_call_id=f"t{turn}",
+            ),
+            AIMessage(id=f"answer-{turn}", content=f"Antwoord {turn}"),
+        ]
+    return messages
+
+
+async def test_older_turns_are_summarized_over_budget(fake_llm):
+    state = {"messages": conversation(5)}
+
+    result = await graph.compact_context_node(state, token_budget=1000, keep_turns=2)
+
+    assert result == {
+        "context_summary": fake_llm.answer,
+        "context_summary_until": "answer-2",
+    }
+    context = get_context_messages({**state, **result})
+    assert [turn[0].id for turn in split_turns(context)] == ["human-3", "human-4"]
+
+    # Tool results are elided in the transcript that gets summarized
+    _, transcript = fake_llm.calls[-1]
+    assert "Vraag 0" in transcript.content
+    assert "characters elided" in transcript.content
+    assert PAYLOAD not in transcript.content
+
+
+async def test_context_under_budget_is_left_alone(fake_llm):
+    state = {"messages": conversation(5)}
+
+    assert (
+        await graph.compact_context_node(state, token_budget=100_000, keep_turns=4)
+        == {}
+    )
+    assert fake_llm.calls == []
+
+
+async def test_graphs_keep_their_own_budget(fake_llm):
+    compacting = graph.build_agent_graph({}, context_token_budget=600).compile()
+    unbounded = graph.build_agent_graph({}, context_token_budget=0).compile()
+
+    assert "compact_context" in compacting.nodes
+    assert "compact_context" not in unbounded.nodes
+    result = await compacting.nodes["compact_context"].ainvoke(
+        {"messages": conversation(8)}
+    )
+    assert result["context_summary"] == fake_llm.answer
+
+
+async def test_prompt_stays_bounded_in_long_session(fake_llm):
+    app = graph.build_agent_graph(
+        {}, context_token_budget=600, context_keep_turns=2
+    ).compile(checkpointer=InMemorySaver())
+    config = {"configurable": {"thread_id": "long-inspection"}}
+
+    prompt_sizes = []
+    for turn in range(30):
+        fake_llm.calls.clear()
+        await app.ainvoke(
+            {"messages": [HumanMessage(content=f"Vraag {turn}")], "metadata": {}},
+            config,
+        )
+        prompt_sizes.append(max(len(messages) for messages in fake_llm.calls))
+
+    state = (await app.aget_state(config)).values
+    # The full conversation stays in state for the session history
+    assert len(state["messages"]) == 60
+    assert state["context_summary"] == fake_llm.answer
+    # Prompts grow until the budget is hit, then shrink again: no growth
+    # over the session
+    assert max(prompt_sizes[10:]) <= max(prompt_sizes[:10]) < 30
+    system, *_ = fake_llm.calls[0]
+    assert "SUMMARY OF THE CONVERSATION SO FAR" in system.content
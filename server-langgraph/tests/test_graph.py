@@ -0,0 +1,150 @@
+"""Tests for the parallel generation nodes of the LangGraph agent graph."""
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from agora_langgraph.core import graph
+
+
+def agent_state(messages):
+    return {
+        "messages": messages,
+        "current_agent": "general-agent",
+        "session_id": "test-session",
+        "metadata": {},
+        "written": [],
+        "spoken": [],
+    }
+
+
+def answered_state():
+    return agent_state(
+        [
+            HumanMessage(content="Waar let ik op bij de koelcel?"),
+            AIMessage(
+                id="answer-1",
+                content="Controleer de temperatuur.",
+                additional_kwargs={"agent_id": "general-agent"},
+            ),
+        ]
+    )
+
+
+def test_agent_answer_is_regenerated_by_default():
+    sends = graph._create_parallel_sends(answered_state())
+
+    assert [s.arg["answer"] for s in sends] == [None, None]
+    assert all(len(s.arg["messages"]) == 1 for s in sends)
+
+
+def test_agent_answer_is_passed_to_written_generator():
+    sends = graph._create_parallel_sends(answered_state(), stream_agent_answer=True)
+
+    answers = {s.node: s.arg["answer"] for s in sends}
+    assert answers == {
+        "generate_written": "Controleer de temperatuur.",
+        "generate_spoken": None,
+    }
+
+
+async def test_generate_written_uses_answer_without_llm_call(monkeypatch):
+    async def fail(*args, **kwargs):
+        raise AssertionError("generate_written called the LLM")
+
+    monkeypatch.setattr(graph, "_generate_stream", fail)
+
+    result = await graph.generate_written_node(
+        {"messages": [], "stream_type": "written", "answer": "Klaar."}
+    )
+
+    assert result == {"written": ["Klaar."]}
+
+
+def test_merge_updates_agent_answer_in_place():
+    state = answered_state()
+    state["written"] = ["Controleer de temperatuur."]
+    state["spoken"] = ["Let op de temperatuur."]
+
+    result = graph.merge_parallel_outputs(state)
+
+    (message,) = result["messages"]
+    assert message.id == "answer-1"
+    assert message.additional_kwargs == {
+        "agent_id": "general-agent",
+        "spoken_text": "Let op de temperatuur.",
+    }
+
+
+def preamble_state():
+    return agent_state(
+        [
+            HumanMessage(content="Waar let ik op bij de koelcel?"),
+            AIMessage(
+                id="call-1",
+                content="Ik zoek het op.",
+                tool_calls=[{"name": "search_regulations", "args": {}, "id": "t1"}],
+            ),
+            ToolMessage(content="{}", tool_call_id="t1"),
+            AIMessage(id="answer-1", content="Controleer de temperatuur."),
+        ]
+    )
+
+
+def test_text_before_tool_call_is_part_of_answer():
+    sends = graph._create_parallel_sends(preamble_state(), stream_agent_answer=True)
+
+    assert sends[0].arg["answer"] == "Ik zoek het op.\n\nControleer de temperatuur."
+
+
+def test_merge_moves_text_before_tool_call_into_answer():
+    state = preamble_state()
+    state["written"] = ["Ik zoek het op.\n\nControleer de temperatuur."]
+
+    result = graph.merge_parallel_outputs(state)
+
+    call, answer = result["messages"]
+    assert call.id == "call-1"
+    assert call.content == ""
+    assert call.tool_calls[0]["id"] == "t1"
+    assert answer.id == "answer-1"
+    assert answer.content == "Ik zoek het op.\n\nControleer de temperatuur."
+
+
+def test_merge_adds_regenerated_answer():
+    state = answered_state()
+    state["written"] = ["Controleer eerst de temperatuur van de koelcel."]
+
+    result = graph.merge_parallel_outputs(state)
+
+    (message,) = result["messages"]
+    assert message.id != "answer-1"
+    assert message.content == "Controleer eerst de temperatuur van de koelcel."
+
+
+def test_dictate_mode_dispatches_only_written_generator():
+    state = answered_state()
+    state["metadata"] = {"spoken_text_type": "dictate"}
+
+    sends = graph._create_parallel_sends(state)
+
+    assert [s.node for s in sends] == ["generate_written"]
+
+
+def test_summarize_mode_dispatches_both_generators():
+    state = answered_state()
+    state["metadata"] = {"spoken_text_type": "summarize"}
+
+    sends = graph._create_parallel_sends(state)
+
+    assert [s.node for s in sends] == ["generate_written", "generate_spoken"]
+
+
+def test_merge_without_spoken_branch_speaks_written_text():
+    state = answered_state()
+    state["metadata"] = {"spoken_text_type": "dictate"}
+    # Left over from an earlier turn in summarize mode
+    state["spoken"] = ["Vorige samenvatting."]
+    state["written"] = ["Controleer eerst de temperatuur van de koelcel."]
+
+    result = graph.merge_parallel_outputs(state)
+
+    assert result["final_spoken"] == "Controleer eerst de temperatuur van de koelcel."
@@ -0,0 +1,70 @@
+"""Tests for the multiplexed AG-UI WebSocket endpoint."""
+
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from agora_langgraph.api.mux import CLOSE, DATA, OPEN, encode, serve_multiplexed
+
+
+def _app() -> FastAPI:
+    """App whose sessions echo frames upper-cased and end on "bye"."""
+    app = FastAPI()
+
+    async def session(websocket) -> None:
+        while True:
+            try:
+                text = await websocket.receive_text()
+            except WebSocketDisconnect:
+                return
+            if text == "bye":
+                return
+            await websocket.send_text(text.upper())
+
+    @app.websocket("/ws/mux")
+    async def mux(websocket: WebSocket) -> None:
+        await websocket.accept()
+        await serve_multiplexed(websocket, session)
+
+    return app
+
+
+def test_streams_are_demultiplexed():
+    """Frames reach their own stream's session and replies keep the stream id."""
+    with TestClient(_app()).websocket_connect("/ws/mux") as ws:
+        ws.send_text(encode(1, OPEN))
+        ws.send_text(encode(2, OPEN))
+        ws.send_text(encode(2, DATA, '{"threadId": "b"}'))
+        ws.send_text(encode(1, DATA, '{"threadId": "a"}'))
+
+        replies = {ws.receive_text(), ws.receive_text()}
+        assert replies == {
+            encode(2, DATA, '{"THREADID": "B"}'),
+            encode(1, DATA, '{"THREADID": "A"}'),
+        }
+
+
+def test_session_end_closes_stream():
+    """A session that ends tells the gateway its stream is closed."""
+    with TestClient(_app()).websocket_connect("/ws/mux") as ws:
+        ws.send_text(encode(1, OPEN))
+        ws.send_text(encode(1, DATA, "bye"))
+        assert ws.receive_text() == encode(1, CLOSE)
+
+        # Frames for closed or unknown streams are ignored
+        ws.send_text(encode(1, DATA, "late"))
+        ws.send_text(encode(3, OPEN))
+        ws.send_text(encode(3, DATA, "hallo"))
+        assert ws.receive_text() == encode(3, DATA, "HALLO")
+
+
+def test_binary_frame_ends_stream():
+    """AG-UI sessions are text only; a binary data frame closes its stream."""
+    with TestClient(_app()).websocket_connect("/ws/mux") as ws:
+        ws.send_text(encode(1, OPEN))
+        ws.send_bytes(encode(1, DATA).encode() + b"\xff\xfe")
+        assert ws.receive_text() == encode(1, CLOSE)
+
+        # Other streams are unaffected
+        ws.send_text(encode(2, OPEN))
+        ws.send_text(encode(2, DATA, "hallo"))
+        assert ws.receive_text() == encode(2, DATA, "HALLO")
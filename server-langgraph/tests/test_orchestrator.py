@@ -0,0 +1,191 @@
+"""Tests for the pre-run phase of the LangGraph orchestrator."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from agora_langgraph.adapters.audit_logger import AuditLogger
+from agora_langgraph.common.ag_ui_types import RunAgentInput
+from agora_langgraph.pipelines.moderator import ModerationPipeline
+from agora_langgraph.pipelines.orchestrator import Orchestrator
+
+
+class InFlight:
+    """Counts pre-run I/O calls in progress at the same time."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+
+    def respond(self, value):
+        async def respond(*args, **kwargs):
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+            # Yield once: calls started together all get here before any returns
+            await asyncio.sleep(0)
+            self.current -= 1
+            return value
+
+        return respond
+
+
+async def no_events(*args, **kwargs):
+    return
+    yield
+
+
+@pytest.fixture
+def in_flight():
+    return InFlight()
+
+
+@pytest.fixture
+def orchestrator(in_flight):
+    graph = MagicMock()
+    graph.aget_state = AsyncMock(
+        side_effect=in_flight.respond(SimpleNamespace(values={}, next=()))
+    )
+    graph.astream_events = no_events
+
+    session_metadata = AsyncMock()
+    session_metadata.create_or_update_metadata.side_effect = in_flight.respond(False)
+
+    user_manager = AsyncMock()
+    user_manager.get_user.side_effect = in_flight.respond(
+        {
+            "email": "inspecteur@nvwa.nl",
+            "name": "Koen",
+            "preferences": {"spoken_text_type": "dictate"},
+        }
+    )
+
+    return Orchestrator(
+        graph=graph,
+        moderator=ModerationPipeline(),
+        audit_logger=AuditLogger(),
+        session_metadata=session_metadata,
+        user_manager=user_manager,
+    )
+
+
+def agent_input():
+    return RunAgentInput(
+        thread_id="test-session",
+        user_id="test-user",
+        messages=[{"role": "user", "content": "Start inspectie bij Bakkerij"}],
+    )
+
+
+async def test_pre_run_io_runs_concurrently(orchestrator, in_flight):
+    handler = AsyncMock(is_connected=True)
+    stream = AsyncMock(return_value=("", "general-agent"))
+    orchestrator._stream_response = stream
+
+    await orchestrator.process_message(agent_input(), handler)
+
+    # Metadata, user and state are fetched together, not one after another
+    assert in_flight.peak == 3
+    handler.send_run_started.assert_awaited_once()
+
+
+async def test_user_is_fetched_once_per_turn(orchestrator):
+    handler = AsyncMock(is_connected=True)
+    stream = AsyncMock(return_value=("", "general-agent"))
+    orchestrator._stream_response = stream
+
+    await orchestrator.process_message(agent_input(), handler)
+
+    orchestrator.user_manager.get_user.assert_awaited_once_with("test-user")
+    graph_input = stream.await_args.args[0]
+    assert graph_input["metadata"]["user_email"] == "inspecteur@nvwa.nl"
+    assert stream.await_args.args[-1] == "dictate"
+
+
+async def test_invalid_input_does_not_start_run(orchestrator):
+    handler = AsyncMock(is_connected=True)
+    invalid = RunAgentInput(
+        thread_id="test-session",
+        user_id="test-user",
+        messages=[
+            {
+                "role": "user",
+                "content": "<script>alert(1)</script>",
+            }
+        ],
+    )
+
+    response = await orchestrator.process_message(invalid, handler)
+
+    assert "validation failed" in response.content.lower()
+    handler.send_run_started.assert_not_called()
+
+
+def model_stream(node, run_id, chunk):
+    return {
+        "event": "on_chat_model_stream",
+        "run_id": run_id,
+        "metadata": {"langgraph_node": node},
+        "data": {"chunk": chunk},
+    }
+
+
+async def stream_written(orchestrator, events):
+    async def astream_events(*args, **kwargs):
+        for event in events:
+            yield event
+
+    orchestrator.graph.astream_events = astream_events
+    orchestrator.graph.aget_state = AsyncMock(
+        return_value=SimpleNamespace(values={}, next=())
+    )
+    handler = AsyncMock(is_connected=True)
+    await orchestrator._stream_response(
+        {"current_agent": "general-agent"},
+        {"configurable": {"thread_id": "test-session"}},
+        "test-session",
+        "run-1",
+        "message-1",
+        "test-user",
+        handler,
+    )
+    return [c.args[1] for c in handler.send_text_message_content.await_args_list]
+
+
+AGENT_ANSWER_EVENTS = [
+    model_stream(
+        "general-agent",
+        "llm-1",
+        AIMessageChunk(
+            content="",
+            tool_call_chunks=[{"name": "search_regulations", "args": "", "id": "t1"}],
+        ),
+    ),
+    model_stream("general-agent", "llm-2", AIMessageChunk(content="Ik zoek het op.")),
+    model_stream(
+        "general-agent",
+        "llm-2",
+        AIMessageChunk(
+            content="",
+            tool_call_chunks=[{"name": "search_regulations", "args": "", "id": "t2"}],
+        ),
+    ),
+    model_stream("general-agent", "llm-3", AIMessageChunk(content="Controleer ")),
+    model_stream("general-agent", "llm-3", AIMessageChunk(content="de koelcel.")),
+]
+
+
+async def test_agent_answer_is_not_streamed_by_default(orchestrator):
+    assert await stream_written(orchestrator, AGENT_ANSWER_EVENTS) == []
+
+
+async def test_agent_answer_is_streamed_with_stream_agent_answer(orchestrator):
+    orchestrator.stream_agent_answer = True
+
+    written = await stream_written(orchestrator, AGENT_ANSWER_EVENTS)
+
+    # Text written before a tool call is streamed too, separated from the
+    # next run like the answer stored by generate_written
+    assert written == ["Ik zoek het op.", "\n\n", "Controleer ", "de koelcel."]
@@ -0,0 +1,53 @@
+"""Tests for session titles in SessionMetadataManager."""
+
+import pytest
+
+from agora_langgraph.adapters.session_metadata import SessionMetadataManager
+
+FIRST_MESSAGE = (
+    "Start inspectie bij Bakkerij De Gouden Korst, KVK 92251854, vanwege klachten"
+)
+
+
+@pytest.fixture
+async def metadata(tmp_path, monkeypatch):
+    manager = SessionMetadataManager(str(tmp_path / "sessions.db"))
+    await manager.initialize()
+
+    async def fake_llm_title(first_message, *args, **kwargs):
+        return "Inspectie Bakkerij De Gouden Korst"
+
+    monkeypatch.setattr(manager, "_generate_title_with_llm", fake_llm_title)
+    yield manager
+    await manager.close()
+
+
+async def test_new_session_gets_truncated_title_immediately(metadata):
+    created = await metadata.create_or_update_metadata("s-1", "u-1", FIRST_MESSAGE)
+    again = await metadata.create_or_update_metadata("s-1", "u-1", "Volgende vraag")
+
+    assert created is True
+    assert again is False
+    session = await metadata.get_session("s-1")
+    assert session["title"] == metadata._generate_title(FIRST_MESSAGE)
+
+
+async def test_generate_title_replaces_placeholder(metadata):
+    await metadata.create_or_update_metadata("s-1", "u-1", FIRST_MESSAGE)
+
+    title = await metadata.generate_title("s-1", FIRST_MESSAGE, "sk-test")
+
+    assert title == "Inspectie Bakkerij De Gouden Korst"
+    session = await metadata.get_session("s-1")
+    assert session["title"] == title
+
+
+async def test_rename_before_generated_title_wins(metadata):
+    await metadata.create_or_update_metadata("s-1", "u-1", FIRST_MESSAGE)
+    await metadata.update_session_title("s-1", "Mijn eigen titel")
+
+    title = await metadata.generate_title("s-1", FIRST_MESSAGE, "sk-test")
+
+    assert title is None
+    session = await metadata.get_session("s-1")
+    assert session["title"] == "Mijn eigen titel"
@@ -0,0 +1,78 @@
+"""Tests for the shared SQLite storage of sessions.db."""
+
+import asyncio
+
+import pytest
+
+from agora_langgraph.adapters.checkpointer import create_checkpointer
+from agora_langgraph.adapters.session_metadata import SessionMetadataManager
+from agora_langgraph.adapters.storage import SQLiteStorage
+from agora_langgraph.adapters.user_manager import UserManager
+
+
+@pytest.fixture
+async def storage(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "sessions.db"))
+    await storage.initialize()
+    yield storage
+    await storage.close()
+
+
+async def pragma(storage: SQLiteStorage, name: str):
+    cursor = await storage.connection.execute(f"PRAGMA {name}")
+    (value,) = await cursor.fetchone()
+    return value
+
+
+async def test_connection_is_configured_for_concurrency(storage):
+    assert await pragma(storage, "journal_mode") == "wal"
+    assert await pragma(storage, "synchronous") == 1  # NORMAL
+    assert await pragma(storage, "busy_timeout") == 5000
+
+
+async def test_components_share_connection_and_lock(storage):
+    metadata = SessionMetadataManager(storage=storage)
+    users = UserManager(storage=storage)
+    await metadata.initialize()
+    await users.initialize()
+
+    async with create_checkpointer(storage) as checkpointer:
+        assert checkpointer.conn is storage.connection
+        assert checkpointer.lock is storage.lock
+    assert metadata._connection is users._connection is storage.connection
+
+    # Closing a manager leaves the shared connection open
+    await metadata.close()
+    await users.close()
+    assert await pragma(storage, "journal_mode") == "wal"
+
+
+async def test_transaction_rolls_back_on_error(storage):
+    async with storage.transaction() as connection:
+        await connection.execute("CREATE TABLE items (name TEXT)")
+
+    with pytest.raises(RuntimeError):
+        async with storage.transaction() as connection:
+            await connection.execute("INSERT INTO items VALUES ('a')")
+            raise RuntimeError("boom")
+
+    cursor = await storage.connection.execute("SELECT COUNT(*) FROM items")
+    assert await cursor.fetchone() == (0,)
+
+
+async def test_concurrent_turns_are_counted(storage):
+    metadata = SessionMetadataManager(storage=storage)
+    await metadata.initialize()
+
+    async def session(index: int) -> None:
+        session_id = f"s-{index}"
+        for turn in range(3):
+            await metadata.create_or_update_metadata(session_id, "u-1", "Vraag")
+            await metadata.finish_turn(session_id, completed=turn != 2)
+
+    await asyncio.gather(*(session(i) for i in range(50)))
+
+    sessions, total = await metadata.list_sessions("u-1", limit=100)
+    assert total == 50
+    # First user message, plus one per completed turn
+    assert {s["messageCount"] for s in sessions} == {3}
@@ -0,0 +1,111 @@
+"""Tests for compaction of tool results before they enter the LLM context."""
+
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.prebuilt.tool_node import ToolCallRequest
+
+from agora_langgraph.core.tool_results import compact_tool_message, compact_tool_result
+
+SUMMARY = "Algemene hygiënevoorschriften voor levensmiddelenbedrijven."
+
+
+def regulation(article: int, score: float) -> dict:
+    return {
+        "content": f"Artikel {article}: " + "bewaar bederfelijke waar koel. " * 70,
+        "citation": f"Source: Verordening (EG) nr. 852/2004 | Article: {article}",
+        "score": score,
+        "regulation_type": "food_safety",
+        "source_type": "EU",
+        "article": str(article),
+        "section": "",
+        "document_summary": SUMMARY,
+    }
+
+
+def search_result(results: list[dict], call_id: str = "t1") -> ToolMessage:
+    payload = {"query": "koeling", "found": len(results), "results": results}
+    return ToolMessage(
+        content=[{"type": "text", "text": json.dumps(payload)}],
+        name="search_regulations",
+        tool_call_id=call_id,
+    )
+
+
+def test_search_results_are_compacted():
+    raw = search_result([regulation(n, 0.9 - n * 0.1) for n in range(8)])
+
+    compacted = compact_tool_message(raw, [])
+    payload = json.loads(compacted.content)
+
+    # Scores below half the best one (0.45) are dropped
+    assert [r["article"] for r in payload["results"]] == ["0", "1", "2", "3", "4"]
+    assert payload["found"] == 8
+    assert payload["returned"] == 5
+    # The shared document summary is sent once
+    summaries = [r.get("document_summary") for r in payload["results"]]
+    assert summaries == [SUMMARY, None, None, None, None]
+    # Content is trimmed to the tool's budget
+    assert len(compacted.content) < len(raw.content[0]["text"]) / 2
+    assert all("characters elided" in r["content"] for r in payload["results"])
+    assert "section" not in payload["results"][0]
+
+
+def test_chunks_already_in_conversation_become_references():
+    first = compact_tool_message(search_result([regulation(1, 0.9)]), [])
+
+    second = compact_tool_message(
+        search_result([regulation(1, 0.9), regulation(2, 0.8)], "t2"), [first]
+    )
+    payload = json.loads(second.content)
+
+    repeated, new = payload["results"]
+    assert repeated["content"] == "[already in conversation]"
+    assert repeated["ref"] == json.loads(first.content)["results"][0]["ref"]
+    assert new["article"] == "2"
+    # The summary was already sent with the first result
+    assert "document_summary" not in new
+
+
+async def test_summarized_chunks_are_sent_again():
+    first = compact_tool_message(search_result([regulation(1, 0.9)]), [])
+    answer = AIMessage(content="Bewaar koel.", id="a1")
+    state = {
+        "messages": [HumanMessage(content="Koeling?", id="h1"), first, answer],
+        "context_summary": "De inspecteur vroeg naar koeling.",
+        "context_summary_until": "a1",
+    }
+    request = ToolCallRequest(
+        tool_call={"name": "search_regulations", "args": {}, "id": "t2"},
+        tool=None,
+        state=state,
+        runtime=None,
+    )
+
+    async def execute(request: ToolCallRequest) -> ToolMessage:
+        return search_result([regulation(1, 0.9)], "t2")
+
+    payload = json.loads((await compact_tool_result(request, execute)).content)
+
+    # The first result was summarized away, so the LLM gets the chunk again
+    (result,) = payload["results"]
+    assert result["content"].startswith("Artikel 1")
+    assert result["document_summary"] == SUMMARY
+
+
+def test_repeated_chunks_in_one_result_are_sent_once():
+    raw = search_result([regulation(1, 0.9)] * 6)
+
+    payload = json.loads(compact_tool_message(raw, []).content)
+
+    assert len(payload["results"]) == 1
+
+
+def test_other_tools_are_trimmed_to_budget():
+    raw = ToolMessage(
+        content="x" * 50_000, name="get_company_violations", tool_call_id="t1"
+    )
+    small = ToolMessage(content="ok", name="get_company_violations", tool_call_id="t2")
+
+    assert len(compact_tool_message(raw, []).content) < 13_000
+    assert compact_tool_message(small, []) is small
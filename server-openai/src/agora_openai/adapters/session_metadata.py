@@ -225,12 +225,12 @@ class SessionMetadataManager:
         session_id: str,
         user_id: str,
         first_message: str | None = None,
-        api_key: str | None = None,
-    ) -> None:
+    ) -> bool:
         """Create session metadata entry or update if exists.
 
         On first message for a session:
-        - Creates metadata entry with auto-generated title (LLM if api_key provided)
+        - Creates metadata entry with a title truncated from the message
+          (see generate_title for the LLM title, which is patched in later)
         - Sets first_message_preview from message content
 
         On subsequent calls:
@@ -239,8 +239,10 @@ class SessionMetadataManager:
         Args:
             session_id: Session identifier
             user_id: User identifier (inspector persona ID)
-            first_message: First user message (for title generation)
-            api_key: OpenAI API key (enables LLM title generation)
+            first_message: First user message (for the initial title)
+
+        Returns:
+            True if a new entry was created
         """
         if not self._connection:
             raise RuntimeError("SessionMetadataManager not initialized")
@@ -266,14 +268,7 @@ class SessionMetadataManager:
             )
         else:
             # Create new entry
-            # Generate title
-            if first_message:
-                if api_key:
-                    title = await self._generate_title_with_llm(first_message, api_key)
-                else:
-                    title = self._generate_title(first_message)
-            else:
-                title = "New Conversation"
+            title = self._generate_title(first_message or "")
             preview = first_message[:200] if first_message else None
 
             await self._connection.execute(
@@ -287,6 +282,43 @@ class SessionMetadataManager:
             )
 
         await self._connection.commit()
+        return not existing
+
+    async def generate_title(
+        self, session_id: str, first_message: str, api_key: str
+    ) -> str | None:
+        """Replace a new session's truncated title with an LLM-generated one.
+
+        Meant to run in the background after create_or_update_metadata. The
+        title is only replaced while it is still the truncated placeholder,
+        so a rename in the meantime wins.
+
+        Args:
+            session_id: Session identifier
+            first_message: First user message
+            api_key: OpenAI API key
+
+        Returns:
+            The new title, or None if the session was not updated
+        """
+        if not self._connection:
+            raise RuntimeError("SessionMetadataManager not initialized")
+
+        placeholder = self._generate_title(first_message)
+        title = await self._generate_title_with_llm(first_message, api_key)
+        if title == placeholder:
+            return None
+
+        cursor = await self._connection.execute(
+            """
+            UPDATE session_metadata
+            SET title = ?
+            WHERE session_id = ? AND title = ?
+            """,
+            (title, session_id, placeholder),
+        )
+        await self._connection.commit()
+        return title if cursor.rowcount > 0 else None
 
     async def increment_message_count(self, session_id: str) -> None:
         """Increment message count and update last_activity.
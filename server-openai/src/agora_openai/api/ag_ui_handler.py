@@ -31,12 +31,15 @@ from ag_ui.core import (
 )
 from fastapi import WebSocket
 
+from agora_openai.api.mux import StreamSocket
 from agora_openai.common.ag_ui_types import (
     AGORA_ERROR,
+    AGORA_SESSION_TITLE,
     AGORA_TOOL_APPROVAL_REQUEST,
     AGORA_TOOL_APPROVAL_RESPONSE,
     ErrorPayload,
     RunAgentInput,
+    SessionTitlePayload,
     ToolApprovalRequestPayload,
     ToolApprovalResponsePayload,
 )
@@ -56,7 +59,7 @@ class AGUIProtocolHandler:
     Maps OpenAI Agents SDK events to AG-UI Protocol events.
     """
 
-    def __init__(self, websocket: WebSocket):
+    def __init__(self, websocket: WebSocket | StreamSocket):
         """Initialize handler with WebSocket connection."""
         self.websocket = websocket
         self.is_connected = True
@@ -387,3 +390,15 @@ class AGUIProtocolHandler:
             timestamp=_now_timestamp(),
         )
         await self._send_event(event)
+
+    # Custom events for session metadata
+
+    async def send_session_title(self, session_id: str, title: str) -> None:
+        """Emit agora:session_title custom event when a session is retitled."""
+        payload = SessionTitlePayload(session_id=session_id, title=title)
+        event = CustomEvent(
+            name=AGORA_SESSION_TITLE,
+            value=payload.model_dump(by_alias=True),
+            timestamp=_now_timestamp(),
+        )
+        await self._send_event(event)
@@ -7,6 +7,7 @@ from contextlib import asynccontextmanager
 from typing import Any
 
 import uvicorn
+from agents import set_tracing_disabled
 from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
@@ -17,6 +18,7 @@ from agora_openai.adapters.mcp_tools import MCPToolRegistry
 from agora_openai.adapters.session_metadata import SessionMetadataManager
 from agora_openai.adapters.user_manager import UserManager
 from agora_openai.api.ag_ui_handler import AGUIProtocolHandler
+from agora_openai.api.mux import StreamSocket, serve_multiplexed
 from agora_openai.common.ag_ui_types import (
     RunAgentInput,
     ToolApprovalResponsePayload,
@@ -42,6 +44,12 @@ async def lifespan(app: FastAPI):
     # Set OPENAI_API_KEY for Agents SDK
     os.environ["OPENAI_API_KEY"] = settings.openai_api_key.get_secret_value()
     log.info("Configured OpenAI API key for Agents SDK")
+    if settings.openai_base_url:
+        # Picked up by every AsyncOpenAI client, including the Agents SDK's
+        os.environ["OPENAI_BASE_URL"] = settings.openai_base_url
+        # Traces are exported to the OpenAI platform, not the custom endpoint
+        set_tracing_disabled(True)
+        log.info("Using OpenAI-compatible API at %s", settings.openai_base_url)
 
     mcp_servers = parse_mcp_servers(settings.mcp_servers)
     log.info("MCP Servers configured: %s", mcp_servers)
@@ -131,6 +139,7 @@ async def root():
         "protocol": "AG-UI Protocol v2.1.1",
         "docs": "/docs",
         "websocket": "/ws",
+        "websocket_multiplexed": "/ws/mux",
     }
 
 
@@ -524,7 +533,19 @@ async def delete_user(user_id: str):
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for AG-UI protocol communication."""
     await websocket.accept()
+    await serve_agui_session(websocket)
 
+
+@app.websocket("/ws/mux")
+async def websocket_mux_endpoint(websocket: WebSocket) -> None:
+    """Multiplexed AG-UI sessions from the API gateway (see api/mux.py)."""
+    await websocket.accept()
+    log.info("Multiplexed AG-UI connection from %s", websocket.client)
+    await serve_multiplexed(websocket, serve_agui_session)
+
+
+async def serve_agui_session(websocket: WebSocket | StreamSocket) -> None:
+    """Run the AG-UI session loop on an accepted WebSocket (or mux stream)."""
     handler = AGUIProtocolHandler(websocket)
     orchestrator: Orchestrator = app.state.orchestrator
 
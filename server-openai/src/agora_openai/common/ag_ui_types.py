@@ -68,10 +68,12 @@ __all__ = [
     "ToolApprovalResponsePayload",
     "ErrorPayload",
     "SpokenTextErrorPayload",
+    "SessionTitlePayload",
     "AGORA_TOOL_APPROVAL_REQUEST",
     "AGORA_TOOL_APPROVAL_RESPONSE",
     "AGORA_ERROR",
     "AGORA_SPOKEN_TEXT_ERROR",
+    "AGORA_SESSION_TITLE",
 ]
 
 
@@ -148,8 +150,16 @@ class SpokenTextErrorPayload(AgoraBaseModel):
     )
 
 
+class SessionTitlePayload(AgoraBaseModel):
+    """Payload for agora:session_title custom event."""
+
+    session_id: str = Field(description="Session whose title changed")
+    title: str = Field(description="New session title")
+
+
 # Custom event names used by AGORA
 AGORA_TOOL_APPROVAL_REQUEST = "agora:tool_approval_request"
 AGORA_TOOL_APPROVAL_RESPONSE = "agora:tool_approval_response"
 AGORA_ERROR = "agora:error"
 AGORA_SPOKEN_TEXT_ERROR = "agora:spoken_text_error"
+AGORA_SESSION_TITLE = "agora:session_title"
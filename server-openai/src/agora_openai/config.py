@@ -20,6 +20,10 @@ class Settings(BaseSettings):
     """Application settings for OpenAI Agents SDK orchestrator."""
 
     openai_api_key: SecretStr = Field(description="OpenAI API key")
+    openai_base_url: str | None = Field(
+        default=None,
+        description="Base URL for an OpenAI-compatible API (defaults to the SDK's)",
+    )
     openai_model: str = Field(default="gpt-4o", description="Default OpenAI model")
 
     mcp_servers: str = Field(
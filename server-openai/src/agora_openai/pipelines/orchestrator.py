@@ -7,6 +7,7 @@ import json
 import logging
 import time
 import uuid
+from collections.abc import Coroutine
 from typing import Any
 
 from ag_ui.core import AssistantMessage
@@ -49,6 +50,7 @@ class Orchestrator:
         self.session_metadata = session_metadata
         self.user_manager = user_manager
         self.pending_approvals: dict[str, asyncio.Future[bool]] = {}
+        self._background_tasks: set[asyncio.Task[None]] = set()
 
     async def _handle_tool_approval_flow(
         self,
@@ -102,6 +104,36 @@ class Orchestrator:
         log.warning(f"Received approval for unknown ID: {approval_id}")
         return False
 
+    def _start_background_task(self, coro: Coroutine[Any, Any, None]) -> None:
+        """Run a coroutine off the critical path, keeping a reference until done."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _generate_session_title(
+        self,
+        thread_id: str,
+        first_message: str,
+        protocol_handler: AGUIProtocolHandler | None,
+    ) -> None:
+        """Generate an LLM title for a new session and push it to the client."""
+        if not self.session_metadata:
+            return
+
+        try:
+            api_key = get_settings().openai_api_key.get_secret_value()
+            if not api_key:
+                return
+            title = await self.session_metadata.generate_title(
+                thread_id, first_message, api_key
+            )
+        except Exception as e:
+            log.warning(f"Failed to generate session title: {e}")
+            return
+
+        if title and protocol_handler and protocol_handler.is_connected:
+            await protocol_handler.send_session_title(thread_id, title)
+
     async def process_message(
         self,
         agent_input: RunAgentInput,
@@ -130,14 +162,13 @@ class Orchestrator:
         user_id = agent_input.user_id
 
         # Create or update session metadata
+        is_new_session = False
         if self.session_metadata:
             try:
-                settings = get_settings()
-                await self.session_metadata.create_or_update_metadata(
+                is_new_session = await self.session_metadata.create_or_update_metadata(
                     session_id=thread_id,
                     user_id=user_id,
                     first_message=user_content,
-                    api_key=settings.openai_api_key.get_secret_value(),
                 )
             except Exception as e:
                 log.warning(f"Failed to update session metadata: {e}")
@@ -150,6 +181,11 @@ class Orchestrator:
                 f"Input validation failed: {error}", str(uuid.uuid4())
             )
 
+        if is_new_session and user_content:
+            self._start_background_task(
+                self._generate_session_title(thread_id, user_content, protocol_handler)
+            )
+
         await self.audit.log_message(
             session_id=thread_id,
             role="user",
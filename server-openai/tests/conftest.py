@@ -1,3 +1,10 @@
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
 import pytest
 from typing import Any, AsyncGenerator
 from unittest.mock import MagicMock, AsyncMock
@@ -146,3 +153,46 @@ async def orchestrator(
         audit_logger=audit_logger,
     )
     yield orch
+
+
+STAND_INS = (
+    Path(__file__).resolve().parents[2] / "mcp-servers" / "stand-ins" / "server.py"
+)
+
+
+@pytest.fixture
+def mcp_stand_in():
+    """Launch latency-injecting MCP server stand-ins.
+
+    Yields a function taking the server name and stand-in CLI options
+    (e.g. "--latency", "fixed:50") and returning the server's base URL.
+    """
+    processes: list[subprocess.Popen] = []
+
+    def launch(server: str, *options: str) -> str:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        process = subprocess.Popen(
+            [sys.executable, str(STAND_INS), server, "--port", str(port), *options],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        processes.append(process)
+
+        url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 15
+        while True:
+            try:
+                httpx.get(f"{url}/health", timeout=1).raise_for_status()
+                return url
+            except httpx.HTTPError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"MCP stand-in {server} did not start")
+                time.sleep(0.1)
+
+    yield launch
+
+    for process in processes:
+        process.terminate()
+        process.wait(timeout=5)
@@ -0,0 +1,89 @@
+"""Integration tests for MCPToolRegistry against latency-injecting MCP stand-ins."""
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+
+from agora_openai.adapters.mcp_tools import MCPToolRegistry
+
+
+@asynccontextmanager
+async def registry(server_urls: dict[str, str]):
+    connected = MCPToolRegistry(server_urls)
+    await connected.discover_and_register_tools()
+    try:
+        yield connected
+    finally:
+        # Close the sessions in the task that opened them
+        for server in connected.mcp_servers:
+            await server.cleanup()
+
+
+def function_tool(registry: MCPToolRegistry, server: str, name: str):
+    (tool,) = [
+        t for t in registry.get_function_tools_by_server()[server] if t.name == name
+    ]
+    return tool
+
+
+class TestMCPToolRegistryWithStandIns:
+    """MCPToolRegistry against stand-ins for the real MCP servers."""
+
+    async def test_discovers_tools_per_server(self, mcp_stand_in):
+        urls = {
+            "inspection-history": mcp_stand_in("inspection-history"),
+            "regulation-analysis": mcp_stand_in("regulation-analysis"),
+        }
+        async with registry(urls) as connected:
+            tools = connected.get_tools_by_server()
+
+        assert {t.name for t in tools["inspection-history"]} == {
+            "check_company_exists",
+            "get_inspection_history",
+        }
+        assert "search_regulations" in {t.name for t in tools["regulation-analysis"]}
+
+    async def test_injected_latency(self, mcp_stand_in):
+        url = mcp_stand_in("regulation-analysis", "--latency", "fixed:200")
+        async with registry({"regulation-analysis": url}) as connected:
+            search = function_tool(
+                connected, "regulation-analysis", "search_regulations"
+            )
+
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    search.on_invoke_tool(None, json.dumps({"query": "koeling"}))
+                    for _ in range(3)
+                )
+            )
+            elapsed = time.perf_counter() - started
+
+        assert elapsed >= 0.2
+        stats = httpx.get(f"{url}/stats").json()["search_regulations"]
+        assert stats["calls"] == 3
+
+    async def test_payload_size(self, mcp_stand_in):
+        url = mcp_stand_in("inspection-history", "--payload-bytes", "20000")
+        async with registry({"inspection-history": url}) as connected:
+            history = function_tool(
+                connected, "inspection-history", "get_inspection_history"
+            )
+            result = await history.on_invoke_tool(
+                None, json.dumps({"kvk_number": "92251854"})
+            )
+
+        assert len(result.encode()) >= 20000
+
+    async def test_injected_failure_reaches_the_agent(self, mcp_stand_in):
+        url = mcp_stand_in("reporting", "--failure-rate", "1")
+        async with registry({"reporting": url}) as connected:
+            status = function_tool(connected, "reporting", "get_report_status")
+            result = await status.on_invoke_tool(
+                None, json.dumps({"session_id": "s-1"})
+            )
+
+        assert "Injected failure" in result
@@ -1,4 +1,11 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
 import pytest
+from pydantic import SecretStr
+
+from agora_openai.pipelines import orchestrator as orchestrator_module
 from agora_openai.common.ag_ui_types import RunAgentInput
 from agora_openai.pipelines.orchestrator import Orchestrator
 
@@ -49,3 +56,43 @@ async def test_process_message_empty_input(orchestrator: Orchestrator):
     response = await orchestrator.process_message(agent_input)
 
     assert "validation failed" in response.content.lower()
+
+
+@pytest.mark.asyncio
+async def test_session_title_is_generated_in_background(
+    orchestrator: Orchestrator, monkeypatch
+):
+    """The LLM title must not hold up the response; it is sent when ready."""
+    release = asyncio.Event()
+    metadata = AsyncMock()
+    metadata.create_or_update_metadata.return_value = True
+
+    async def slow_title(session_id, first_message, api_key):
+        await release.wait()
+        return "Inspectie Bakkerij"
+
+    metadata.generate_title.side_effect = slow_title
+    orchestrator.session_metadata = metadata
+    monkeypatch.setattr(
+        orchestrator_module,
+        "get_settings",
+        lambda: SimpleNamespace(openai_api_key=SecretStr("sk-test")),
+    )
+    handler = AsyncMock(is_connected=True)
+
+    agent_input = RunAgentInput(
+        thread_id="test-session",
+        user_id="test-user",
+        messages=[{"role": "user", "content": "Start inspectie bij Bakkerij"}],
+    )
+    response = await orchestrator.process_message(agent_input, handler)
+
+    assert response.role == "assistant"
+    handler.send_run_finished.assert_awaited()
+    handler.send_session_title.assert_not_called()
+
+    release.set()
+    await asyncio.gather(*orchestrator._background_tasks)
+    handler.send_session_title.assert_awaited_once_with(
+        "test-session", "Inspectie Bakkerij"
+    )